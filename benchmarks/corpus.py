@@ -0,0 +1,118 @@
+"""Seeded synthetic Russian corpus for benchmarks.
+
+Words are built from Russian syllable patterns with the letter mix of children's texts,
+so syllabification and scoring see realistic inputs (clusters, ь/ъ, й, vowel pairs).
+Texts draw from a fixed vocabulary with Zipfian frequencies, so words repeat the way they
+do in real prose. The same seed always yields the same corpus.
+"""
+
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any
+
+VOWELS = "аааоооеееииуыяюёэ"
+CONSONANTS = "нннтттсссрррввлллкккммдддппзгбчжшхщцф"
+# Clusters that children's texts actually contain
+CLUSTERS = ("ст", "пр", "тр", "кр", "бр", "гр", "др", "вз", "сл", "пл", "кл", "зв", "шк", "ск", "сп", "вс", "здр")
+COMMON_WORDS = ("и", "в", "на", "с", "не", "а", "мама", "папа", "кот", "дом", "лес", "мяч", "солнце", "друг", "школа")
+SENTENCE_END = (".", ".", ".", "!", "?", "…")
+
+VOCABULARY_SIZE = 20_000
+
+# Word counts per text size
+SIZES = {
+    "phrase": (3, 8),
+    "sentence": (8, 20),
+    "paragraph": (50, 150),
+    "chapter": (3_000, 5_000),
+    "book": (40_000, 60_000),
+}
+
+
+def make_word(rng: random.Random) -> str:
+    if rng.random() < 0.25:
+        return rng.choice(COMMON_WORDS)
+
+    parts = []
+    for _ in range(rng.choice((1, 2, 2, 2, 3, 3, 4))):
+        roll = rng.random()
+        if roll < 0.15:
+            parts.append(rng.choice(CLUSTERS) + rng.choice(VOWELS))
+        elif roll < 0.25:
+            parts.append(rng.choice(VOWELS))
+        else:
+            parts.append(rng.choice(CONSONANTS) + rng.choice(VOWELS))
+    word = "".join(parts)
+
+    roll = rng.random()
+    if roll < 0.10:
+        word += rng.choice(CONSONANTS) + "ь"
+    elif roll < 0.15:
+        word += "й"
+    elif roll < 0.35:
+        word += rng.choice(CONSONANTS)
+    return word
+
+
+@lru_cache(maxsize=4)
+def make_vocabulary(seed: int = 42) -> tuple[list[str], list[float]]:
+    """Distinct words and cumulative Zipf weights (1/rank) for ``random.choices``."""
+    rng = random.Random(f"{seed}-vocabulary")
+    words = list(COMMON_WORDS)
+    seen = set(words)
+    while len(words) < VOCABULARY_SIZE:
+        word = make_word(rng)
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words, list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+
+def make_text(rng: random.Random, word_count: int, seed: int = 42) -> str:
+    vocabulary, cum_weights = make_vocabulary(seed)
+    words = []
+    sentence_left = 0
+    for i, word in enumerate(rng.choices(vocabulary, cum_weights=cum_weights, k=word_count)):
+        if sentence_left == 0:
+            word = word.capitalize()
+            sentence_left = rng.randint(4, 14)
+        sentence_left -= 1
+
+        if sentence_left == 0 or i == word_count - 1:
+            word += rng.choice(SENTENCE_END)
+            if word_count > 150 and rng.random() < 0.15:
+                word += "\n"
+        elif rng.random() < 0.08:
+            word += ","
+        elif rng.random() < 0.01:
+            word += " —"
+        words.append(word)
+    return " ".join(words).replace("\n ", "\n")
+
+
+def make_corpus(size: str, count: int, seed: int = 42) -> list[str]:
+    rng = random.Random(f"{seed}-{size}")
+    low, high = SIZES[size]
+    return [make_text(rng, rng.randint(low, high), seed) for _ in range(count)]
+
+
+def make_library(count: int, seed: int = 42) -> list[dict[str, Any]]:
+    """A phrases.json-shaped library: mostly phrases and sentences, a few paragraphs."""
+    rng = random.Random(f"{seed}-library-{count}")
+    library = []
+    for i in range(count):
+        roll = rng.random()
+        size = "phrase" if roll < 0.6 else "sentence" if roll < 0.95 else "paragraph"
+        low, high = SIZES[size]
+        is_read = rng.random() < 0.3
+        library.append(
+            {
+                "text": make_text(rng, rng.randint(low, high), seed),
+                "is_read": is_read,
+                "read_date": f"2025-01-{i % 28 + 1:02d}T10:00:00" if is_read else None,
+            }
+        )
+    return library
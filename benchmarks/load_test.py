@@ -0,0 +1,243 @@
+"""Concurrent-session load test of the Streamlit app through ``streamlit.testing.v1.AppTest``.
+
+    python benchmarks/load_test.py --sessions 20 --concurrency 10
+
+Each simulated child runs the real ``main()`` flows: open the app, start the easiest unread
+text, read all three levels (rating every item, at most ``--max-ratings``), go back to the text
+selection, mark a text as read, add a new text and change the age. All sessions share one
+temporary copy of phrases.json/config.json, so saves contend exactly as they would on a server.
+
+Every session runs in its own worker process: AppTest relies on Streamlit's process-wide
+Runtime singleton, so two AppTests in one process cannot run at the same time.
+
+Reported: rerun latency distribution per action, memory per live session (RSS growth of its
+process, or traced Python allocations with ``--trace-memory``, which slows reruns down several
+times), save latency, lost updates (texts submitted by a session that did not survive other
+sessions' saves of the whole file) and crashed sessions (the flow stopped on an exception).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "src", "app.py")
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "load_results.json")
+
+RATE_GOOD = "🎉 Отлично! (3)"
+READ_ANOTHER = "Читать другой текст"
+RETURN_TO_SELECTION = "← Вернуться к выбору текста (Esc)"
+SAVE_TO_COLLECTION = "💾 Сохранить в коллекцию"
+AGES = (6, 7, 8, 9, 10, 11)
+
+
+class Session:
+    """One simulated child: an AppTest plus the latencies of its reruns."""
+
+    def __init__(self, index: int, timeout: float, max_ratings: int) -> None:
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.max_ratings = max_ratings
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: list[str] = []
+        self.added_text = f"Сессия {index}: мама мыла раму, а кот спал на окне."
+        self.submitted = False
+
+    def _timed(self, action: str, element: Any = None) -> None:
+        started = time.perf_counter()
+        (element if element is not None else self.app).run()
+        self.latencies.setdefault(action, []).append(time.perf_counter() - started)
+        for exception in self.app.exception:
+            self.errors.append(f"{action}: {exception.message}")
+
+    def _button(self, label: str | None = None, key_prefix: str | None = None) -> Any:
+        for button in self.app.button:
+            if label is not None and button.label == label:
+                return button
+            if key_prefix is not None and (button.key or "").startswith(key_prefix):
+                return button
+        return None
+
+    def run_flows(self) -> None:
+        self._timed("open")
+
+        start = self._button(key_prefix="unread_start_button_")
+        if start is None:
+            self.errors.append("select: no unread texts")
+        else:
+            start.click()
+            self._timed("select", start)
+            for _ in range(self.max_ratings):
+                rate = self._button(label=RATE_GOOD)
+                if rate is None:
+                    break
+                rate.click()
+                self._timed("rate", rate)
+            # Finished texts show the results screen, unfinished ones (--max-ratings) the return button
+            back = self._button(label=READ_ANOTHER) or self._button(label=RETURN_TO_SELECTION)
+            if back is None:
+                raise RuntimeError("back: no button leads to the text selection")
+            back.click()
+            self._timed("back", back)
+
+        mark = self._button(key_prefix="unread_button_")
+        if mark is not None:
+            mark.click()
+            self._timed("mark_read", mark)
+
+        submit = self._button(label=SAVE_TO_COLLECTION)
+        if submit is None or not self.app.text_area:
+            raise RuntimeError("add_text: the text selection view is not shown")
+        self.app.text_area[0].input(self.added_text)
+        submit.click()
+        self._timed("add_text", submit)
+        self.submitted = True
+
+        age_select = self.app.selectbox[0]
+        age_select.set_value(AGES[(AGES.index(age_select.value) + 1) % len(AGES)])
+        self._timed("change_age", age_select)
+
+
+def _distribution(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _rss_kib() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 1024 if sys.platform == "darwin" else usage
+
+
+def _memory(trace_memory: bool) -> float:
+    return tracemalloc.get_traced_memory()[0] if trace_memory else _rss_kib() * 1024
+
+
+def _simulate(index: int, workdir: str, timeout: float, max_ratings: int, trace_memory: bool) -> dict[str, Any]:
+    """Run one session in this worker process and return its measurements."""
+    os.chdir(workdir)  # the app reads and writes phrases.json relative to the working directory
+    if trace_memory:
+        tracemalloc.start()
+    baseline = _memory(trace_memory)
+    session = Session(index, timeout, max_ratings)
+    crashed = False
+    try:
+        session.run_flows()
+    except Exception as e:  # noqa: BLE001 (a failed session is a result, not a crash)
+        session.errors.append(f"{type(e).__name__}: {e}")
+        crashed = True
+    # The session is still referenced here, so its session_state is part of the measured memory
+    memory = _memory(trace_memory) - baseline
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else _rss_kib() * 1024
+    if trace_memory:
+        tracemalloc.stop()
+    return {
+        "latencies": session.latencies,
+        "errors": session.errors,
+        "added_text": session.added_text,
+        "submitted": session.submitted,
+        "crashed": crashed,
+        "memory": memory,
+        "peak_memory": peak,
+    }
+
+
+def run(sessions: int, concurrency: int, timeout: float, max_ratings: int, trace_memory: bool = False) -> dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix="learn-to-read-load-")
+    for name in ("phrases.json", "config.json"):
+        shutil.copy(os.path.join(ROOT, name), workdir)
+
+    started = time.perf_counter()
+    # A fresh process per session: its own Streamlit Runtime and its own memory baseline
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=concurrency, mp_context=context, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(_simulate, index, workdir, timeout, max_ratings, trace_memory) for index in range(sessions)]
+        done = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    with open(os.path.join(workdir, "phrases.json"), encoding="utf-8") as f:
+        saved_texts = {phrase["text"] for phrase in json.load(f)}
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    per_action: dict[str, list[float]] = {}
+    for session in done:
+        for action, values in session["latencies"].items():
+            per_action.setdefault(action, []).extend(values)
+    all_reruns = [value for values in per_action.values() for value in values]
+    saves = per_action.get("mark_read", []) + per_action.get("add_text", [])
+
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "reruns": len(all_reruns),
+        "reruns_per_s": len(all_reruns) / elapsed if elapsed else 0.0,
+        "rerun_latency": _distribution(all_reruns) if all_reruns else {},
+        "per_action": {action: _distribution(values) for action, values in sorted(per_action.items())},
+        "save_reruns": _distribution(saves) if saves else {},
+        "memory_per_session_kib": statistics.fmean(session["memory"] for session in done) / 1024 if done else 0.0,
+        "memory_source": "tracemalloc" if trace_memory else "max_rss",
+        "peak_memory_mib": max((session["peak_memory"] for session in done), default=0) / 1024 / 1024,
+        "lost_additions": sum(1 for session in done if session["submitted"] and session["added_text"] not in saved_texts),
+        "crashed_sessions": sum(1 for session in done if session["crashed"]),
+        "errors": [error for session in done for error in session["errors"]],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="simulated children in total")
+    parser.add_argument("--concurrency", type=int, default=5, help="sessions running at the same time")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds allowed per rerun")
+    parser.add_argument("--max-ratings", type=int, default=300, help="cap on rated items per session")
+    parser.add_argument("--trace-memory", action="store_true", help="measure memory with tracemalloc (slow)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError as e:
+        print(f"Streamlit with AppTest is required: {e}", file=sys.stderr)
+        return 2
+
+    result = run(args.sessions, args.concurrency, args.timeout, args.max_ratings, args.trace_memory)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    latency = result["rerun_latency"]
+    print(f"{result['sessions']} sessions x{result['concurrency']}: {result['reruns']} reruns in {result['elapsed_s']:.1f}s")
+    if latency:
+        print(f"rerun p50 {latency['p50_ms']:.0f} ms, p95 {latency['p95_ms']:.0f} ms, max {latency['max_ms']:.0f} ms")
+    for action, stats in result["per_action"].items():
+        print(f"  {action:12} p50 {stats['p50_ms']:8.0f} ms  p95 {stats['p95_ms']:8.0f} ms  ({stats['count']})")
+    print(
+        f"memory per session: {result['memory_per_session_kib']:.0f} KiB, "
+        f"lost additions: {result['lost_additions']}, crashed sessions: {result['crashed_sessions']}"
+    )
+    if result["errors"]:
+        print(f"{len(result['errors'])} errors, first: {result['errors'][0]}")
+    print(f"Results written to {args.output}")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""Benchmarks for core import time, syllabification, reading levels, scoring and phrases.json load/save.
+
+    python benchmarks/run.py                           # full run, writes benchmarks/results.json
+    python benchmarks/run.py --quick                   # no book-sized texts / 100k library
+    python benchmarks/run.py --output base.json        # record a baseline
+    python benchmarks/run.py --compare base.json       # exit 1 if p50 regressed > threshold
+    python benchmarks/run.py --only score              # run cases whose name contains "score"
+
+Every case is measured call by call; p50/p95/mean latency and throughput (calls/s and
+units/s, e.g. words/s) are reported. The corpus is generated from a fixed seed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import make_corpus, make_library  # noqa: E402
+
+from src.domain.document import analyze_text, clear_document_cache  # noqa: E402
+from src.syllable_processor import count_words, process_text, split_syllables_hybrid  # noqa: E402
+from src.text_complexity_batch import HAS_NUMPY, calculate_text_complexity_batch  # noqa: E402
+from src.text_complexity_children_optimized import calculate_children_text_complexity_optimized  # noqa: E402
+from src.text_complexity_fast import calculate_children_text_complexity_fast, calculate_text_complexity_improved_fast  # noqa: E402
+from src.text_complexity_improved import calculate_text_complexity_improved  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results.json")
+DEFAULT_THRESHOLD = 0.15
+
+# Per case: keep calling until both are reached (or MAX_CALLS)
+MIN_TIME_SECONDS = 0.5
+MIN_CALLS = 5
+MAX_CALLS = 10_000
+
+# UI-free modules timed on a cold import; each must load without Streamlit
+IMPORT_MODULES = ("src.syllable_processor", "src.domain.complexity", "src.services.files", "src.cli", "src.server")
+IMPORT_RUNS = 7
+IMPORT_PROBE = "import sys, time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t, 'streamlit' in sys.modules)"
+
+
+def measure(
+    func: Callable[[Any], Any],
+    inputs: Sequence[Any],
+    units_per_input: Sequence[int],
+    unit: str,
+    setup: Callable[[], Any] | None = None,
+    min_time: float = MIN_TIME_SECONDS,
+    min_calls: int = MIN_CALLS,
+) -> dict[str, Any]:
+    """Time ``func(input)`` cycling over ``inputs``; ``setup`` runs untimed before each call."""
+    durations: list[float] = []
+    units = 0
+    started = time.perf_counter()
+    index = 0
+    while len(durations) < MAX_CALLS and (len(durations) < min_calls or time.perf_counter() - started < min_time):
+        item = inputs[index % len(inputs)]
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        func(item)
+        durations.append(time.perf_counter() - t0)
+        units += units_per_input[index % len(inputs)]
+        index += 1
+
+    total = sum(durations)
+    durations.sort()
+    return {
+        "calls": len(durations),
+        "p50_ms": statistics.median(durations) * 1000,
+        "p95_ms": durations[min(len(durations) - 1, round(0.95 * (len(durations) - 1)))] * 1000,
+        "mean_ms": total / len(durations) * 1000,
+        "calls_per_s": len(durations) / total if total else 0.0,
+        "unit": unit,
+        "units_per_s": units / total if total else 0.0,
+    }
+
+
+def _syllabification_cases(seed: int, quick: bool) -> dict[str, Callable[[], dict[str, Any]]]:
+    words = " ".join(make_corpus("paragraph", 20, seed)).split()
+    batches = [words[i : i + 1000] for i in range(0, len(words), 1000)]
+
+    def split_batch(batch: list[str]) -> None:
+        for word in batch:
+            split_syllables_hybrid(word)
+
+    return {"split_syllables_hybrid": lambda: measure(split_batch, batches, [len(b) for b in batches], "words")}
+
+
+def _text_cases(seed: int, quick: bool) -> dict[str, Callable[[], dict[str, Any]]]:
+    sizes = ("phrase", "paragraph", "chapter") if quick else ("phrase", "paragraph", "chapter", "book")
+    scorers = {
+        "score_children": lambda text: calculate_children_text_complexity_optimized(text, age=8, include_cognitive_load=True),
+        "score_improved": lambda text: calculate_text_complexity_improved(text, age=8, include_cognitive_load=True),
+    }
+
+    cases: dict[str, Callable[[], dict[str, Any]]] = {}
+    for size in sizes:
+        texts = make_corpus(size, 1 if size == "book" else 3 if size == "chapter" else 50, seed)
+        word_counts = [count_words(text) for text in texts]
+        min_calls = 1 if size == "book" else MIN_CALLS
+
+        def process_case(texts: list[str] = texts, word_counts: list[int] = word_counts, min_calls: int = min_calls) -> dict[str, Any]:
+            return measure(process_text, texts, word_counts, "words", min_calls=min_calls)
+
+        cases[f"process_text[{size}]"] = process_case
+        for name, scorer in scorers.items():
+            # Cold: the Document cache is cleared before every call, as for a freshly loaded library
+            def score_case(
+                scorer: Callable[[str], Any] = scorer,
+                texts: list[str] = texts,
+                word_counts: list[int] = word_counts,
+                min_calls: int = min_calls,
+            ) -> dict[str, Any]:
+                return measure(scorer, texts, word_counts, "words", setup=clear_document_cache, min_calls=min_calls)
+
+            cases[f"{name}[{size}]"] = score_case
+    return cases
+
+
+ENGINES = {
+    "children": {
+        "reference": calculate_children_text_complexity_optimized,
+        "fast": calculate_children_text_complexity_fast,
+    },
+    "improved": {
+        "reference": calculate_text_complexity_improved,
+        "fast": calculate_text_complexity_improved_fast,
+    },
+}
+
+
+def _engine_cases(seed: int, quick: bool) -> dict[str, Callable[[], dict[str, Any]]]:
+    """Scoring only (Documents analyzed up front), reference vs fast engine."""
+    cases: dict[str, Callable[[], dict[str, Any]]] = {}
+    for size in ("phrase", "paragraph", "chapter") if quick else ("phrase", "paragraph", "chapter", "book"):
+
+        def documents(size: str = size) -> list[Any]:
+            return [analyze_text(text) for text in make_corpus(size, 1 if size == "book" else 3 if size == "chapter" else 50, seed)]
+
+        for algorithm, engines in ENGINES.items():
+            for engine, scorer in engines.items():
+
+                def engine_case(scorer: Callable[..., int] = scorer, documents: Callable[[], list[Any]] = documents) -> dict[str, Any]:
+                    docs = documents()
+                    return measure(lambda doc: scorer(doc, 8, True), docs, [doc.word_count for doc in docs], "words")
+
+                cases[f"engine_{algorithm}_{engine}[{size}]"] = engine_case
+    return cases
+
+
+def _batch_cases(seed: int, quick: bool) -> dict[str, Callable[[], dict[str, Any]]]:
+    """Scoring a whole library (Documents analyzed up front): a fast-engine call per text vs one batch."""
+    cases: dict[str, Callable[[], dict[str, Any]]] = {}
+    for count in (1_000, 10_000):
+
+        def documents(count: int = count) -> list[Any]:
+            return [analyze_text(phrase["text"]) for phrase in make_library(count, seed)]
+
+        for algorithm, engines in ENGINES.items():
+            children = algorithm == "children"
+
+            def per_text_case(
+                scorer: Callable[..., int] = engines["fast"], documents: Callable[[], list[Any]] = documents
+            ) -> dict[str, Any]:
+                docs = documents()
+                return measure(lambda docs: [scorer(doc, 8, True) for doc in docs], [docs], [len(docs)], "texts", min_calls=1)
+
+            def batch_case(children: bool = children, documents: Callable[[], list[Any]] = documents) -> dict[str, Any]:
+                if not HAS_NUMPY:
+                    return {"skipped": "numpy is not installed"}
+                docs = documents()
+                return measure(
+                    lambda docs: calculate_text_complexity_batch(docs, 8, True, children), [docs], [len(docs)], "texts", min_calls=1
+                )
+
+            cases[f"library_{algorithm}_per_text[{count}]"] = per_text_case
+            cases[f"library_{algorithm}_batch[{count}]"] = batch_case
+    return cases
+
+
+def speedups(results: dict[str, Any]) -> dict[str, float]:
+    """p50 reference / p50 fast for every engine case measured in this run."""
+    ratios = {}
+    for name, result in results.items():
+        if name.startswith("engine_") and "_fast[" in name:
+            reference = results.get(name.replace("_fast[", "_reference["))
+            if reference and result.get("p50_ms"):
+                ratios[name.replace("_fast[", "[")] = reference["p50_ms"] / result["p50_ms"]
+    return ratios
+
+
+def _import_cases(seed: int, quick: bool) -> dict[str, Callable[[], dict[str, Any]]]:
+    """Import time of the core in a fresh interpreter (interpreter start-up not included)."""
+
+    def import_case(module: str) -> dict[str, Any]:
+        command = [sys.executable, "-c", IMPORT_PROBE.format(module=module)]
+        durations: list[float] = []
+        streamlit_loaded = False
+        # The first run is not timed: it may have to write the bytecode cache
+        for run in range(IMPORT_RUNS + 1):
+            seconds, streamlit = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+            streamlit_loaded |= streamlit == "True"
+            if run:
+                durations.append(float(seconds))
+
+        total = sum(durations)
+        durations.sort()
+        return {
+            "calls": len(durations),
+            "p50_ms": statistics.median(durations) * 1000,
+            "p95_ms": durations[min(len(durations) - 1, round(0.95 * (len(durations) - 1)))] * 1000,
+            "mean_ms": total / len(durations) * 1000,
+            "calls_per_s": len(durations) / total if total else 0.0,
+            "unit": "imports",
+            "units_per_s": len(durations) / total if total else 0.0,
+            "streamlit_loaded": streamlit_loaded,
+        }
+
+    return {f"import[{module}]": lambda module=module: import_case(module) for module in IMPORT_MODULES}
+
+
+def _library_cases(seed: int, quick: bool) -> dict[str, Callable[[], dict[str, Any]]]:
+    from src.services import files
+
+    cases: dict[str, Callable[[], dict[str, Any]]] = {}
+    for count in (1_000, 10_000) if quick else (1_000, 10_000, 100_000):
+
+        def run_case(operation: str, count: int = count) -> dict[str, Any]:
+            library = make_library(count, seed)
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "phrases.json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(library, f, ensure_ascii=False, indent=2)
+                old_path = files.PHRASES_FILE
+                files.PHRASES_FILE = path
+                try:
+                    if operation == "load":
+                        return measure(
+                            lambda _: files.load_phrases(), [None], [len(library)], "phrases", setup=clear_document_cache, min_calls=1
+                        )
+                    return measure(files.save_phrases, [library], [len(library)], "phrases", min_calls=1)
+                finally:
+                    files.PHRASES_FILE = old_path
+
+        cases[f"load_phrases[{count}]"] = lambda run_case=run_case: run_case("load")
+        cases[f"save_phrases[{count}]"] = lambda run_case=run_case: run_case("save")
+    return cases
+
+
+def run(seed: int, quick: bool, only: str | None) -> dict[str, Any]:
+    cases: dict[str, Callable[[], dict[str, Any]]] = {}
+    for factory in (_import_cases, _syllabification_cases, _text_cases, _engine_cases, _batch_cases, _library_cases):
+        cases.update(factory(seed, quick))
+
+    results = {}
+    for name, case in cases.items():
+        if only and only not in name:
+            continue
+        results[name] = case()
+        print(_format_result(name, results[name]), flush=True)
+
+    ratios = speedups(results)
+    for name, ratio in ratios.items():
+        print(f"{name:32} fast engine speedup x{ratio:.2f}")
+    return {"meta": _meta(seed, quick), "results": results, "speedups": ratios}
+
+
+def _meta(seed: int, quick: bool) -> dict[str, Any]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "quick": quick,
+    }
+
+
+def _format_result(name: str, result: dict[str, Any]) -> str:
+    if "skipped" in result:
+        return f"{name:32} {result['skipped']}"
+    return (
+        f"{name:32} p50 {result['p50_ms']:10.3f} ms  p95 {result['p95_ms']:10.3f} ms  "
+        f"{result['units_per_s']:12,.0f} {result['unit']}/s  ({result['calls']} calls)"
+    )
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[str]:
+    """Names of cases whose p50 got slower than the baseline by more than ``threshold``."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "p50_ms" not in base or "p50_ms" not in result or base["p50_ms"] <= 0:
+            continue
+        change = result["p50_ms"] / base["p50_ms"] - 1
+        marker = "REGRESSION" if change > threshold else ""
+        print(f"{name:32} {base['p50_ms']:10.3f} -> {result['p50_ms']:10.3f} ms  {change:+7.1%} {marker}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed p50 slowdown (0.15 = 15%%)")
+    parser.add_argument("--quick", action="store_true", help="skip book-sized texts and the 100k library")
+    parser.add_argument("--only", help="run only cases whose name contains this string")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    current = run(args.seed, args.quick, args.only)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Throughput and latency of the scoring server (src/server.py) under concurrent local clients.
+
+    python benchmarks/server_bench.py --clients 32 --requests 50
+    python benchmarks/server_bench.py --endpoint /process --size sentence
+
+The server runs in a subprocess on a free local port, once with micro-batching turned off
+(``--max-batch 1``) and once with the given batch settings. Each client keeps one
+keep-alive connection and sends its requests one after another; texts come from the seeded
+corpus. Reported per run: requests/s, latency p50/p95/max, and the mean micro-batch size
+from the server's /metrics.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "server_results.json")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from corpus import make_corpus  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def request(self, method: str, path: str, payload: Any = None) -> tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        assert self.reader is not None
+        body = json.dumps(payload, ensure_ascii=False).encode() if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        return int(head.split(b" ")[1]), await self.reader.readexactly(length)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _distribution(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _mean_batch(metrics: str) -> float | None:
+    values = {}
+    for line in metrics.splitlines():
+        if line.startswith(("learn_to_read_http_batch_texts_sum", "learn_to_read_http_batch_texts_count")):
+            name, value = line.split()
+            values[name] = float(value)
+    count = values.get("learn_to_read_http_batch_texts_count")
+    return values["learn_to_read_http_batch_texts_sum"] / count if count else None
+
+
+async def _load(port: int, endpoint: str, texts: list[str], clients: int, requests: int) -> dict[str, Any]:
+    latencies: list[float] = []
+    failures = 0
+
+    async def client_loop(index: int) -> None:
+        nonlocal failures
+        client = Client(port)
+        try:
+            for i in range(requests):
+                started = time.perf_counter()
+                status, _body = await client.request("POST", endpoint, {"text": texts[(index * requests + i) % len(texts)]})
+                latencies.append(time.perf_counter() - started)
+                failures += status != 200
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop(index) for index in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    client = Client(port)
+    _status, metrics = await client.request("GET", "/metrics")
+    client.close()
+    return {
+        "elapsed_s": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "latency": _distribution(latencies),
+        "failures": failures,
+        "mean_batch": _mean_batch(metrics.decode()),
+    }
+
+
+async def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client = Client(port)
+            await client.request("GET", "/health")
+            client.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+def run_server(server_args: list[str], endpoint: str, texts: list[str], clients: int, requests: int) -> dict[str, Any]:
+    port = _free_port()
+
+    async def scenario() -> dict[str, Any]:
+        await _wait_ready(port)
+        return await _load(port, endpoint, texts, clients, requests)
+
+    process = subprocess.Popen([sys.executable, "-m", "src.server", "--port", str(port), *server_args], cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        return asyncio.run(scenario())
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=50, help="requests per connection")
+    parser.add_argument("--endpoint", default="/score", choices=("/score", "/syllabify", "/process", "/breakdown"))
+    parser.add_argument("--size", default="sentence", choices=("phrase", "sentence", "paragraph"), help="corpus text size")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    texts = make_corpus(args.size, 1000)
+    batched = ["--max-batch", str(args.max_batch), "--max-delay-ms", str(args.max_delay_ms)]
+    result = {
+        "clients": args.clients,
+        "requests": args.requests,
+        "endpoint": args.endpoint,
+        "size": args.size,
+        "runs": {
+            "unbatched": run_server(["--max-batch", "1", "--max-delay-ms", "0"], args.endpoint, texts, args.clients, args.requests),
+            "batched": run_server(batched, args.endpoint, texts, args.clients, args.requests),
+        },
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(f"{args.clients} clients x {args.requests} requests to {args.endpoint} ({args.size} texts)")
+    for name, run in result["runs"].items():
+        latency = run["latency"]
+        batch = f", mean batch {run['mean_batch']:.1f}" if run["mean_batch"] else ""
+        print(
+            f"  {name:10} {run['requests_per_s']:8.0f} req/s  p50 {latency['p50_ms']:6.1f} ms  p95 {latency['p95_ms']:6.1f} ms"
+            f"  max {latency['max_ms']:6.1f} ms{batch}  ({run['failures']} failed)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
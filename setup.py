@@ -1,10 +1,20 @@
-from setuptools import find_packages, setup
+from setuptools import find_namespace_packages, setup
 
 setup(
     name="syllable_processor",
     version="0.1",
-    packages=find_packages(),
+    # src/domain and src/services have no __init__.py
+    packages=find_namespace_packages(include=["src", "src.*"], exclude=["*.__pycache__"]),
     install_requires=[
         "pytest>=8.0.0",
     ],
+    extras_require={
+        # Vectorized library scoring (src/text_complexity_batch.py); pure Python without it
+        "numpy": ["numpy>=1.22"],
+    },
+    entry_points={
+        # Batch syllabification and scoring without the UI (src/cli.py)
+        # and the local HTTP service (src/server.py)
+        "console_scripts": ["learn-to-read=src.cli:main", "learn-to-read-server=src.server:main"],
+    },
 )
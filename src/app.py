@@ -4,27 +4,36 @@ from datetime import datetime
 
 import streamlit as st
 
+from domain.algorithms import DEFAULT_ALGORITHM, get_algorithm, list_algorithms
 from domain.complexity import calculate_text_complexity_universal as _calc_universal
+from domain.complexity import calculate_text_complexity_universal_batch as _calc_universal_batch
 from domain.complexity import compare_algorithms_children_vs_original
+from domain.complexity import estimate_text_complexity_universal as _estimate_universal
 from domain.complexity import get_age_thresholds_info as _age_thresholds
 from domain.complexity import get_complexity_breakdown_universal as _get_breakdown_universal
 from domain.complexity import get_complexity_emoji as _emoji
+from services import metrics, perf, profiling
+from services.bulk_import import IMPORT_FORMATS, import_texts, parse_import
+from services.files import StorageError
 from services.files import load_config as _load_config
-from services.files import load_phrases as _load_phrases
 from services.files import save_config as _save_config
 from services.files import save_phrases as _save_phrases
+from services.logging_setup import configure_logging
+from services.preview import DraftPreview
+from services.reading import advance as _advance_reading
+from services.reading import current_word as _current_word
+from services.reading import level_progress as _level_progress
+from services.reading import level_word_count as _level_word_count
+from services.reading import new_reading_state as _new_reading_state
+from services.refine import cancel_refinements, refine_in_background, refined_complexity
 from services.session import init_session_state as _init_session_state
-from syllable_processor import process_text
+from services.session import load_session_phrases as _load_session_phrases
 
 # Set page config for wide layout
 st.set_page_config(layout="wide")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(), logging.FileHandler("app.log", encoding="utf-8")],
-)
+# Configure logging (queued, size-rotated; a no-op apart from the level on later reruns)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Add this at the top of the file with other imports
@@ -33,6 +42,18 @@ CONFIG_FILE = "config.json"
 
 LEVEL_NAMES = {1: "Слоги", 2: "Слова по слогам", 3: "Полный текст"}
 
+# Seconds between checks for exact scores of texts shown with an estimate
+REFINE_POLL_SECONDS = 2
+
+_st_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def fragment(func=None, *, run_every=None):
+    """st.fragment: its widgets rerun only the fragment (older Streamlit reruns the whole page)"""
+    if _st_fragment is None:
+        return func if func is not None else (lambda f: f)
+    return _st_fragment(func, run_every=run_every)
+
 
 def get_age_thresholds_info(age):
     return _age_thresholds(age)
@@ -50,6 +71,31 @@ def save_config(config):
     return _save_config(config)
 
 
+def complexity_settings():
+    """(age, include_cognitive_load, algorithm id) for the scoring functions"""
+    return (
+        st.session_state.child_age,
+        st.session_state.use_cognitive_load,
+        st.session_state.get("algorithm", DEFAULT_ALGORITHM),
+    )
+
+
+def settings_config():
+    """The scoring settings as saved to config.json (with the old flag for older versions of the app)"""
+    algorithm = st.session_state.get("algorithm", DEFAULT_ALGORITHM)
+    return {
+        "child_age": st.session_state.child_age,
+        "use_cognitive_load": st.session_state.use_cognitive_load,
+        "algorithm": algorithm,
+        "use_children_algorithm": algorithm == "children",
+    }
+
+
+def complexity_label(phrase):
+    """Complexity as shown in lists: ≈ marks an estimate still being refined in the background"""
+    return f"≈{phrase['complexity']}" if "complexity_estimate" in phrase else str(phrase["complexity"])
+
+
 def update_phrases_complexity():
     """Update complexity for all phrases (no sorting - preserve original order)"""
     if not st.session_state.phrases_data:
@@ -57,14 +103,21 @@ def update_phrases_complexity():
 
     logger.info("Updating complexity for all phrases (preserving original file order)")
 
-    # Recalculate complexity for all phrases
-    for phrase in st.session_state.phrases_data:
-        phrase["complexity"] = calculate_text_complexity_universal(
-            phrase["text"],
-            age=st.session_state.child_age,
-            include_cognitive_load=st.session_state.use_cognitive_load,
-            use_children_algorithm=st.session_state.get("use_children_algorithm", True),
-        )
+    # Exact scores for the new settings replace the estimates: their background jobs are not needed
+    estimated = [phrase["text"] for phrase in st.session_state.phrases_data if "complexity_estimate" in phrase]
+    if estimated:
+        cancel_refinements(estimated)
+
+    # Recalculate complexity for all phrases in one batch
+    scores = _calc_universal_batch(
+        [phrase["text"] for phrase in st.session_state.phrases_data],
+        age=st.session_state.child_age,
+        include_cognitive_load=st.session_state.use_cognitive_load,
+        algorithm=st.session_state.get("algorithm", DEFAULT_ALGORITHM),
+    )
+    for phrase, complexity in zip(st.session_state.phrases_data, scores, strict=True):
+        phrase["complexity"] = complexity
+        phrase.pop("complexity_estimate", None)
 
     # No sorting here - file order is preserved like a database
     # UI will sort for display purposes only
@@ -76,7 +129,7 @@ def calculate_text_complexity_universal(
     text: str,
     age: int = 8,
     include_cognitive_load: bool = True,
-    use_children_algorithm: bool = True,
+    algorithm: str = DEFAULT_ALGORITHM,
 ) -> int:
     """
     Универсальная функция для расчета сложности текста
@@ -85,7 +138,7 @@ def calculate_text_complexity_universal(
         text: Текст для анализа
         age: Возраст ребенка (6-11 лет)
         include_cognitive_load: Учитывать ли когнитивную нагрузку
-        use_children_algorithm: Использовать ли детский алгоритм
+        algorithm: Id алгоритма сложности (см. domain/algorithms.py)
 
     Returns:
         Сложность текста
@@ -94,7 +147,7 @@ def calculate_text_complexity_universal(
         text,
         age=age,
         include_cognitive_load=include_cognitive_load,
-        use_children_algorithm=use_children_algorithm,
+        algorithm=algorithm,
     )
 
 
@@ -102,7 +155,7 @@ def get_complexity_breakdown_universal(
     text: str,
     age: int = 8,
     include_cognitive_load: bool = True,
-    use_children_algorithm: bool = True,
+    algorithm: str = DEFAULT_ALGORITHM,
 ) -> dict:
     """
     Универсальная функция для получения детального анализа сложности
@@ -111,7 +164,7 @@ def get_complexity_breakdown_universal(
         text,
         age=age,
         include_cognitive_load=include_cognitive_load,
-        use_children_algorithm=use_children_algorithm,
+        algorithm=algorithm,
     )
 
 
@@ -395,11 +448,14 @@ console.log('Animation event handlers initialized');
 
 
 def load_phrases():
-    return _load_phrases()
+    return _load_session_phrases()
 
 
 def save_phrases(phrases_data):
-    return _save_phrases(phrases_data)
+    try:
+        _save_phrases(phrases_data)
+    except StorageError as e:
+        st.error(str(e))
 
 
 def add_new_text_to_collection(text):
@@ -418,25 +474,29 @@ def add_new_text_to_collection(text):
         # Create new phrase object
         new_phrase = {"text": text_normalized, "is_read": False, "read_date": None}
 
-        # Calculate complexity for the new phrase
-        new_phrase["complexity"] = calculate_text_complexity_universal(
-            text_normalized,
-            age=st.session_state.child_age,
-            include_cognitive_load=st.session_state.use_cognitive_load,
-            use_children_algorithm=st.session_state.get("use_children_algorithm", True),
-        )
+        # Calculate complexity for the new phrase: a book is estimated from a sample and refined in the background
+        settings = complexity_settings()
+        estimate = _estimate_universal(text_normalized, *settings)
+        new_phrase["complexity"] = estimate["complexity"]
+        if not estimate["exact"]:
+            new_phrase["complexity_estimate"] = estimate
+            refine_in_background(text_normalized, *settings)
 
         # Add to END of session state (no sorting here - preserve file order)
         st.session_state.phrases_data.append(new_phrase)
 
         # Save to file (this will add to the end of the file)
         save_phrases(st.session_state.phrases_data)
+        metrics.PHRASES_ADDED.inc()
 
-        logger.info(f"Successfully added new text to end of collection with complexity {new_phrase['complexity']:.1f}")
+        logger.info(f"Successfully added new text to end of collection with complexity {complexity_label(new_phrase)}")
 
         # Show success message
         complexity_emoji = get_complexity_emoji(new_phrase["complexity"], st.session_state.child_age)
-        st.success(f"✅ Текст добавлен в коллекцию! Сложность: {complexity_emoji} {new_phrase['complexity']:.1f}")
+        message = f"✅ Текст добавлен в коллекцию! Сложность: {complexity_emoji} {complexity_label(new_phrase)}"
+        if not estimate["exact"]:
+            message += f" ({estimate['low']}–{estimate['high']}, уточняется)"
+        st.success(message)
 
         # Force page refresh to show new text in correctly sorted unread column
         # This will also clear the form automatically
@@ -450,33 +510,113 @@ def add_new_text_to_collection(text):
         return False
 
 
+@fragment(run_every=REFINE_POLL_SECONDS)
+def show_refinement_status():
+    """Swap estimated scores for exact ones as their background jobs finish"""
+    settings = complexity_settings()
+    estimated = [phrase for phrase in st.session_state.phrases_data if "complexity_estimate" in phrase]
+    refined = False
+    for phrase in estimated:
+        # Restarts a job that was dropped meanwhile (see services/refine.py), else reuses it
+        refine_in_background(phrase["text"], *settings)
+        complexity = refined_complexity(phrase["text"], *settings)
+        if complexity is not None:
+            phrase["complexity"] = complexity
+            del phrase["complexity_estimate"]
+            refined = True
+    if refined:
+        # Lists are sorted by complexity: redraw the whole page
+        st.rerun()
+    if estimated:
+        st.caption(f"≈ Уточняется сложность длинных текстов: {len(estimated)}")
+
+
+def get_draft_preview():
+    """Live preview of the add tab draft for the current scoring settings (a new one when they change)"""
+    settings = complexity_settings()
+    preview = st.session_state.get("draft_preview")
+    if preview is None or preview.settings != settings:
+        preview = st.session_state.draft_preview = DraftPreview(*settings)
+    return preview
+
+
+@fragment
+def show_add_text_tab():
+    """Add tab: draft with a live complexity preview, rescored only where it changed"""
+    # A widget's value can only be reset before the widget is created
+    if st.session_state.pop("clear_add_text_draft", False):
+        st.session_state.add_text_draft = ""
+
+    new_text = st.text_area("Введите новый текст для добавления в коллекцию:", height=180, key="add_text_draft")
+    if new_text.strip():
+        preview = get_draft_preview()
+        with perf.span("draft_preview"):
+            complexity = preview.update(new_text.strip())
+        complexity_emoji = get_complexity_emoji(complexity, st.session_state.child_age)
+        st.caption(
+            f"{complexity_emoji} Сложность: {complexity} · слов: {preview.word_count} · "
+            f"пересчитано слов: {preview.changed_words} за {preview.seconds * 1000:.1f} мс"
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        save_only = st.button("💾 Сохранить в коллекцию", use_container_width=True)
+    with col2:
+        save_and_start = st.button("📖 Сохранить и начать чтение", use_container_width=True)
+    if save_only or save_and_start:
+        if new_text.strip():
+            success = add_new_text_to_collection(new_text.strip())
+            if success:
+                st.session_state.clear_add_text_draft = True
+                if save_and_start:
+                    start_reading_session(new_text.strip())
+        else:
+            st.error("Пожалуйста, введите текст!")
+
+    # main() never runs on a fragment rerun: the new text must reach the whole page from here
+    if st.session_state.need_rerun:
+        st.session_state.need_rerun = False
+        st.rerun()
+
+
+def show_bulk_import():
+    """Import many texts from a file: one scoring pass and one save"""
+    report = st.session_state.pop("import_report", None)
+    if report:
+        st.success(f"📥 Добавлено: {report['added']} · дубликатов: {report['duplicates']} · отклонено: {report['rejected']}")
+
+    with st.expander("📥 Импорт из файла: TXT (текст в строке), CSV или JSON"):
+        # A new key after each import empties the uploader
+        uploads = st.session_state.get("import_uploads", 0)
+        uploaded = st.file_uploader("Файл с текстами", type=list(IMPORT_FORMATS), key=f"import_file_{uploads}")
+        if uploaded is not None and st.button("📥 Импортировать", use_container_width=True):
+            try:
+                entries = parse_import(uploaded.getvalue(), uploaded.name)
+            except ValueError as e:
+                st.error(f"❌ Не удалось прочитать файл: {e}")
+                return
+            try:
+                st.session_state.import_report = import_texts(st.session_state.phrases_data, entries, *complexity_settings())
+            except StorageError as e:
+                st.error(str(e))
+                return
+            st.session_state.import_uploads = uploads + 1
+            st.rerun()
+
+
 def init_session_state():
     # Delegate to services.session
-    _init_session_state()
+    with perf.span("init_session_state"):
+        _init_session_state()
 
 
 def start_reading_session(text):
     """Initialize reading session"""
     try:
-        result = process_text(text)
-        if not result:
-            raise ValueError("Invalid processing result")
-
-        st.session_state.reading_state = {
-            "current_level": 1,
-            "levels": {
-                1: {"words": result[1]["words"], "progress": 0},
-                2: {"words": result[2]["words"], "progress": 0},
-                3: {"words": result[3]["words"], "progress": 0},
-            },
-            "stats": {
-                "total_words": sum(len(level["words"]) for level in result.values()),
-                "good": 0,
-                "medium": 0,
-                "bad": 0,
-            },
-        }
+        with perf.span("process_text"):
+            st.session_state.reading_state = _new_reading_state(text)
         st.session_state.current_text = text
+        metrics.SESSIONS_STARTED.inc()
     except Exception as e:
         logger.error(f"Error initializing session: {str(e)}")
         st.error("Ошибка обработки текста. Пожалуйста, попробуйте другой текст.")
@@ -487,20 +627,17 @@ def handle_rating(rating):
     logger.debug(f"Processing rating: {rating}")
     state = st.session_state.reading_state
     current_level = state["current_level"]
-    level_data = state["levels"][current_level]
 
     # Update stats
     state["stats"][rating] += 1
 
-    # Advance to next word (animation is handled by JavaScript)
-    level_data["progress"] += 1
-
-    # Check level completion
-    if level_data["progress"] >= len(level_data["words"]):
+    # Advance to next word (animation is handled by JavaScript) and check level completion
+    if _advance_reading(state):
         if current_level < 3:
             logger.info(f"Completed level {current_level}, advancing to level {current_level + 1}")
             state["current_level"] += 1
         else:
+            metrics.SESSIONS_COMPLETED.inc()
             # Calculate success rate
             success_rate = (state["stats"]["good"] + state["stats"]["medium"] * 0.5) / state["stats"]["total_words"]
             logger.info(f"Completed all levels. Success rate: {success_rate:.2f}")
@@ -551,7 +688,10 @@ def show_text_selection():
         )
         return
 
-    logger.info(f"Displaying {len(st.session_state.phrases_data)} phrases")
+    logger.info("Displaying %d phrases", len(st.session_state.phrases_data))
+    # The fragment polls every REFINE_POLL_SECONDS: render it only while some score is an estimate
+    if any("complexity_estimate" in phrase for phrase in st.session_state.phrases_data):
+        show_refinement_status()
 
     tab_texts, tab_collection, tab_add, tab_quick, tab_settings = st.tabs(
         [
@@ -609,7 +749,7 @@ def show_text_selection():
                     title = truncate_text(phrase_data["text"], 120)
                     complexity_emoji = get_complexity_emoji(phrase_data["complexity"], st.session_state.child_age)
                     st.markdown(
-                        f"**{unread_count}. {title}**  <span class='badge'>Сложность: {complexity_emoji} {phrase_data['complexity']}</span>",
+                        f"**{unread_count}. {title}**  <span class='badge'>Сложность: {complexity_emoji} {complexity_label(phrase_data)}</span>",
                         unsafe_allow_html=True,
                     )
 
@@ -654,7 +794,7 @@ def show_text_selection():
             if len(display_unread_phrases) == 0:
                 st.info("Все тексты прочитаны! 🎉")
 
-            logger.info(f"Displayed {unread_count} unread phrases in left column")
+            logger.info("Displayed %d unread phrases in left column", unread_count)
 
         with col2:
             st.subheader("✅ Прочитанные тексты")
@@ -673,7 +813,7 @@ def show_text_selection():
                         except ValueError:
                             read_date_str = f" • Прочитано: {phrase_data['read_date']}"
                     complexity_emoji = get_complexity_emoji(phrase_data["complexity"], st.session_state.child_age)
-                    st.caption(f"Сложность: {complexity_emoji} {phrase_data['complexity']}{read_date_str}")
+                    st.caption(f"Сложность: {complexity_emoji} {complexity_label(phrase_data)}{read_date_str}")
 
                     c1, c2 = st.columns([1, 1])
                     with c1:
@@ -713,7 +853,7 @@ def show_text_selection():
             if read_count == 0:
                 st.info("Пока нет прочитанных текстов")
 
-            logger.info(f"Displayed {read_count} read phrases in right column")
+            logger.info("Displayed %d read phrases in right column", read_count)
 
         st.caption("Шорткаты: в выборе — 1-9 для старта чтения. В чтении — 1: Трудно, 2: Средне, 3: Отлично, Esc: Назад.")
 
@@ -727,23 +867,12 @@ def show_text_selection():
         for phrase in all_items:
             complexity_emoji = get_complexity_emoji(phrase["complexity"], st.session_state.child_age)
             status_icon = "✅" if phrase.get("is_read") else "📖"
-            st.markdown(f"{status_icon} {complexity_emoji} {phrase['complexity']}: {truncate_text(phrase['text'], 140)}")
+            st.markdown(f"{status_icon} {complexity_emoji} {complexity_label(phrase)}: {truncate_text(phrase['text'], 140)}")
 
     # ============ TAB: ДОБАВИТЬ ============
-    with tab_add, st.form(key="add_text_form", clear_on_submit=True):
-        new_text = st.text_area("Введите новый текст для добавления в коллекцию:", height=180)
-        col1, col2 = st.columns(2)
-        with col1:
-            save_only = st.form_submit_button("💾 Сохранить в коллекцию", use_container_width=True)
-        with col2:
-            save_and_start = st.form_submit_button("📖 Сохранить и начать чтение", use_container_width=True)
-        if save_only or save_and_start:
-            if new_text.strip():
-                success = add_new_text_to_collection(new_text.strip())
-                if success and save_and_start:
-                    start_reading_session(new_text.strip())
-            else:
-                st.error("Пожалуйста, введите текст!")
+    with tab_add:
+        show_add_text_tab()
+        show_bulk_import()
 
     # ============ TAB: БЫСТРОЕ ЧТЕНИЕ ============
     with tab_quick, st.form(key="quick_reading_form", clear_on_submit=True):
@@ -768,12 +897,7 @@ def show_text_selection():
             )
             if new_age != st.session_state.child_age:
                 st.session_state.child_age = new_age
-                config = {
-                    "child_age": st.session_state.child_age,
-                    "use_cognitive_load": st.session_state.use_cognitive_load,
-                    "use_children_algorithm": st.session_state.use_children_algorithm,
-                }
-                save_config(config)
+                save_config(settings_config())
                 update_phrases_complexity()
                 st.success(f"Возраст изменен на {new_age} лет. Сложность пересчитана!")
                 logger.info(f"Age changed to {new_age}, complexity recalculated (file order preserved)")
@@ -786,35 +910,27 @@ def show_text_selection():
             )
             if new_cognitive != st.session_state.use_cognitive_load:
                 st.session_state.use_cognitive_load = new_cognitive
-                config = {
-                    "child_age": st.session_state.child_age,
-                    "use_cognitive_load": st.session_state.use_cognitive_load,
-                    "use_children_algorithm": st.session_state.use_children_algorithm,
-                }
-                save_config(config)
+                save_config(settings_config())
                 update_phrases_complexity()
                 status = "включен" if new_cognitive else "выключен"
                 st.success(f"Учет длины текста {status}. Сложность пересчитана!")
                 logger.info(f"Cognitive load setting changed to {new_cognitive}, complexity recalculated (file order preserved)")
                 st.rerun()
         with col3:
-            new_algorithm = st.checkbox(
-                "🆕 Детский алгоритм",
-                value=st.session_state.use_children_algorithm,
-                help="Улучшенный алгоритм специально для детской литературы (рекомендуется)",
+            algorithm_ids = [algorithm.id for algorithm in list_algorithms()]
+            new_algorithm = st.selectbox(
+                "Алгоритм сложности",
+                options=algorithm_ids,
+                index=algorithm_ids.index(st.session_state.algorithm),
+                format_func=lambda algorithm_id: get_algorithm(algorithm_id).label,
+                help="\n\n".join(f"{algorithm.label}: {algorithm.description}" for algorithm in list_algorithms()),
             )
-            if new_algorithm != st.session_state.use_children_algorithm:
-                st.session_state.use_children_algorithm = new_algorithm
-                config = {
-                    "child_age": st.session_state.child_age,
-                    "use_cognitive_load": st.session_state.use_cognitive_load,
-                    "use_children_algorithm": st.session_state.use_children_algorithm,
-                }
-                save_config(config)
+            if new_algorithm != st.session_state.algorithm:
+                st.session_state.algorithm = new_algorithm
+                save_config(settings_config())
                 update_phrases_complexity()
-                algorithm_name = "детский (улучшенный)" if new_algorithm else "стандартный"
-                st.success(f"Алгоритм изменен на {algorithm_name}. Сложность пересчитана!")
-                logger.info(f"Algorithm changed to children={new_algorithm}, complexity recalculated (file order preserved)")
+                st.success(f"Алгоритм изменен на {get_algorithm(new_algorithm).label}. Сложность пересчитана!")
+                logger.info(f"Algorithm changed to {new_algorithm}, complexity recalculated (file order preserved)")
                 st.rerun()
 
         st.checkbox(
@@ -833,7 +949,7 @@ def show_text_selection():
                 last_updated_str = last_updated
         except Exception:
             last_updated_str = str(last_updated)
-        algorithm_name = "🆕 Детский (улучшенный)" if st.session_state.use_children_algorithm else "📚 Стандартный"
+        algorithm_name = get_algorithm(st.session_state.algorithm).label
         st.info(
             f"""
         **Текущие настройки:**
@@ -853,6 +969,35 @@ def show_text_selection():
         """
         )
 
+        if perf.is_enabled():
+            show_perf_diagnostics()
+
+
+def show_perf_diagnostics():
+    """Hidden diagnostics section (only when timing is enabled via LEARN_TO_READ_PERF=1 or ?perf=1)"""
+    with st.expander("🛠 Диагностика производительности", expanded=False):
+        perf_summary = perf.summary()
+        st.caption(f"Перезапусков в буфере: {perf_summary['reruns']}")
+        rows = [
+            {
+                "Участок": name,
+                "Вызовов": stats["calls"],
+                "p50, мс": round(stats["p50_ms"], 2),
+                "p95, мс": round(stats["p95_ms"], 2),
+                "p50 за перезапуск, мс": round(stats["rerun_p50_ms"], 2),
+                "p95 за перезапуск, мс": round(stats["rerun_p95_ms"], 2),
+            }
+            for name, stats in perf_summary["spans"].items()
+        ]
+        if rows:
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+        st.download_button(
+            "⬇️ Скачать замеры (JSON)",
+            data=perf.export_json(),
+            file_name="perf.json",
+            mime="application/json",
+        )
+
 
 def truncate_text(text, max_length):
     return text[:max_length] + "..." if len(text) > max_length else text
@@ -866,20 +1011,18 @@ def show_reading_interface():
         st.markdown(CHILD_STYLE, unsafe_allow_html=True)
     state = st.session_state.reading_state
     current_level = state["current_level"]
-    level_data = state["levels"][current_level]
 
     # Progress header
     total_levels = 3
-    level_progress = level_data["progress"] / len(level_data["words"])
+    level_progress = _level_progress(state)
     progress = (current_level - 1) / total_levels + level_progress / total_levels
     progress = min(progress, 1.0)
 
     st.progress(progress, text=f"Уровень {current_level} из {total_levels} - {LEVEL_NAMES[current_level]}")
 
     # Word display - simple, no animation logic (JavaScript handles it)
-    if current_level <= 3 and level_data["progress"] < len(level_data["words"]):
-        current_word = level_data["words"][level_data["progress"]]
-
+    current_word = _current_word(state)
+    if current_level <= 3 and current_word is not None:
         # Simple word display - JavaScript will handle all animation
         st.markdown(f'<div class="word-display">{current_word}</div>', unsafe_allow_html=True)
 
@@ -954,8 +1097,8 @@ def show_results():
 
         for level in range(1, 4):
             st.subheader(f"Уровень {level}: {LEVEL_NAMES[level]}")
-            level_data = state["levels"][level]
-            st.write(f"Прогресс: {len(level_data['words'])}/{len(level_data['words'])} слов")
+            level_count = _level_word_count(state, level)
+            st.write(f"Прогресс: {level_count}/{level_count} слов")
 
     # Navigation
     st.divider()
@@ -968,13 +1111,13 @@ def show_results():
                 text,
                 age=st.session_state.child_age,
                 include_cognitive_load=st.session_state.use_cognitive_load,
-                use_children_algorithm=st.session_state.use_children_algorithm,
+                algorithm=st.session_state.algorithm,
             )
 
             col1, col2 = st.columns(2)
 
             with col1:
-                algorithm_name = "🆕 Детский" if st.session_state.use_children_algorithm else "📚 Стандартный"
+                algorithm_name = get_algorithm(st.session_state.algorithm).label
                 st.markdown("**Общие показатели:**")
                 st.write(f"📝 Слов: {breakdown['words']}")
                 st.write(f"🎯 Возраст: {breakdown['age']} лет")
@@ -1003,7 +1146,7 @@ def show_results():
                 st.write(f"• Структура: {breakdown['structural_component']:.1f}")
                 st.write(f"• Лексика: {breakdown['lexical_component']:.1f}")
 
-                if st.session_state.use_children_algorithm:
+                if "bigram_component" in breakdown:
                     st.write(f"• 🆕 Биграммы: {breakdown.get('bigram_component', 0):.1f}")
                     st.write(f"• Морфология: {breakdown['morphological_component']:.1f}")
                 else:
@@ -1011,7 +1154,7 @@ def show_results():
                     st.write(f"• Фонетика: {breakdown['phonetic_component']:.1f}")
 
                 # Показать дополнительную информацию для детского алгоритма
-                if st.session_state.use_children_algorithm and "optimization_note" in breakdown:
+                if "optimization_note" in breakdown:
                     st.info(f"✨ {breakdown['optimization_note']}")
 
                     # Возможность сравнить с оригинальным алгоритмом
@@ -1034,24 +1177,45 @@ def show_results():
 
 def main():
     logger.info("=== Starting main application ===")
-    init_session_state()
+    metrics.start_exporter()
+    metrics.RERUNS.inc()
+    # ?perf=1 times this session's reruns only, and only while the parameter is in the URL
+    perf.begin_rerun(force=st.query_params.get("perf") == "1")
+    try:
+        init_session_state()
 
-    if st.session_state.reading_state:
-        logger.info("Displaying reading interface")
-        show_reading_interface()
-    else:
-        logger.info("Displaying text selection interface")
-        show_text_selection()
+        if st.session_state.reading_state:
+            logger.info("Displaying reading interface")
+            with perf.span("show_reading_interface"):
+                show_reading_interface()
+        else:
+            logger.info("Displaying text selection interface")
+            with perf.span("show_text_selection"):
+                show_text_selection()
 
-    if st.session_state.need_rerun:
-        st.session_state.need_rerun = False
-        st.rerun()
+        if st.session_state.need_rerun:
+            st.session_state.need_rerun = False
+            st.rerun()
 
-    # Inject JS for keyboard
-    st.components.v1.html(KEYBOARD_JS, height=0)
+        # Inject JS for keyboard
+        st.components.v1.html(KEYBOARD_JS, height=0)
+    finally:
+        perf.end_rerun()
 
     logger.info("=== Main application completed ===")
 
 
+def profile_requested():
+    """?profile=1 forces one capture per session; the latch is released once the parameter is gone"""
+    if st.query_params.get("profile") != "1":
+        st.session_state.pop("profile_captured", None)
+        return False
+    # While profiling is disabled nothing is captured, so the request stays pending
+    if st.session_state.get("profile_captured") or not profiling.is_enabled():
+        return False
+    st.session_state.profile_captured = True
+    return True
+
+
 if __name__ == "__main__":
-    main()
+    profiling.run(main, force=profile_requested())
@@ -0,0 +1,237 @@
+"""Syllabify and score texts from the command line, JSONL in and JSONL out.
+
+    learn-to-read phrases.jsonl > scored.jsonl            # complexity for age 8, children algorithm
+    learn-to-read --all-ages --algorithm improved book.txt
+    cat texts.txt | learn-to-read --levels --hyphenation --no-score
+    python -m src.cli --workers 4 library.jsonl           # without installing
+    learn-to-read ingest book.fb2 --max-complexity 40     # add a book to phrases.json as passages
+
+Input is one text per line: plain text, or JSONL objects with a "text" field (chosen by
+file extension, or --format). A JSONL object is passed through with the results added,
+so a library can be rescored in place:
+  - "complexity": the score for --age, or {"6": ..., "11": ...} with --all-ages;
+  - "levels": reading levels of process_text (syllables, hyphenated words, full text);
+  - "hyphenation": the text's words split into syllables with hyphens.
+
+Texts are read lazily and processed in chunks by a process pool with a bounded number of
+chunks in flight, so memory does not grow with the input. Output keeps the input order.
+Lines that are not valid JSON objects with a text are reported on stderr (exit status 1).
+
+``learn-to-read ingest BOOK`` splits a .txt or .fb2 book into short passages and appends the
+new ones to phrases.json in the current directory (see services/ingest.py); an interrupted
+run resumes from its checkpoint. The counts are printed as one JSON object.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, TextIO
+
+# Support both package and script imports
+try:
+    from .domain.algorithms import DEFAULT_ALGORITHM, list_algorithms
+    from .domain.complexity import calculate_text_complexity_universal_batch
+    from .services.files import StorageError, load_phrases
+    from .services.ingest import INGEST_CHUNK_SIZE, ingest_book
+    from .syllable_processor import process_text
+except Exception:  # context: src on sys.path (python src/cli.py)
+    from domain.algorithms import DEFAULT_ALGORITHM, list_algorithms  # type: ignore
+    from domain.complexity import calculate_text_complexity_universal_batch  # type: ignore
+    from services.files import StorageError, load_phrases  # type: ignore
+    from services.ingest import INGEST_CHUNK_SIZE, ingest_book  # type: ignore
+    from syllable_processor import process_text  # type: ignore
+
+AGES = tuple(range(6, 12))
+# Texts per task sent to a worker process
+CHUNK_SIZE = 256
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
+def _input_format(path: str, requested: str) -> str:
+    if requested != "auto":
+        return requested
+    return "jsonl" if os.path.splitext(path)[1].lower() in JSONL_EXTENSIONS else "text"
+
+
+def read_records(lines: Iterable[str], input_format: str, source: str = "-", errors: list[str] | None = None) -> Iterator[dict[str, Any]]:
+    """Records with a "text" field, one per non-blank line; broken lines go to stderr and ``errors`` and are skipped."""
+
+    def report(message: str) -> None:
+        print(message, file=sys.stderr)
+        if errors is not None:
+            errors.append(message)
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if input_format == "text":
+            yield {"text": line.rstrip("\r\n")}
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            report(f"{source}:{number}: invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+            report(f'{source}:{number}: expected an object with a "text" string')
+            continue
+        yield record
+
+
+def process_records(records: list[dict[str, Any]], options: dict[str, Any]) -> list[str]:
+    """Results for a chunk of records as JSON lines (runs in a worker process)."""
+    texts = [record["text"] for record in records]
+    if options["score"]:
+        scores = {
+            age: calculate_text_complexity_universal_batch(texts, age, options["cognitive_load"], options["algorithm"])
+            for age in options["ages"]
+        }
+    lines = []
+    for i, record in enumerate(records):
+        result = dict(record)
+        if options["score"]:
+            result["complexity"] = (
+                {str(age): scores[age][i] for age in options["ages"]} if options["all_ages"] else scores[options["ages"][0]][i]
+            )
+        if options["levels"] or options["hyphenation"]:
+            levels = process_text(record["text"])
+            if options["levels"]:
+                result["levels"] = levels
+            if options["hyphenation"]:
+                result["hyphenation"] = levels[2]["words"]
+        lines.append(json.dumps(result, ensure_ascii=False))
+    return lines
+
+
+def _chunks(records: Iterator[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+def run(records: Iterator[dict[str, Any]], options: dict[str, Any], workers: int, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Output lines in input order; at most 2 * workers chunks are in flight."""
+    if workers <= 1:
+        for chunk in _chunks(records, chunk_size):
+            yield from process_records(chunk, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit(process_records, chunk, options))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _open_inputs(paths: Sequence[str], input_format: str, errors: list[str]) -> Iterator[dict[str, Any]]:
+    for path in paths or ["-"]:
+        if path == "-":
+            yield from read_records(sys.stdin, "text" if input_format == "auto" else input_format, errors=errors)
+            continue
+        with open(path, encoding="utf-8-sig") as f:
+            yield from read_records(f, _input_format(path, input_format), path, errors)
+
+
+def ingest_main(argv: Sequence[str], stdout: TextIO | None = None) -> int:
+    """``learn-to-read ingest BOOK``: add a book to phrases.json as passages."""
+    parser = argparse.ArgumentParser(prog="learn-to-read ingest", description="Add a .txt or .fb2 book to phrases.json as short passages.")
+    parser.add_argument("book", metavar="BOOK", help="book file (.txt or .fb2)")
+    parser.add_argument("--age", type=int, default=8, help="child age for the score (default 8)")
+    parser.add_argument("--algorithm", choices=[algorithm.id for algorithm in list_algorithms()], default=DEFAULT_ALGORITHM)
+    parser.add_argument("--no-cognitive-load", action="store_true", help="leave the text length out of the score")
+    parser.add_argument("--min-words", type=_positive_int, default=3, help="shortest passage in words (default 3)")
+    parser.add_argument("--max-words", type=_positive_int, default=25, help="longest passage in words (default 25)")
+    parser.add_argument("--min-complexity", type=int, help="skip passages scored below this")
+    parser.add_argument("--max-complexity", type=int, help="skip passages scored above this")
+    parser.add_argument("--workers", type=_positive_int, default=1, help="worker processes for scoring (default 1)")
+    parser.add_argument("--chunk-size", type=_positive_int, default=INGEST_CHUNK_SIZE, help="passages per save and checkpoint")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: BOOK.ingest.json)")
+    args = parser.parse_args(argv)
+    if args.min_words > args.max_words:
+        parser.error("--min-words must not exceed --max-words")
+
+    include_cognitive_load = not args.no_cognitive_load
+    try:
+        phrases = load_phrases(args.age, include_cognitive_load, args.algorithm)
+        counts = ingest_book(
+            args.book,
+            phrases,
+            age=args.age,
+            include_cognitive_load=include_cognitive_load,
+            algorithm=args.algorithm,
+            min_words=args.min_words,
+            max_words=args.max_words,
+            min_complexity=args.min_complexity,
+            max_complexity=args.max_complexity,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            checkpoint_path=args.checkpoint,
+        )
+    except (OSError, ValueError, StorageError) as e:
+        print(f"learn-to-read ingest: {e}", file=sys.stderr)
+        return 1
+    (stdout or sys.stdout).write(json.dumps(counts) + "\n")
+    return 0
+
+
+def main(argv: Sequence[str] | None = None, stdout: TextIO | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["ingest"]:
+        return ingest_main(argv[1:], stdout)
+
+    parser = argparse.ArgumentParser(prog="learn-to-read", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", metavar="FILE", help="input files (default: stdin, or -)")
+    parser.add_argument("--format", choices=("auto", "text", "jsonl"), default="auto", help="input format (auto: by file extension)")
+    ages = parser.add_mutually_exclusive_group()
+    ages.add_argument("--age", type=int, default=8, help="child age for the score (default 8)")
+    ages.add_argument("--all-ages", action="store_true", help=f"score for every age {AGES[0]}-{AGES[-1]}")
+    parser.add_argument("--algorithm", choices=[algorithm.id for algorithm in list_algorithms()], default=DEFAULT_ALGORITHM)
+    parser.add_argument("--no-cognitive-load", action="store_true", help="leave the text length out of the score")
+    parser.add_argument("--no-score", action="store_true", help="do not compute complexity")
+    parser.add_argument("--levels", action="store_true", help="emit the reading levels of process_text")
+    parser.add_argument("--hyphenation", action="store_true", help="emit the words split into syllables")
+    parser.add_argument("--workers", type=_positive_int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=_positive_int, default=CHUNK_SIZE, help="texts per worker task")
+    args = parser.parse_args(argv)
+
+    options = {
+        "score": not args.no_score,
+        "ages": AGES if args.all_ages else (args.age,),
+        "all_ages": args.all_ages,
+        "cognitive_load": not args.no_cognitive_load,
+        "algorithm": args.algorithm,
+        "levels": args.levels,
+        "hyphenation": args.hyphenation,
+    }
+    out = stdout or sys.stdout
+    errors: list[str] = []
+    try:
+        for line in run(_open_inputs(args.inputs, args.format, errors), options, args.workers, args.chunk_size):
+            out.write(line + "\n")
+    except OSError as e:
+        print(f"learn-to-read: {e}", file=sys.stderr)
+        return 1
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
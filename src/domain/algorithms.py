@@ -0,0 +1,184 @@
+"""Registry of complexity algorithms.
+
+An algorithm declares its id, a version fingerprint and its entry points as
+``"module:function"`` references inside ``src``; modules are imported on first use, so
+listing algorithms (e.g. for the settings tab) loads none of them.
+
+Entry points, all called as ``(text or texts, age=..., include_cognitive_load=...)``:
+  - ``score``: the fast scorer of one text (or Document);
+  - ``reference``: the reference implementation with identical scores;
+  - ``breakdown``: the detailed breakdown dict;
+  - ``batch`` (optional): scores for a list of texts in one call;
+  - ``estimate`` (optional): a sampled estimate for very long texts.
+``options`` are extra keyword arguments for ``batch`` and ``estimate``, whose shared
+implementations serve several algorithms.
+
+``preview_model`` names the word-sum model of text_complexity_fast (one of PREVIEW_MODELS)
+that reproduces the algorithm's scores, so the draft preview can rescore only the edited
+words; with None the preview rescores the whole draft.
+
+``cache_key(age, include_cognitive_load)`` identifies scores computed with the algorithm;
+bump ``version`` whenever the same text may score differently, and cached scores keyed
+by it become stale.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+DEFAULT_ALGORITHM = "children"
+ENTRY_POINTS = ("score", "reference", "breakdown", "batch", "estimate")
+PREVIEW_MODELS = ("children", "improved")
+
+# "src" when imported as src.domain.algorithms, "" for streamlit run src/app.py (src on sys.path)
+_ROOT = __package__.rpartition(".")[0] if __package__ else ""
+
+
+def load_entry_point(reference: str) -> Callable[..., Any]:
+    """The function behind ``"module:function"`` (module relative to src), importing the module if needed."""
+    module, _, name = reference.partition(":")
+    return getattr(importlib.import_module(f"{_ROOT}.{module}" if _ROOT else module), name)
+
+
+class Algorithm:
+    """One registered algorithm; entry points are resolved once, on first use."""
+
+    def __init__(
+        self,
+        id: str,  # noqa: A002 (the registry key)
+        label: str,
+        version: str,
+        score: str,
+        reference: str,
+        breakdown: str,
+        batch: str | None = None,
+        estimate: str | None = None,
+        options: dict[str, Any] | None = None,
+        description: str = "",
+        preview_model: str | None = None,
+    ) -> None:
+        if preview_model is not None and preview_model not in PREVIEW_MODELS:
+            raise ValueError(f"Unknown preview model {preview_model!r}, expected one of {PREVIEW_MODELS}")
+        self.id = id
+        self.label = label
+        self.version = version
+        self.description = description
+        self.options = options or {}
+        self.preview_model = preview_model
+        self.entry_points = {"score": score, "reference": reference, "breakdown": breakdown, "batch": batch, "estimate": estimate}
+        self._loaded: dict[str, Callable[..., Any]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"Algorithm({self.id!r}, version={self.version!r})"
+
+    def has(self, name: str) -> bool:
+        return self.entry_points.get(name) is not None
+
+    def entry(self, name: str) -> Callable[..., Any]:
+        """Entry point ``name`` (see ENTRY_POINTS); raises LookupError if the algorithm has none."""
+        function = self._loaded.get(name)
+        if function is not None:
+            return function
+        reference = self.entry_points.get(name)
+        if reference is None:
+            raise LookupError(f"Algorithm {self.id!r} has no {name!r} entry point")
+        with self._lock:
+            function = self._loaded.get(name)
+            if function is None:
+                function = load_entry_point(reference)
+                if name in ("batch", "estimate") and self.options:
+                    function = partial(function, **self.options)
+                self._loaded[name] = function
+        return function
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._loaded)
+
+    def cache_key(self, age: int, include_cognitive_load: bool) -> tuple[str, str, int, bool]:
+        return (self.id, self.version, age, include_cognitive_load)
+
+
+_registry: dict[str, Algorithm] = {}
+
+
+def register_algorithm(algorithm: Algorithm) -> Algorithm:
+    """Add an algorithm to the registry; raises ValueError if the id is taken."""
+    if algorithm.id in _registry:
+        raise ValueError(f"Algorithm {algorithm.id!r} is already registered")
+    _registry[algorithm.id] = algorithm
+    return algorithm
+
+
+def get_algorithm(choice: str | bool | Algorithm = DEFAULT_ALGORITHM) -> Algorithm:
+    """The algorithm for an id; True/False are the old use_children_algorithm flag. Raises ValueError."""
+    if isinstance(choice, Algorithm):
+        return choice
+    if isinstance(choice, bool):
+        choice = "children" if choice else "improved"
+    try:
+        return _registry[choice]
+    except KeyError:
+        raise ValueError(f"Unknown complexity algorithm {choice!r}, expected one of {sorted(_registry)}") from None
+
+
+def list_algorithms() -> list[Algorithm]:
+    return list(_registry.values())
+
+
+def algorithm_from_config(config: dict[str, Any]) -> str:
+    """Algorithm id from config.json: "algorithm", else the old "use_children_algorithm" flag."""
+    algorithm = config.get("algorithm")
+    if algorithm in _registry:
+        return algorithm
+    return get_algorithm(bool(config.get("use_children_algorithm", True))).id
+
+
+register_algorithm(
+    Algorithm(
+        "children",
+        label="🆕 Детский (улучшенный)",
+        version="children-1",
+        score="text_complexity_fast:calculate_children_text_complexity_fast",
+        reference="text_complexity_children_optimized:calculate_children_text_complexity_optimized",
+        breakdown="text_complexity_children_optimized:get_children_complexity_breakdown",
+        batch="text_complexity_batch:calculate_text_complexity_batch",
+        estimate="text_complexity_estimate:estimate_text_complexity",
+        options={"use_children_algorithm": True},
+        preview_model="children",
+        description="Частотность букв в детской литературе, биграммы, возрастная адаптация (рекомендуется)",
+    )
+)
+register_algorithm(
+    Algorithm(
+        "improved",
+        label="📚 Стандартный",
+        version="improved-1",
+        score="text_complexity_fast:calculate_text_complexity_improved_fast",
+        reference="text_complexity_improved:calculate_text_complexity_improved",
+        breakdown="text_complexity_improved:get_complexity_breakdown",
+        batch="text_complexity_batch:calculate_text_complexity_batch",
+        estimate="text_complexity_estimate:estimate_text_complexity",
+        options={"use_children_algorithm": False},
+        preview_model="improved",
+        description="Слоги, длина слов, морфология и фонетика без детской частотности букв",
+    )
+)
+
+
+__all__ = [
+    "Algorithm",
+    "DEFAULT_ALGORITHM",
+    "ENTRY_POINTS",
+    "PREVIEW_MODELS",
+    "algorithm_from_config",
+    "get_algorithm",
+    "list_algorithms",
+    "load_entry_point",
+    "register_algorithm",
+]
@@ -1,24 +1,61 @@
 from __future__ import annotations
 
+import logging
+import os
+import warnings
+from collections.abc import Iterable
+
 # Support both package contexts:
 # 1) When imported as `src.domain.complexity` (tests, package execution)
 # 2) When imported as `domain.complexity` (running `streamlit run src/app.py`)
+# The scorers themselves are loaded by the algorithm registry on first use.
 try:  # context: src.domain
-    from ..text_complexity_children_optimized import (
-        calculate_children_text_complexity_optimized,
-        compare_algorithms_children_vs_original,
-        get_children_complexity_breakdown,
-    )
-    from ..text_complexity_improved import calculate_text_complexity_improved
-    from ..text_complexity_improved import get_complexity_breakdown as get_complexity_breakdown_improved
+    from .algorithms import DEFAULT_ALGORITHM, Algorithm, get_algorithm, load_entry_point
+    from .document import Document, analyze_text
+    from .observe import timed
 except Exception:  # context: domain
-    from text_complexity_children_optimized import (  # type: ignore
-        calculate_children_text_complexity_optimized,
-        compare_algorithms_children_vs_original,
-        get_children_complexity_breakdown,
-    )
-    from text_complexity_improved import calculate_text_complexity_improved  # type: ignore
-    from text_complexity_improved import get_complexity_breakdown as get_complexity_breakdown_improved  # type: ignore[no-redef]
+    from domain.algorithms import DEFAULT_ALGORITHM, Algorithm, get_algorithm, load_entry_point  # type: ignore
+    from domain.document import Document, analyze_text  # type: ignore
+    from domain.observe import timed  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# "fast" (default) or "reference"; both give identical scores, see tests/test_text_complexity_fast.py
+SCORING_ENGINE_ENV = "LEARN_TO_READ_SCORING_ENGINE"
+# Engine name -> the algorithm entry point it scores with
+SCORING_ENGINES = {"fast": "score", "reference": "reference"}
+
+# An algorithm id from the registry (or the Algorithm itself); True/False are the old flag (True: "children")
+AlgorithmChoice = str | bool | Algorithm
+
+_scoring_engine = os.environ.get(SCORING_ENGINE_ENV, "fast")
+if _scoring_engine not in SCORING_ENGINES:
+    logger.warning("Unknown %s=%r, using the fast engine", SCORING_ENGINE_ENV, _scoring_engine)
+    _scoring_engine = "fast"
+
+
+def _resolve_algorithm(algorithm: AlgorithmChoice, use_children_algorithm: bool | None) -> Algorithm:
+    """Алгоритм из реестра; use_children_algorithm - устаревший синоним algorithm=True/False"""
+    if use_children_algorithm is not None:
+        warnings.warn(
+            'use_children_algorithm is deprecated, pass algorithm="children" or algorithm="improved"',
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        return get_algorithm(bool(use_children_algorithm))
+    return get_algorithm(algorithm)
+
+
+def get_scoring_engine() -> str:
+    return _scoring_engine
+
+
+def set_scoring_engine(name: str) -> None:
+    """Switch the implementation behind calculate_text_complexity_universal at runtime."""
+    global _scoring_engine
+    if name not in SCORING_ENGINES:
+        raise ValueError(f"Unknown scoring engine {name!r}, expected one of {sorted(SCORING_ENGINES)}")
+    _scoring_engine = name
 
 
 def get_age_thresholds_info(age: int) -> str:
@@ -65,47 +102,112 @@ def get_complexity_emoji(complexity: float | int, age: int) -> str:
             return "❌"
 
 
+@timed("calculate_text_complexity_universal")
 def calculate_text_complexity_universal(
-    text: str,
+    text: str | Document,
     age: int = 8,
     include_cognitive_load: bool = True,
-    use_children_algorithm: bool = True,
+    algorithm: AlgorithmChoice = DEFAULT_ALGORITHM,
+    *,
+    use_children_algorithm: bool | None = None,
 ) -> int:
     """
     Универсальная функция для расчета сложности текста
 
     Args:
-        text: Текст для анализа
+        text: Текст для анализа (или готовый Document из analyze_text)
         age: Возраст ребенка (6-11 лет)
         include_cognitive_load: Учитывать ли когнитивную нагрузку
-        use_children_algorithm: Использовать ли детский алгоритм
+        algorithm: Id алгоритма из реестра (domain/algorithms.py)
+        use_children_algorithm: Устаревший флаг детского алгоритма (вместо algorithm)
 
     Returns:
         Сложность текста
     """
-    if use_children_algorithm:
-        return calculate_children_text_complexity_optimized(text, age=age, include_cognitive_load=include_cognitive_load)
-    else:
-        return calculate_text_complexity_improved(text, age=age, include_cognitive_load=include_cognitive_load)
+    scorer = _resolve_algorithm(algorithm, use_children_algorithm).entry(SCORING_ENGINES[_scoring_engine])
+    return scorer(text, age=age, include_cognitive_load=include_cognitive_load)
 
 
-def get_complexity_breakdown_universal(
+@timed("calculate_text_complexity_universal_batch")
+def calculate_text_complexity_universal_batch(
+    texts: Iterable[str | Document],
+    age: int = 8,
+    include_cognitive_load: bool = True,
+    algorithm: AlgorithmChoice = DEFAULT_ALGORITHM,
+    *,
+    use_children_algorithm: bool | None = None,
+) -> list[int]:
+    """Сложность всех текстов библиотеки за один вызов (векторно на NumPy, если он установлен)"""
+    algorithm = _resolve_algorithm(algorithm, use_children_algorithm)
+    if _scoring_engine == "reference" or not algorithm.has("batch"):
+        return [calculate_text_complexity_universal(text, age, include_cognitive_load, algorithm) for text in texts]
+    return algorithm.entry("batch")(texts, age, include_cognitive_load)
+
+
+@timed("estimate_text_complexity_universal")
+def estimate_text_complexity_universal(
     text: str,
     age: int = 8,
     include_cognitive_load: bool = True,
-    use_children_algorithm: bool = True,
+    algorithm: AlgorithmChoice = DEFAULT_ALGORITHM,
+    word_budget: int | None = None,
+    time_budget: float | None = None,
+    *,
+    use_children_algorithm: bool | None = None,
+) -> dict:
+    """
+    Сложность текста в пределах бюджета: точно для текстов до word_budget слов
+    (по умолчанию ESTIMATE_WORD_BUDGET), иначе по выборке слов
+
+    Returns:
+        complexity, low и high (95% интервал), exact, sampled_words, total_words
+    """
+    algorithm = _resolve_algorithm(algorithm, use_children_algorithm)
+    if not algorithm.has("estimate"):
+        # Алгоритм без оценки по выборке: всегда точный расчёт
+        complexity = calculate_text_complexity_universal(text, age, include_cognitive_load, algorithm)
+        words = analyze_text(text).word_count
+        return {
+            "complexity": complexity,
+            "low": complexity,
+            "high": complexity,
+            "exact": True,
+            "sampled_words": words,
+            "total_words": words,
+        }
+    budget = {} if word_budget is None else {"word_budget": word_budget}
+    return algorithm.entry("estimate")(text, age, include_cognitive_load, time_budget=time_budget, **budget)
+
+
+def get_complexity_breakdown_universal(
+    text: str | Document,
+    age: int = 8,
+    include_cognitive_load: bool = True,
+    algorithm: AlgorithmChoice = DEFAULT_ALGORITHM,
+    *,
+    use_children_algorithm: bool | None = None,
 ) -> dict:
     """Универсальная функция для получения детального анализа сложности"""
-    if use_children_algorithm:
-        return get_children_complexity_breakdown(text, age=age, include_cognitive_load=include_cognitive_load)
-    else:
-        return get_complexity_breakdown_improved(text, age=age, include_cognitive_load=include_cognitive_load)
+    breakdown = _resolve_algorithm(algorithm, use_children_algorithm).entry("breakdown")
+    return breakdown(text, age=age, include_cognitive_load=include_cognitive_load)
+
+
+def compare_algorithms_children_vs_original(text: str | Document, age: int = 8, include_cognitive_load: bool = True) -> dict[str, float]:
+    """Сравнение детского и стандартного алгоритмов (см. text_complexity_children_optimized)"""
+    compare = load_entry_point("text_complexity_children_optimized:compare_algorithms_children_vs_original")
+    return compare(text, age, include_cognitive_load)
 
 
 __all__ = [
+    "Document",
+    "analyze_text",
     "get_age_thresholds_info",
     "get_complexity_emoji",
     "calculate_text_complexity_universal",
+    "calculate_text_complexity_universal_batch",
+    "estimate_text_complexity_universal",
+    "get_scoring_engine",
+    "set_scoring_engine",
     "get_complexity_breakdown_universal",
     "compare_algorithms_children_vs_original",
 ]
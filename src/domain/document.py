@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from time import perf_counter
+
+# Support both package contexts (see domain/complexity.py)
+try:  # context: src.domain
+    from ..syllable_processor import (
+        CompactLevels,
+        is_vowel,
+        split_syllables_hybrid,
+        split_syllables_text,
+        tokenize,
+        unify_text_in_one_line,
+    )
+except Exception:  # context: domain
+    from syllable_processor import (  # type: ignore
+        CompactLevels,
+        is_vowel,
+        split_syllables_hybrid,
+        split_syllables_text,
+        tokenize,
+        unify_text_in_one_line,
+    )
+
+try:
+    from . import observe
+except Exception:  # pragma: no cover - runtime import mode
+    from domain import observe  # type: ignore
+
+# Total text characters of the analyzed documents kept in memory (LRU by content hash).
+# A Document holds string lists per word and syllable, so the cache is bounded by size, not count;
+# a text longer than the limit is not cached at all
+DOCUMENT_CACHE_CHARS = 500_000
+
+
+def syllable_features(syllable: str) -> tuple[int, int, int, int]:
+    """
+    Признаки слога, общие для обоих алгоритмов сложности.
+
+    Returns:
+        (согласные без ь/ъ, количество ь/ъ, пары гласных подряд, длина слога)
+    """
+    consonants = sum(1 for c in syllable if not is_vowel(c) and c not in ("ь", "ъ"))
+    special_chars = sum(1 for c in syllable if c in ("ь", "ъ"))
+    consecutive_vowels = sum(1 for i in range(len(syllable) - 1) if is_vowel(syllable[i]) and is_vowel(syllable[i + 1]))
+    return consonants, special_chars, consecutive_vowels, len(syllable)
+
+
+class Document:
+    """
+    Результат однократного анализа текста.
+
+    Хранит всё, что нужно чтению по уровням, оценке сложности и разбивке:
+      - tokens: слова текста как есть (токены из одной пунктуации, например «—», пропускаются)
+      - words: токены в нижнем регистре (так их видят алгоритмы сложности)
+      - syllables / features: слоги каждого слова и признаки каждого слога
+      - level3_words / level3_spans: слова без завершающей пунктуации (уровень «Полный текст») и их границы в тексте
+      - clean_words / clean_syllables: слова без внешней пунктуации для уровней чтения
+    """
+
+    __slots__ = (
+        "text",
+        "content_hash",
+        "tokens",
+        "words",
+        "syllables",
+        "features",
+        "level3_words",
+        "level3_spans",
+        "clean_words",
+        "clean_syllables",
+    )
+
+    def __init__(self, text: str, content_hash: str | None = None) -> None:
+        self.text = text
+        self.content_hash = content_hash or document_hash(text)
+        self.tokens: list[str] = []
+        self.level3_words: list[str] = []
+        self.level3_spans: list[tuple[int, int]] = []
+        self.clean_words: list[str] = []
+        for start, end, w3, clean in tokenize(text):
+            if clean:
+                self.tokens.append(text[start:end])
+                self.level3_words.append(w3)
+                self.level3_spans.append((start, start + len(w3)))
+                self.clean_words.append(clean)
+
+        self.words: list[str] = [token.lower() for token in self.tokens]
+        self.syllables: list[list[str]] = split_syllables_text(self.words)
+        self.features: list[list[tuple[int, int, int, int]]] = [[syllable_features(s) for s in sylls] for sylls in self.syllables]
+        self.clean_syllables: list[list[str]] = [
+            sylls if clean == word else split_syllables_hybrid(clean)
+            for word, clean, sylls in zip(self.words, self.clean_words, self.syllables, strict=True)
+        ]
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    def levels(self) -> dict:
+        """Уровни чтения в формате ``process_text``."""
+        all_syllables: list[str] = []
+        hyphenated_words: list[str] = []
+        for sylls in self.clean_syllables:
+            all_syllables.extend(sylls)
+            hyphenated_words.append("-".join(sylls))
+
+        level3_words = [*self.level3_words, unify_text_in_one_line(self.text)]
+
+        return {
+            1: {"levelName": "Слоги", "words": all_syllables},
+            2: {"levelName": "Слова по слогам", "words": hyphenated_words},
+            3: {"levelName": "Полный текст", "words": level3_words},
+        }
+
+    def compact_levels(self) -> CompactLevels:
+        """Уровни чтения в формате ``compact_process_text`` из уже найденных слогов."""
+        return CompactLevels.from_syllables(self.text, self.level3_spans, self.clean_syllables)
+
+
+def document_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+_cache: OrderedDict[str, Document] = OrderedDict()
+_cache_chars = 0
+_cache_lock = threading.Lock()
+
+
+def analyze_text(text: str | Document) -> Document:
+    """Return the Document for a text, analyzing it only if it is not cached yet."""
+    global _cache_chars
+    if isinstance(text, Document):
+        return text
+
+    key = document_hash(text)
+    with _cache_lock:
+        document = _cache.get(key)
+        if document is not None:
+            _cache.move_to_end(key)
+            observe.cache_lookups("document", hits=1)
+            return document
+
+    observe.cache_lookups("document", misses=1)
+    started = perf_counter()
+    document = Document(text, content_hash=key)
+    observe.timing("syllabification", perf_counter() - started)
+    if len(text) > DOCUMENT_CACHE_CHARS:
+        return document
+    with _cache_lock:
+        if key in _cache:  # analyzed by another thread meanwhile
+            _cache.move_to_end(key)
+            return _cache[key]
+        _cache[key] = document
+        _cache_chars += len(text)
+        while _cache_chars > DOCUMENT_CACHE_CHARS:
+            _cache_chars -= len(_cache.popitem(last=False)[1].text)
+    return document
+
+
+def clear_document_cache() -> None:
+    global _cache_chars
+    with _cache_lock:
+        _cache.clear()
+        _cache_chars = 0
+
+
+__all__ = ["Document", "analyze_text", "clear_document_cache", "document_hash", "syllable_features"]
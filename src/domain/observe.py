@@ -0,0 +1,62 @@
+"""Observation hooks of the scoring core.
+
+The domain layer and the algorithm modules report call timings and cache lookups here
+without knowing where they go; services.metrics and services.perf subscribe when they are
+imported. With no subscribers a hook costs one empty-list check.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import wraps
+from time import perf_counter
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# observer(name, seconds) for every timed call
+_timing_observers: list[Callable[[str, float], None]] = []
+# observer(cache, hits, misses) for every batch of cache lookups
+_cache_observers: list[Callable[[str, int, int], None]] = []
+
+
+def add_timing_observer(observer: Callable[[str, float], None]) -> None:
+    if observer not in _timing_observers:
+        _timing_observers.append(observer)
+
+
+def add_cache_observer(observer: Callable[[str, int, int], None]) -> None:
+    if observer not in _cache_observers:
+        _cache_observers.append(observer)
+
+
+def timing(name: str, seconds: float) -> None:
+    for observer in _timing_observers:
+        observer(name, seconds)
+
+
+def cache_lookups(cache: str, hits: int = 0, misses: int = 0) -> None:
+    for observer in _cache_observers:
+        observer(cache, hits, misses)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Report the duration of every call to the timing observers under ``name``."""
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _timing_observers:
+                return func(*args, **kwargs)
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timing(name, perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+__all__ = ["add_cache_observer", "add_timing_observer", "cache_lookups", "timed", "timing"]
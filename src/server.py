@@ -0,0 +1,359 @@
+"""Local HTTP JSON service for syllabification and scoring, on asyncio and the standard library.
+
+    learn-to-read-server --port 8765
+    python -m src.server --host 0.0.0.0 --max-batch 64 --max-delay-ms 2
+
+Endpoints (POST with a JSON object, answers in JSON):
+  - /syllabify  {"text"}: {"words": [{"word": ..., "syllables": [...]}, ...]}
+  - /process    {"text"}: the three reading levels of process_text
+  - /score      {"text"} or {"texts": [...]}, optional "age" (8), "algorithm"
+                (a registered id, "children" by default) and "include_cognitive_load" (true):
+                {"complexity": n} or {"complexities": [...]}
+  - /breakdown  {"text"} with the same options: the detailed complexity breakdown
+  - GET /health and GET /metrics (Prometheus text of the in-process registry)
+
+Texts of concurrent /score requests are coalesced into micro-batches: the first waiting
+text opens a batch that collects more for up to ``max_delay`` seconds or ``max_batch``
+texts, then each group of equal settings goes through the batch scorer in one call.
+All CPU work runs on one worker thread, so the event loop keeps accepting requests
+(and filling the next batch) meanwhile.
+
+Bodies over ``max_body_bytes`` and /score requests with more than ``MAX_TEXTS`` texts
+are answered with 413, oversized request headers with 431.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any
+
+# Support both package and script imports
+try:
+    from .domain.algorithms import DEFAULT_ALGORITHM, get_algorithm, list_algorithms
+    from .domain.complexity import calculate_text_complexity_universal_batch, get_complexity_breakdown_universal
+    from .services.metrics import HTTP_BATCH_TEXTS, HTTP_REQUEST_SECONDS, HTTP_REQUESTS, REGISTRY
+    from .syllable_processor import process_text, split_syllables_text, tokenize
+except Exception:  # context: src on sys.path (python src/server.py)
+    from domain.algorithms import DEFAULT_ALGORITHM, get_algorithm, list_algorithms  # type: ignore
+    from domain.complexity import calculate_text_complexity_universal_batch, get_complexity_breakdown_universal  # type: ignore
+    from services.metrics import HTTP_BATCH_TEXTS, HTTP_REQUEST_SECONDS, HTTP_REQUESTS, REGISTRY  # type: ignore
+    from syllable_processor import process_text, split_syllables_text, tokenize  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Texts scored together at most, and seconds the first text of a batch waits for more
+MAX_BATCH = 64
+MAX_DELAY = 0.002
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+# A rejected body up to this many times the limit is read and dropped, so the client gets the 413
+# (closing a socket with unread data resets the connection); anything larger is cut off
+DRAIN_FACTOR = 8
+# Texts in one /score request
+MAX_TEXTS = 1000
+AGES = range(6, 12)
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Content Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+Settings = tuple[int, bool, str]
+
+POST_ENDPOINTS = ("/syllabify", "/process", "/score", "/breakdown")
+GET_ENDPOINTS = ("/health", "/metrics")
+# Request metrics are labelled with known endpoints only; any other path counts as "other"
+ENDPOINT_LABELS = frozenset((*POST_ENDPOINTS, *GET_ENDPOINTS))
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatcher:
+    """Coalesces texts submitted by concurrent requests into calls of the batch scorer."""
+
+    def __init__(self, executor: ThreadPoolExecutor, max_batch: int = MAX_BATCH, max_delay: float = MAX_DELAY) -> None:
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self._queue: asyncio.Queue[tuple[str, Settings, asyncio.Future[int]]] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def score(self, texts: list[str], settings: Settings) -> list[int]:
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        for text, future in zip(texts, futures, strict=True):
+            self._queue.put_nowait((text, settings, future))
+        return list(await asyncio.gather(*futures))
+
+    async def _collect(self) -> list[tuple[str, Settings, asyncio.Future[int]]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            groups: dict[Settings, list[tuple[str, asyncio.Future[int]]]] = {}
+            for text, settings, future in await self._collect():
+                # A request whose client went away no longer waits for its scores
+                if not future.done():
+                    groups.setdefault(settings, []).append((text, future))
+            for settings, items in groups.items():
+                self.batches += 1
+                HTTP_BATCH_TEXTS.observe(len(items))
+                try:
+                    scores = await loop.run_in_executor(
+                        self.executor, calculate_text_complexity_universal_batch, [text for text, _ in items], *settings
+                    )
+                except Exception as e:  # noqa: BLE001 (reported to every waiting request)
+                    for _text, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_text, future), score in zip(items, scores, strict=True):
+                    if not future.done():
+                        future.set_result(score)
+
+
+def _text(payload: dict[str, Any]) -> str:
+    text = payload.get("text")
+    if not isinstance(text, str):
+        raise HTTPError(400, 'expected "text" to be a string')
+    return text
+
+
+def _settings(payload: dict[str, Any]) -> Settings:
+    age = payload.get("age", 8)
+    if not isinstance(age, int) or isinstance(age, bool) or age not in AGES:
+        raise HTTPError(400, f'"age" must be an integer from {AGES[0]} to {AGES[-1]}')
+    algorithm = payload.get("algorithm", DEFAULT_ALGORITHM)
+    if not isinstance(algorithm, str):
+        raise HTTPError(400, '"algorithm" must be a string')
+    try:
+        algorithm = get_algorithm(algorithm).id
+    except ValueError:
+        raise HTTPError(400, f'"algorithm" must be one of {", ".join(a.id for a in list_algorithms())}') from None
+    include_cognitive_load = payload.get("include_cognitive_load", True)
+    if not isinstance(include_cognitive_load, bool):
+        raise HTTPError(400, '"include_cognitive_load" must be true or false')
+    return age, include_cognitive_load, algorithm
+
+
+def syllabify(text: str) -> dict[str, Any]:
+    words = [(w3, clean) for _start, _end, w3, clean in tokenize(text) if clean]
+    syllables = split_syllables_text([clean for _w3, clean in words])
+    return {"words": [{"word": w3, "syllables": parts} for (w3, _clean), parts in zip(words, syllables, strict=True)]}
+
+
+class ScoringServer:
+    """The HTTP front end: parses requests, checks limits and dispatches to the domain layer."""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_batch: int = MAX_BATCH,
+        max_delay: float = MAX_DELAY,
+        max_body_bytes: int = MAX_BODY_BYTES,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.max_body_bytes = max_body_bytes
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self.batcher = MicroBatcher(self.executor, max_batch, max_delay)
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> int:
+        """Start listening; returns the port (useful with port 0)."""
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Scoring server listening on http://%s:%d", self.host, self.port)
+        return self.port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await self._handle_one(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_one(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Answer one request; returns whether the connection stays open."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                await self._respond(writer, 400, {"error": "incomplete request"}, "-", False)
+            return False
+        except asyncio.LimitOverrunError:
+            await self._respond(writer, 431, {"error": f"request headers over {MAX_HEADER_BYTES} bytes"}, "-", False)
+            return False
+
+        started = time.perf_counter()
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = request_line.split(" ")
+        except ValueError:
+            await self._respond(writer, 400, {"error": "malformed request line"}, "-", False)
+            return False
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        path = target.split("?", 1)[0]
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self._respond(writer, 400, {"error": "invalid Content-Length"}, path, False)
+            return False
+        if length > self.max_body_bytes:
+            if length <= DRAIN_FACTOR * self.max_body_bytes:
+                while length > 0:
+                    length -= len(await reader.readexactly(min(length, 64 * 1024)))
+            await self._respond(writer, 413, {"error": f"body over {self.max_body_bytes} bytes"}, path, False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        try:
+            status, payload = 200, await self._dispatch(method, path, headers, body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception:
+            logger.exception("Failed to answer %s %s", method, path)
+            status, payload = 500, {"error": "internal error"}
+        await self._respond(writer, status, payload, path, keep_alive)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started)
+        return keep_alive
+
+    async def _dispatch(self, method: str, path: str, headers: dict[str, str], body: bytes) -> Any:
+        if method == "GET" and path == "/health":
+            return {"status": "ok"}
+        if method == "GET" and path == "/metrics":
+            return REGISTRY.render()
+        if path not in POST_ENDPOINTS:
+            raise HTTPError(404, f"unknown endpoint {path}")
+        if method != "POST":
+            raise HTTPError(405, f"{path} expects POST")
+        if "content-length" not in headers:
+            raise HTTPError(411, "Content-Length is required")
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(400, f"invalid JSON: {e}") from e
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "expected a JSON object")
+
+        loop = asyncio.get_running_loop()
+        if path == "/syllabify":
+            return await loop.run_in_executor(self.executor, syllabify, _text(payload))
+        if path == "/process":
+            return await loop.run_in_executor(self.executor, process_text, _text(payload))
+        if path == "/breakdown":
+            text, settings = _text(payload), _settings(payload)
+            return await loop.run_in_executor(self.executor, get_complexity_breakdown_universal, text, *settings)
+
+        settings = _settings(payload)
+        if "texts" not in payload:
+            return {"complexity": (await self.batcher.score([_text(payload)], settings))[0]}
+        texts = payload["texts"]
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise HTTPError(400, 'expected "texts" to be a list of strings')
+        if len(texts) > MAX_TEXTS:
+            raise HTTPError(413, f"more than {MAX_TEXTS} texts in one request")
+        return {"complexities": await self.batcher.score(texts, settings)}
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Any, endpoint: str, keep_alive: bool) -> None:
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+        HTTP_REQUESTS.inc(endpoint=endpoint if endpoint in ENDPOINT_LABELS else "other", status=str(status))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="learn-to-read-server", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="texts scored together at most")
+    parser.add_argument("--max-delay-ms", type=float, default=MAX_DELAY * 1000, help="how long a batch waits for more texts")
+    parser.add_argument("--max-body-bytes", type=int, default=MAX_BODY_BYTES)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    server = ScoringServer(args.host, args.port, args.max_batch, args.max_delay_ms / 1000, args.max_body_bytes)
+    with suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
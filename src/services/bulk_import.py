@@ -0,0 +1,143 @@
+"""Bulk import of many texts into the collection with one scoring pass and one save.
+
+Accepted files:
+  - ``.txt``: one text per line (blank lines are skipped);
+  - ``.csv``: the ``text`` column if the header has one, otherwise the first column;
+  - ``.json``: a list of strings or of objects with ``text`` (or ``phrase``, like phrases.json).
+
+Entries are stripped and deduplicated in one pass against the collection and each other,
+scored with ``calculate_text_complexity_universal_batch`` and appended; phrases.json is
+written once per import.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import os
+from typing import Any
+
+# Support both package and script imports
+try:
+    from ..domain.algorithms import DEFAULT_ALGORITHM
+    from ..domain.complexity import AlgorithmChoice, calculate_text_complexity_universal_batch
+    from ..syllable_processor import count_words
+    from .files import save_phrases
+    from .metrics import PHRASES_ADDED
+    from .perf import timed
+except Exception:  # pragma: no cover - runtime import mode
+    from domain.algorithms import DEFAULT_ALGORITHM  # type: ignore
+    from domain.complexity import AlgorithmChoice, calculate_text_complexity_universal_batch  # type: ignore
+    from services.files import save_phrases  # type: ignore
+    from services.metrics import PHRASES_ADDED  # type: ignore
+    from services.perf import timed  # type: ignore
+    from syllable_processor import count_words  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("txt", "csv", "json")
+# Tried in order for uploaded bytes: UTF-8 (with or without BOM), then the usual Windows Cyrillic encoding
+IMPORT_ENCODINGS = ("utf-8-sig", "cp1251")
+
+
+def _decode(content: bytes | str) -> str:
+    if isinstance(content, str):
+        return content
+    for encoding in IMPORT_ENCODINGS[:-1]:
+        try:
+            return content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return content.decode(IMPORT_ENCODINGS[-1], errors="replace")
+
+
+def parse_import(content: bytes | str, filename: str) -> list[Any]:
+    """Entries of an import file, picked by its extension; raises ValueError for unknown or broken files."""
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    text = _decode(content)
+
+    if extension == "txt":
+        return [line for line in text.splitlines() if line.strip()]
+
+    if extension == "csv":
+        rows = [row for row in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in row)]
+        if not rows:
+            return []
+        header = [cell.strip().lower() for cell in rows[0]]
+        if "text" in header:
+            column = header.index("text")
+            rows = rows[1:]
+        else:
+            column = 0
+        return [row[column] if column < len(row) else None for row in rows]
+
+    if extension == "json":
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {filename}: {e}") from e
+        if not isinstance(data, list):
+            raise ValueError(f"{filename} must contain a JSON list of texts")
+        return [entry.get("text", entry.get("phrase")) if isinstance(entry, dict) else entry for entry in data]
+
+    raise ValueError(f"Unsupported file type {extension!r}, expected one of {', '.join(IMPORT_FORMATS)}")
+
+
+def dedupe_texts(existing: set[str], entries: list[Any]) -> tuple[list[str], int, int]:
+    """New texts among ``entries`` (stripped, in order), plus the duplicate and rejected counts.
+
+    ``existing`` holds the stripped texts already in the collection and is updated in place,
+    so repeats within ``entries`` (and in later calls) count as duplicates.
+    """
+    new_texts: list[str] = []
+    duplicates = rejected = 0
+    for entry in entries:
+        text = entry.strip() if isinstance(entry, str) else ""
+        if not count_words(text):
+            rejected += 1
+        elif text in existing:
+            duplicates += 1
+        else:
+            existing.add(text)
+            new_texts.append(text)
+    return new_texts, duplicates, rejected
+
+
+def append_texts(phrases_data: list[dict[str, Any]], texts: list[str], scores: list[int]) -> None:
+    """Append scored unread texts to ``phrases_data`` and save the collection once (StorageError if it fails)."""
+    if not texts:
+        return
+    phrases_data.extend(
+        {"text": text, "is_read": False, "read_date": None, "complexity": complexity}
+        for text, complexity in zip(texts, scores, strict=True)
+    )
+    save_phrases(phrases_data)
+    PHRASES_ADDED.inc(len(texts))
+
+
+@timed("import_texts")
+def import_texts(
+    phrases_data: list[dict[str, Any]],
+    entries: list[Any],
+    age: int = 8,
+    include_cognitive_load: bool = True,
+    algorithm: AlgorithmChoice = DEFAULT_ALGORITHM,
+) -> dict[str, int]:
+    """Append new texts to ``phrases_data`` and save once.
+
+    Returns counts of ``added`` texts, ``duplicates`` (already in the collection or repeated
+    in the file) and ``rejected`` entries (not a string, or without a single word).
+    """
+    existing = {phrase["text"].strip() for phrase in phrases_data}
+    new_texts, duplicates, rejected = dedupe_texts(existing, entries)
+    if new_texts:
+        scores = calculate_text_complexity_universal_batch(new_texts, age, include_cognitive_load, algorithm)
+        append_texts(phrases_data, new_texts, scores)
+
+    logger.info("Imported %d texts (%d duplicates, %d rejected)", len(new_texts), duplicates, rejected)
+    return {"added": len(new_texts), "duplicates": duplicates, "rejected": rejected}
+
+
+__all__ = ["IMPORT_FORMATS", "IMPORT_ENCODINGS", "append_texts", "dedupe_texts", "import_texts", "parse_import"]
@@ -6,13 +6,17 @@ import os
 from datetime import datetime
 from typing import Any
 
-import streamlit as st
-
 # Support both package and script imports
 try:
-    from ..domain.complexity import calculate_text_complexity_universal
+    from ..domain.algorithms import DEFAULT_ALGORITHM
+    from ..domain.complexity import calculate_text_complexity_universal_batch
+    from .metrics import LOAD_SECONDS, SAVE_SECONDS, SAVES
+    from .perf import timed
 except Exception:  # pragma: no cover - runtime import mode
-    from domain.complexity import calculate_text_complexity_universal  # type: ignore
+    from domain.algorithms import DEFAULT_ALGORITHM  # type: ignore
+    from domain.complexity import calculate_text_complexity_universal_batch  # type: ignore
+    from services.metrics import LOAD_SECONDS, SAVE_SECONDS, SAVES  # type: ignore
+    from services.perf import timed  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,10 @@ PHRASES_FILE = "phrases.json"
 CONFIG_FILE = "config.json"
 
 
+class StorageError(Exception):
+    """phrases.json could not be read or written; the message is meant for the user."""
+
+
 def load_config() -> dict[str, Any]:
     try:
         with open(CONFIG_FILE, encoding="utf-8") as f:
@@ -31,6 +39,7 @@ def load_config() -> dict[str, Any]:
         default_config: dict[str, Any] = {
             "child_age": 8,
             "use_cognitive_load": True,
+            "algorithm": "children",
             "use_children_algorithm": True,
             "last_updated": datetime.now().isoformat(),
         }
@@ -48,12 +57,18 @@ def save_config(config: dict[str, Any]) -> None:
         logger.error("Could not save config to %s: %s", CONFIG_FILE, e)
 
 
-def load_phrases() -> list[dict[str, Any]]:
+@timed("load_phrases")
+@LOAD_SECONDS.time()
+def load_phrases(
+    age: int = 8,
+    include_cognitive_load: bool = True,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> list[dict[str, Any]]:
+    """The collection from phrases.json, scored with the given settings; raises StorageError."""
     logger.info("Starting to load phrases from %s", PHRASES_FILE)
     if not os.path.exists(PHRASES_FILE):
         logger.error("File %s not found. Please create it with phrases data.", PHRASES_FILE)
-        st.error(f"Файл {PHRASES_FILE} не найден. Пожалуйста, создайте его с данными фраз.")
-        return []
+        raise StorageError(f"Файл {PHRASES_FILE} не найден. Пожалуйста, создайте его с данными фраз.")
 
     try:
         logger.info("Opening file %s for reading", PHRASES_FILE)
@@ -91,12 +106,14 @@ def load_phrases() -> list[dict[str, Any]]:
             else:
                 unread_count += 1
 
-            phrase["complexity"] = calculate_text_complexity_universal(
-                phrase["text"],
-                age=st.session_state.get("child_age", 8),
-                include_cognitive_load=st.session_state.get("use_cognitive_load", True),
-                use_children_algorithm=st.session_state.get("use_children_algorithm", True),
-            )
+        scores = calculate_text_complexity_universal_batch(
+            [phrase["text"] for phrase in data],
+            age=age,
+            include_cognitive_load=include_cognitive_load,
+            algorithm=algorithm,
+        )
+        for phrase, complexity in zip(data, scores, strict=True):
+            phrase["complexity"] = complexity
 
         logger.info(
             "Processed %d phrases: %d read, %d unread",
@@ -108,11 +125,13 @@ def load_phrases() -> list[dict[str, Any]]:
         return data
     except (json.JSONDecodeError, FileNotFoundError) as e:
         logger.error("Error reading %s: %s", PHRASES_FILE, e)
-        st.error(f"Ошибка чтения файла {PHRASES_FILE}: {e}")
-        return []
+        raise StorageError(f"Ошибка чтения файла {PHRASES_FILE}: {e}") from e
 
 
+@timed("save_phrases")
+@SAVE_SECONDS.time()
 def save_phrases(phrases_data: list[dict[str, Any]]) -> None:
+    """Write the collection to phrases.json without the computed scores; raises StorageError."""
     logger.info("Starting to save %d phrases to %s", len(phrases_data), PHRASES_FILE)
     try:
         phrases_to_save: list[dict[str, Any]] = []
@@ -120,7 +139,8 @@ def save_phrases(phrases_data: list[dict[str, Any]]) -> None:
         unread_count = 0
 
         for _i, phrase in enumerate(phrases_data):
-            phrase_copy = {k: v for k, v in phrase.items() if k != "complexity"}
+            # Scores are recomputed on load; only the text and reading status are stored
+            phrase_copy = {k: v for k, v in phrase.items() if k not in ("complexity", "complexity_estimate")}
             phrases_to_save.append(phrase_copy)
             if phrase.get("is_read", False):
                 read_count += 1
@@ -140,6 +160,7 @@ def save_phrases(phrases_data: list[dict[str, Any]]) -> None:
             f.flush()
             os.fsync(f.fileno())
 
+        SAVES.inc()
         logger.info("Successfully saved %d phrases to %s", len(phrases_to_save), PHRASES_FILE)
         logger.info("Saved data summary: %d read, %d unread phrases", read_count, unread_count)
 
@@ -152,4 +173,4 @@ def save_phrases(phrases_data: list[dict[str, Any]]) -> None:
         logger.error("Error saving phrases to %s: %s", PHRASES_FILE, e)
         logger.error("Exception type: %s", type(e).__name__)
         logger.error("Exception details: %s", str(e))
-        st.error(f"Ошибка сохранения данных: {e}")
+        raise StorageError(f"Ошибка сохранения данных: {e}") from e
@@ -0,0 +1,285 @@
+"""Streaming ingestion of a whole book into the collection as short readable passages.
+
+``ingest_book`` reads a plain-text (``.txt``) or FictionBook (``.fb2``) file paragraph by
+paragraph, never holding the whole book in memory:
+  - text files are read line by line, a blank line ends a paragraph;
+  - FB2 is parsed with ``iterparse``: every ``<p>`` (and poem ``<stanza>``) of the main
+    bodies is taken as it closes and then cleared (notes bodies, the description and
+    binaries are skipped).
+
+Paragraphs are split into sentences, and consecutive sentences of a paragraph are joined
+into passages of ``min_words``..``max_words`` words. Every ``chunk_size`` passages are
+deduplicated against the collection, scored with the batch scorer (split across
+``workers`` processes), filtered by the optional complexity window, appended and saved.
+After each chunk a checkpoint records the next paragraph, so an interrupted import resumes
+where it stopped; passages saved just before an interruption come back as duplicates.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext, suppress
+from itertools import chain, repeat
+from typing import Any
+
+# Support both package and script imports
+try:
+    from ..domain.algorithms import DEFAULT_ALGORITHM, get_algorithm
+    from ..domain.complexity import AlgorithmChoice, calculate_text_complexity_universal_batch
+    from ..syllable_processor import count_words
+    from .bulk_import import IMPORT_ENCODINGS, append_texts, dedupe_texts
+    from .perf import timed
+except Exception:  # pragma: no cover - runtime import mode
+    from domain.algorithms import DEFAULT_ALGORITHM, get_algorithm  # type: ignore
+    from domain.complexity import AlgorithmChoice, calculate_text_complexity_universal_batch  # type: ignore
+    from services.bulk_import import IMPORT_ENCODINGS, append_texts, dedupe_texts  # type: ignore
+    from services.perf import timed  # type: ignore
+    from syllable_processor import count_words  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+BOOK_FORMATS = ("txt", "fb2")
+
+# Passages are scored, saved and checkpointed in chunks of this many
+INGEST_CHUNK_SIZE = 500
+# Bytes read to pick the encoding of a text file
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# A sentence ends with . ! ? or …, possibly followed by a closing quote or bracket, before a space
+_SENTENCE_END_RE = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][»\"')]))\s+")
+
+
+def _text_encoding(path: str) -> str:
+    with open(path, "rb") as f:
+        sample = f.read(ENCODING_SAMPLE_BYTES)
+    for encoding in IMPORT_ENCODINGS[:-1]:
+        try:
+            # A sample cut inside a multi-byte character is fine: final=False keeps the tail pending
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return IMPORT_ENCODINGS[-1]
+
+
+def _text_paragraphs(path: str) -> Iterator[str]:
+    lines: list[str] = []
+    with open(path, encoding=_text_encoding(path), errors="replace") as f:
+        for line in f:
+            if line.strip():
+                lines.append(line.strip())
+            elif lines:
+                yield " ".join(lines)
+                lines = []
+    if lines:
+        yield " ".join(lines)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _fb2_paragraphs(path: str) -> Iterator[str]:
+    # Depth inside bodies with text (not <body name="notes">) and inside skipped elements
+    in_body = skipped = 0
+    for event, element in ET.iterparse(path, events=("start", "end")):
+        name = _local_name(element.tag)
+        if event == "start":
+            if name == "body" and element.get("name") != "notes":
+                in_body += 1
+            elif name in ("body", "description", "binary"):
+                skipped += 1
+            continue
+
+        if name == "p" and in_body and not skipped:
+            yield " ".join("".join(element.itertext()).split())
+            element.clear()
+        elif name == "stanza" and in_body and not skipped:
+            # A stanza of a poem is one paragraph of its verse lines
+            yield " ".join(" ".join("".join(verse.itertext()).split()) for verse in element if _local_name(verse.tag) == "v")
+            element.clear()
+        elif name == "body" and element.get("name") != "notes":
+            in_body -= 1
+            element.clear()
+        elif name in ("body", "description", "binary"):
+            skipped -= 1
+            element.clear()
+        elif name == "section":
+            element.clear()
+
+
+def iter_paragraphs(path: str) -> Iterator[str]:
+    """Paragraphs of a book, streamed; raises ValueError for unsupported file types."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension == "txt":
+        return _text_paragraphs(path)
+    if extension == "fb2":
+        return _fb2_paragraphs(path)
+    raise ValueError(f"Unsupported book type {extension!r}, expected one of {', '.join(BOOK_FORMATS)}")
+
+
+def split_sentences(paragraph: str) -> list[str]:
+    return [sentence for sentence in _SENTENCE_END_RE.split(paragraph.strip()) if sentence]
+
+
+def paragraph_passages(paragraph: str, min_words: int, max_words: int) -> tuple[list[str], int]:
+    """Passages of whole consecutive sentences with at most ``max_words`` words each.
+
+    Returns the passages with at least ``min_words`` words and how many were dropped
+    (shorter ones, and single sentences longer than ``max_words``).
+    """
+    passages: list[str] = []
+    dropped = 0
+    current: list[str] = []
+    current_words = 0
+    for sentence in split_sentences(paragraph):
+        words = count_words(sentence)
+        if current and current_words + words > max_words:
+            passages.append(" ".join(current))
+            current, current_words = [], 0
+        current.append(sentence)
+        current_words += words
+    if current:
+        passages.append(" ".join(current))
+
+    kept = []
+    for passage in passages:
+        if min_words <= count_words(passage) <= max_words:
+            kept.append(passage)
+        else:
+            dropped += 1
+    return kept, dropped
+
+
+def _checkpoint_path(path: str) -> str:
+    return f"{path}.ingest.json"
+
+
+def _load_checkpoint(checkpoint_path: str, identity: dict[str, Any]) -> dict[str, Any] | None:
+    try:
+        with open(checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if checkpoint.get("identity") != identity:
+        logger.info("Ignoring checkpoint %s made for another book or settings", checkpoint_path)
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(checkpoint_path: str, checkpoint: dict[str, Any]) -> None:
+    # Write then rename, so an interruption never leaves a half-written checkpoint
+    temporary = f"{checkpoint_path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(temporary, checkpoint_path)
+
+
+def _score_part(texts: list[str], settings: tuple[int, bool, str]) -> list[int]:
+    return calculate_text_complexity_universal_batch(texts, *settings)
+
+
+@timed("ingest_book")
+def ingest_book(
+    path: str,
+    phrases_data: list[dict[str, Any]],
+    age: int = 8,
+    include_cognitive_load: bool = True,
+    algorithm: AlgorithmChoice = DEFAULT_ALGORITHM,
+    min_words: int = 3,
+    max_words: int = 25,
+    min_complexity: int | None = None,
+    max_complexity: int | None = None,
+    workers: int = 1,
+    chunk_size: int = INGEST_CHUNK_SIZE,
+    checkpoint_path: str | None = None,
+) -> dict[str, int]:
+    """Split a book into passages and append the new ones to ``phrases_data``.
+
+    Returns counts of ``passages`` taken from the book, ``added`` ones, ``duplicates``
+    and ``rejected`` ones (outside the length or complexity window), cumulative over
+    resumed runs. The checkpoint file is removed once the whole book is ingested.
+    """
+    algorithm = get_algorithm(algorithm)
+    settings = (age, include_cognitive_load, algorithm.id)
+    checkpoint_path = checkpoint_path or _checkpoint_path(path)
+    identity = {
+        "book": os.path.abspath(path),
+        "size": os.path.getsize(path),
+        "settings": list(algorithm.cache_key(age, include_cognitive_load)),
+        "window": [min_words, max_words, min_complexity, max_complexity],
+    }
+    checkpoint = _load_checkpoint(checkpoint_path, identity) or {
+        "identity": identity,
+        "paragraph": 0,
+        "counts": {"passages": 0, "added": 0, "duplicates": 0, "rejected": 0},
+    }
+    counts = checkpoint["counts"]
+    if checkpoint["paragraph"]:
+        logger.info("Resuming %s from paragraph %d", path, checkpoint["paragraph"])
+
+    existing = {phrase["text"].strip() for phrase in phrases_data}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()
+
+    def flush(passages: list[str], next_paragraph: int) -> None:
+        new_texts, duplicates, rejected = dedupe_texts(existing, passages)
+        scores: list[int] = []
+        if new_texts and workers > 1:
+            size = -(-len(new_texts) // workers)
+            parts = [new_texts[i : i + size] for i in range(0, len(new_texts), size)]
+            scores = list(chain.from_iterable(pool.map(_score_part, parts, repeat(settings))))
+        elif new_texts:
+            scores = _score_part(new_texts, settings)
+
+        keep = []
+        out_of_window = set()
+        for text, score in zip(new_texts, scores, strict=True):
+            if (min_complexity is None or score >= min_complexity) and (max_complexity is None or score <= max_complexity):
+                keep.append((text, score))
+            else:
+                out_of_window.add(text)
+        if out_of_window:
+            # Not in the collection after all: their repeats are rejected too, not duplicates
+            existing.difference_update(out_of_window)
+            repeats = sum(1 for passage in passages if passage.strip() in out_of_window) - len(out_of_window)
+            duplicates -= repeats
+            rejected += repeats
+        append_texts(phrases_data, [text for text, _score in keep], [score for _text, score in keep])
+
+        counts["passages"] += len(passages)
+        counts["added"] += len(keep)
+        counts["duplicates"] += duplicates
+        counts["rejected"] += rejected + len(out_of_window)
+        checkpoint["paragraph"] = next_paragraph
+        _save_checkpoint(checkpoint_path, checkpoint)
+
+    with pool:
+        passages: list[str] = []
+        paragraph_index = 0
+        for paragraph_index, paragraph in enumerate(iter_paragraphs(path), 1):
+            if paragraph_index <= checkpoint["paragraph"]:
+                continue
+            kept, dropped = paragraph_passages(paragraph, min_words, max_words)
+            passages += kept
+            counts["passages"] += dropped
+            counts["rejected"] += dropped
+            if len(passages) >= chunk_size:
+                flush(passages, paragraph_index)
+                passages = []
+        if passages:
+            flush(passages, paragraph_index)
+
+    with suppress(FileNotFoundError):
+        os.remove(checkpoint_path)
+    logger.info("Ingested %s: %s", path, counts)
+    return dict(counts)
+
+
+__all__ = ["BOOK_FORMATS", "INGEST_CHUNK_SIZE", "ingest_book", "iter_paragraphs", "paragraph_passages", "split_sentences"]
@@ -0,0 +1,158 @@
+"""Logging pipeline: records are queued by the request thread and written by a listener thread.
+
+Level: ``LEARN_TO_READ_LOG_LEVEL`` (e.g. DEBUG) or ``"log_level"`` in config.json, default INFO.
+The log file is rotated by size, so ``app.log`` stays bounded. Chatter that repeats on every
+rerun (DEBUG records and the INFO templates in ``RERUN_MESSAGES``) is rate-limited per template;
+other INFO records, such as user actions and saves, are always written.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+LOG_LEVEL_ENV = "LEARN_TO_READ_LOG_LEVEL"
+LOG_FILE = "app.log"
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUP_COUNT = 3
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+CONFIG_FILE = "config.json"
+
+# Each sampled (logger, message template) may log this many records per window
+SAMPLE_BURST = 5
+SAMPLE_WINDOW_SECONDS = 60.0
+
+# INFO templates logged on every Streamlit rerun; these are sampled like DEBUG records
+RERUN_MESSAGES = frozenset(
+    {
+        "=== Starting main application ===",
+        "=== Main application completed ===",
+        "Initializing session state",
+        "Displaying reading interface",
+        "Displaying text selection interface",
+        "Starting show_text_selection function",
+        "Displaying %d phrases",
+        "Displayed %d unread phrases in left column",
+        "Displayed %d read phrases in right column",
+    }
+)
+
+_lock = threading.Lock()
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+
+
+class RateLimitFilter(logging.Filter):
+    """Pass at most ``burst`` records per ``window`` seconds for each (logger, template).
+
+    Only DEBUG records and INFO records whose template is in ``messages`` are sampled;
+    everything else always passes. When a window with dropped records ends, the next
+    record of that template is annotated with how many were suppressed.
+    """
+
+    MAX_KEYS = 1000
+
+    def __init__(self, burst: int = SAMPLE_BURST, window: float = SAMPLE_WINDOW_SECONDS, messages: frozenset[str] = RERUN_MESSAGES) -> None:
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.messages = messages
+        # key -> [window start, records passed, records suppressed]
+        self._windows: dict[tuple[str, str], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        if record.levelno == logging.INFO and str(record.msg) not in self.messages:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None:
+                if len(self._windows) >= self.MAX_KEYS:
+                    self._windows.clear()
+                self._windows[key] = [now, 1, 0]
+                return True
+
+            if now - state[0] >= self.window:
+                suppressed = int(state[2])
+                state[:] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+                return True
+
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+def resolve_level(config_path: str = CONFIG_FILE) -> int:
+    """Environment first, then ``log_level`` from config.json, then INFO."""
+    name = os.environ.get(LOG_LEVEL_ENV)
+    if not name:
+        try:
+            with open(config_path, encoding="utf-8") as f:
+                name = json.load(f).get("log_level")
+        except (OSError, ValueError, AttributeError):
+            name = None
+    level = logging.getLevelName(str(name or "INFO").upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def configure_logging(level: int | None = None, log_file: str = LOG_FILE) -> None:
+    """Install the queue-based pipeline on the root logger.
+
+    Safe to call on every Streamlit rerun: handlers and the listener thread are created once,
+    later calls only re-apply the level.
+    """
+    global _listener, _queue_handler
+    if level is None:
+        level = resolve_level()
+
+    with _lock:
+        root = logging.getLogger()
+        root.setLevel(level)
+        if _listener is not None:
+            return
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True
+        )
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        _queue_handler.addFilter(RateLimitFilter())
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(_queue_handler)
+
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
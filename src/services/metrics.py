@@ -0,0 +1,298 @@
+"""In-process metrics registry with Prometheus text exposition.
+
+Counters and histograms are always collected (a lock and an addition per update).
+Export is opt-in:
+    LEARN_TO_READ_METRICS_FILE=path      rewrite ``path`` (e.g. for the node exporter
+                                          textfile collector) every
+    LEARN_TO_READ_METRICS_INTERVAL=sec   seconds (default 15)
+    LEARN_TO_READ_METRICS_PORT=port      serve ``/metrics`` on 127.0.0.1:port
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from functools import wraps
+from typing import Any, TypeVar
+
+# Support both package and script imports
+try:
+    from ..domain import observe
+except Exception:  # pragma: no cover - runtime import mode
+    from domain import observe  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE_ENV = "LEARN_TO_READ_METRICS_FILE"
+METRICS_INTERVAL_ENV = "LEARN_TO_READ_METRICS_INTERVAL"
+METRICS_PORT_ENV = "LEARN_TO_READ_METRICS_PORT"
+
+# Seconds; covers a single short phrase (~0.1 ms) up to scoring a whole book
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        if not values and not self.labelnames:
+            values = {(): 0}
+        return [f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in sorted(values.items())]
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        self.histogram.observe(time.perf_counter() - self.started)
+
+    def __call__(self, func: F) -> F:
+        histogram = self.histogram
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames: tuple[str, ...] = ()
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def time(self) -> _Timer:
+        """``with HISTOGRAM.time(): ...`` or ``@HISTOGRAM.time()``"""
+        return _Timer(self)
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return sum(self._counts)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {_format_value(total)}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Counter | Histogram) -> Counter | Histogram:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            exposed_name = f"{metric.name}_total" if metric.kind == "counter" else metric.name
+            lines.append(f"# HELP {exposed_name} {metric.help}")
+            lines.append(f"# TYPE {exposed_name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically rewrite ``path`` so a scraper never sees a half-written file."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = Registry()
+
+RERUNS = REGISTRY.counter("learn_to_read_reruns", "Streamlit reruns of the app script")
+SAVES = REGISTRY.counter("learn_to_read_saves", "Writes of phrases.json")
+PHRASES_ADDED = REGISTRY.counter("learn_to_read_phrases_added", "Texts added to the collection")
+SESSIONS_STARTED = REGISTRY.counter("learn_to_read_sessions_started", "Reading sessions started")
+SESSIONS_COMPLETED = REGISTRY.counter("learn_to_read_sessions_completed", "Reading sessions finished (all three levels)")
+CACHE_HITS = REGISTRY.counter("learn_to_read_cache_hits", "Cache hits", labelnames=("cache",))
+CACHE_MISSES = REGISTRY.counter("learn_to_read_cache_misses", "Cache misses", labelnames=("cache",))
+
+SCORING_SECONDS = REGISTRY.histogram("learn_to_read_scoring_seconds", "Time to score one text")
+SYLLABIFICATION_SECONDS = REGISTRY.histogram("learn_to_read_syllabification_seconds", "Time to tokenize and syllabify one text")
+LOAD_SECONDS = REGISTRY.histogram("learn_to_read_load_seconds", "Time to load and score phrases.json")
+SAVE_SECONDS = REGISTRY.histogram("learn_to_read_save_seconds", "Time to write phrases.json")
+PREVIEW_SECONDS = REGISTRY.histogram("learn_to_read_preview_seconds", "Time to update the live complexity preview of a draft")
+HTTP_REQUESTS = REGISTRY.counter("learn_to_read_http_requests", "Requests to the scoring server", labelnames=("endpoint", "status"))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram("learn_to_read_http_request_seconds", "Time to answer a request to the scoring server")
+HTTP_BATCH_TEXTS = REGISTRY.histogram(
+    "learn_to_read_http_batch_texts", "Texts scored together in one micro-batch", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+
+# Timings reported by the scoring core (domain/observe.py) that have a histogram
+OBSERVED_HISTOGRAMS = {
+    "calculate_text_complexity_universal": SCORING_SECONDS,
+    "syllabification": SYLLABIFICATION_SECONDS,
+}
+
+
+def _observe_timing(name: str, seconds: float) -> None:
+    histogram = OBSERVED_HISTOGRAMS.get(name)
+    if histogram is not None:
+        histogram.observe(seconds)
+
+
+def _observe_cache(cache: str, hits: int, misses: int) -> None:
+    if hits:
+        CACHE_HITS.inc(hits, cache=cache)
+    if misses:
+        CACHE_MISSES.inc(misses, cache=cache)
+
+
+observe.add_timing_observer(_observe_timing)
+observe.add_cache_observer(_observe_cache)
+
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def _serve_metrics(port: int) -> Any:
+    # http.server (with http.client, email and ssl) is imported only when the endpoint is enabled
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = REGISTRY.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 (http.server API)
+            logger.debug("metrics endpoint: " + format, *args)
+
+    return ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+
+
+def _textfile_loop(path: str, interval: float) -> None:
+    while True:
+        try:
+            REGISTRY.write_textfile(path)
+        except OSError as e:
+            logger.warning("Could not write metrics to %s: %s", path, e)
+        time.sleep(interval)
+
+
+def start_exporter() -> None:
+    """Start the configured exporters once per process (safe to call on every rerun)."""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path:
+        try:
+            interval = max(1.0, float(os.environ.get(METRICS_INTERVAL_ENV, 15)))
+        except ValueError:
+            interval = 15.0
+        threading.Thread(target=_textfile_loop, args=(path, interval), name="metrics-textfile", daemon=True).start()
+        logger.info("Writing metrics to %s every %.0fs", path, interval)
+
+    port = os.environ.get(METRICS_PORT_ENV)
+    if port:
+        try:
+            server = _serve_metrics(int(port))
+        except (OSError, ValueError) as e:
+            logger.warning("Could not serve metrics on port %s: %s", port, e)
+            return
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info("Serving metrics on http://127.0.0.1:%s/metrics", port)
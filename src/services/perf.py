@@ -0,0 +1,186 @@
+"""Lightweight per-rerun timing spans.
+
+Disabled by default. Enable with ``LEARN_TO_READ_PERF=1`` for the whole process, or for a
+single rerun with ``begin_rerun(force=True)`` (the app does this for sessions opened with
+``?perf=1``). When disabled, ``span()`` returns a shared no-op context manager, so
+instrumented code pays a flag check and a thread-local lookup per call.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, TypeVar
+
+# Support both package and script imports
+try:
+    from ..domain import observe
+except Exception:  # pragma: no cover - runtime import mode
+    from domain import observe  # type: ignore
+
+PERF_ENV = "LEARN_TO_READ_PERF"
+
+# How many reruns are kept in the ring buffer
+RERUN_HISTORY = 200
+# Per rerun and span we keep at most this many individual durations (count/total stay exact)
+MAX_SAMPLES_PER_SPAN = 1000
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = os.environ.get(PERF_ENV, "").lower() in ("1", "true", "yes", "on")
+_reruns: deque[dict[str, Any]] = deque(maxlen=RERUN_HISTORY)
+_reruns_lock = threading.Lock()
+_local = threading.local()
+
+
+def is_enabled() -> bool:
+    """Timing is on for the whole process or for the rerun running in this thread."""
+    return _enabled or getattr(_local, "rerun", None) is not None
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        record(self.name, (time.perf_counter() - self.started) * 1000)
+
+
+def span(name: str) -> _Span | _NullSpan:
+    """Time a block: ``with span("save_phrases"): ...``"""
+    if not _enabled and getattr(_local, "rerun", None) is None:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator version of ``span``."""
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled and getattr(_local, "rerun", None) is None:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def record(name: str, duration_ms: float) -> None:
+    """Add a duration to the rerun running in this thread (ignored outside a rerun)."""
+    current = getattr(_local, "rerun", None)
+    if current is None:
+        return
+    stats = current["spans"].get(name)
+    if stats is None:
+        stats = current["spans"][name] = {"count": 0, "total_ms": 0.0, "samples": []}
+    stats["count"] += 1
+    stats["total_ms"] += duration_ms
+    if len(stats["samples"]) < MAX_SAMPLES_PER_SPAN:
+        stats["samples"].append(duration_ms)
+
+
+def _observe_timing(name: str, seconds: float) -> None:
+    # Calls timed by the scoring core become spans of the rerun running in this thread
+    record(name, seconds * 1000)
+
+
+observe.add_timing_observer(_observe_timing)
+
+
+def begin_rerun(force: bool = False) -> None:
+    """Start collecting spans of this thread's rerun if timing is enabled or ``force`` is set."""
+    if not _enabled and not force:
+        _local.rerun = None
+        return
+    _local.rerun = {"started_at": time.time(), "started": time.perf_counter(), "spans": {}}
+
+
+def end_rerun() -> None:
+    current = getattr(_local, "rerun", None)
+    _local.rerun = None
+    if current is None:
+        return
+    duration_ms = (time.perf_counter() - current.pop("started")) * 1000
+    current["spans"]["rerun"] = {"count": 1, "total_ms": duration_ms, "samples": [duration_ms]}
+    with _reruns_lock:
+        _reruns.append(current)
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summary() -> dict[str, Any]:
+    """p50/p95 per call and per rerun for every span recorded in the ring buffer."""
+    with _reruns_lock:
+        reruns = list(_reruns)
+
+    per_call: dict[str, list[float]] = {}
+    per_rerun: dict[str, list[float]] = {}
+    calls: dict[str, int] = {}
+    for rerun in reruns:
+        for name, stats in rerun["spans"].items():
+            per_call.setdefault(name, []).extend(stats["samples"])
+            per_rerun.setdefault(name, []).append(stats["total_ms"])
+            calls[name] = calls.get(name, 0) + stats["count"]
+
+    spans = {}
+    for name in sorted(per_call):
+        call_values = sorted(per_call[name])
+        rerun_values = sorted(per_rerun[name])
+        spans[name] = {
+            "calls": calls[name],
+            "p50_ms": _percentile(call_values, 0.50),
+            "p95_ms": _percentile(call_values, 0.95),
+            "rerun_p50_ms": _percentile(rerun_values, 0.50),
+            "rerun_p95_ms": _percentile(rerun_values, 0.95),
+        }
+    return {"reruns": len(reruns), "spans": spans}
+
+
+def export_json() -> str:
+    """Summary plus the raw ring buffer, for attaching to bug reports."""
+    with _reruns_lock:
+        reruns = list(_reruns)
+    return json.dumps({"summary": summary(), "reruns": reruns}, ensure_ascii=False, indent=2)
+
+
+def reset() -> None:
+    with _reruns_lock:
+        _reruns.clear()
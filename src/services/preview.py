@@ -0,0 +1,173 @@
+"""Live complexity preview of a draft, rescored word by word between edits.
+
+``DraftPreview`` keeps the previous draft's words together with each word's contribution
+to the score sums (syllable count and complexity, length, letter, bigram and morphology
+scores, see ``word_contributions``) and the running totals of those sums. An edit is
+diffed against the previous draft by their common prefix and suffix; only the words
+around the changed span are tokenized and analyzed again, and their contributions are
+moved out of / into the totals. Typing in a chapter-sized draft therefore costs a few
+string comparisons plus the changed words.
+
+Integer sums stay exact. Float sums are accumulated in edit order rather than text order,
+so they can differ from a full rescoring in the last bits: totals are recomputed from the
+stored contributions every ``RESEED_EVERY`` updates, and a score within
+``BOUNDARY_EPSILON`` of an integer is rescored in full, so the preview always shows what
+saving the draft would store.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from functools import reduce
+from operator import add, sub
+from time import perf_counter
+
+# Support both package and script imports
+try:
+    from ..domain.algorithms import DEFAULT_ALGORITHM, get_algorithm
+    from ..domain.complexity import AlgorithmChoice, calculate_text_complexity_universal
+    from ..domain.document import Document
+    from ..syllable_processor import tokenize
+    from ..text_complexity_batch import BOUNDARY_EPSILON
+    from ..text_complexity_fast import linguistic_complexity_from_sums, word_contributions
+    from ..text_complexity_improved import cognitive_load_for_word_count
+    from .metrics import PREVIEW_SECONDS
+except Exception:  # pragma: no cover - runtime import mode
+    from domain.algorithms import DEFAULT_ALGORITHM, get_algorithm  # type: ignore
+    from domain.complexity import AlgorithmChoice, calculate_text_complexity_universal  # type: ignore
+    from domain.document import Document  # type: ignore
+    from services.metrics import PREVIEW_SECONDS  # type: ignore
+    from syllable_processor import tokenize  # type: ignore
+    from text_complexity_batch import BOUNDARY_EPSILON  # type: ignore
+    from text_complexity_fast import linguistic_complexity_from_sums, word_contributions  # type: ignore
+    from text_complexity_improved import cognitive_load_for_word_count  # type: ignore
+
+# Float totals are recomputed from the per-word contributions this often
+RESEED_EVERY = 100
+
+
+def _common_prefix(a: str, b: str, limit: int) -> int:
+    """Length of the common prefix of ``a`` and ``b`` (at most ``limit``), by bisecting slice comparisons."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class DraftPreview:
+    """Running complexity of one draft for fixed scoring settings.
+
+    Word sums are kept for algorithms that declare a ``preview_model`` in the registry; a draft
+    scored with any other algorithm is rescored in full.
+    """
+
+    def __init__(self, age: int = 8, include_cognitive_load: bool = True, algorithm: AlgorithmChoice = DEFAULT_ALGORITHM) -> None:
+        self._algorithm = algorithm = get_algorithm(algorithm)
+        self.settings = (age, include_cognitive_load, algorithm.id)
+        # Word-sum model of text_complexity_fast (True: children), None: rescore the whole draft
+        self._children: bool | None = None if algorithm.preview_model is None else algorithm.preview_model == "children"
+        self.score = 0
+        self.word_count = 0
+        # Words analyzed by the last update and how long it took
+        self.changed_words = 0
+        self.seconds = 0.0
+        self._text = ""
+        # Word tokens of the draft (as Document.tokens lists them) with their offsets
+        self._words: list[str] = []
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._contributions: list[tuple[float, ...]] = []
+        self._totals: list[float] = []
+        self._updates = 0
+
+    def update(self, text: str) -> int:
+        """Score ``text``, reusing the contributions of words unchanged since the last update."""
+        started = perf_counter()
+        if self._children is None:
+            return self._rescore(text, started)
+        age = self.settings[0]
+        old = self._text
+        limit = min(len(old), len(text))
+        prefix = _common_prefix(old, text, limit)
+        suffix = _common_suffix(old, text, limit - prefix)
+        shift = len(text) - len(old)
+
+        # Words ending before the edit are followed by unchanged whitespace, words starting after it by
+        # unchanged whitespace too: both keep their tokens; everything in between is tokenized again
+        first = bisect_left(self._ends, prefix)
+        last = bisect_right(self._starts, len(old) - suffix)
+        begin = self._ends[first - 1] if first else 0
+        end = self._starts[last] + shift if last < len(self._starts) else len(text)
+        changed, starts, ends = [], [], []
+        for start, stop, _w3, clean in tokenize(text[begin:end]):
+            if clean:
+                changed.append(text[begin + start : begin + stop])
+                starts.append(begin + start)
+                ends.append(begin + stop)
+
+        added = word_contributions(Document(" ".join(changed)), age, self._children) if changed else []
+        removed = self._contributions[first:last]
+        self._contributions[first:last] = added
+        self._words[first:last] = changed
+        self._starts[first:] = starts + [start + shift for start in self._starts[last:]]
+        self._ends[first:] = ends + [stop + shift for stop in self._ends[last:]]
+        self._text = text
+        self._updates += 1
+
+        if not self._totals or self._updates % RESEED_EVERY == 0:
+            self._reseed()
+        else:
+            totals = self._totals
+            for contribution in removed:
+                totals[:] = map(sub, totals, contribution)
+            for contribution in added:
+                totals[:] = map(add, totals, contribution)
+
+        self.word_count = len(self._words)
+        self.changed_words = len(changed)
+        self.score = self._score(text)
+        self.seconds = perf_counter() - started
+        PREVIEW_SECONDS.observe(self.seconds)
+        return self.score
+
+    def _rescore(self, text: str, started: float) -> int:
+        document = Document(text)
+        self._text = text
+        self.word_count = self.changed_words = document.word_count
+        self.score = calculate_text_complexity_universal(document, *self.settings[:2], self._algorithm)
+        self.seconds = perf_counter() - started
+        PREVIEW_SECONDS.observe(self.seconds)
+        return self.score
+
+    def _reseed(self) -> None:
+        columns = zip(*self._contributions, strict=True)
+        self._totals = [reduce(add, column, 0) for column in columns] if self._contributions else []
+
+    def _score(self, text: str) -> int:
+        if not self.word_count:
+            return 0
+        age, include_cognitive_load, algorithm = self.settings
+        total = linguistic_complexity_from_sums(self.word_count, tuple(self._totals), self._children)
+        if include_cognitive_load:
+            total += cognitive_load_for_word_count(self.word_count, age)
+        if abs(total - round(total)) < BOUNDARY_EPSILON:
+            return calculate_text_complexity_universal(text, age, include_cognitive_load, algorithm)
+        return int(total)
+
+
+__all__ = ["DraftPreview", "RESEED_EVERY"]
@@ -0,0 +1,153 @@
+"""Opt-in cProfile / tracemalloc capture of individual reruns.
+
+Environment variables:
+    LEARN_TO_READ_PROFILE=1         enable profiling
+    LEARN_TO_READ_PROFILE_EVERY=N   profile every Nth rerun (default 10)
+    LEARN_TO_READ_PROFILE_DIR=path  where to write captures (default "profiles")
+    LEARN_TO_READ_PROFILE_KEEP=N    keep only the newest N reruns (default 20)
+    LEARN_TO_READ_TRACEMALLOC=1     also write the top allocations of the rerun
+
+While profiling is enabled, a session can force one capture from the app URL with ``?profile=1``.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import itertools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "LEARN_TO_READ_PROFILE"
+PROFILE_EVERY_ENV = "LEARN_TO_READ_PROFILE_EVERY"
+PROFILE_DIR_ENV = "LEARN_TO_READ_PROFILE_DIR"
+PROFILE_KEEP_ENV = "LEARN_TO_READ_PROFILE_KEEP"
+TRACEMALLOC_ENV = "LEARN_TO_READ_TRACEMALLOC"
+
+TOP_ALLOCATIONS = 30
+
+T = TypeVar("T")
+
+_rerun_counter = itertools.count(1)
+_counter_lock = threading.Lock()
+# cProfile and tracemalloc are process-wide enough that overlapping captures give garbage
+_capture_lock = threading.Lock()
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        logger.warning("Invalid %s=%r, using %s", name, os.environ.get(name), default)
+        return default
+
+
+def profile_dir() -> str:
+    return os.environ.get(PROFILE_DIR_ENV, "profiles")
+
+
+def is_enabled() -> bool:
+    return _env_flag(PROFILE_ENV)
+
+
+def should_profile(force: bool = False) -> bool:
+    """Sample every Nth rerun while profiling is enabled; ``force`` profiles this one (only while enabled)."""
+    if not is_enabled():
+        return False
+    if force:
+        return True
+    with _counter_lock:
+        rerun_number = next(_rerun_counter)
+    return rerun_number % _env_int(PROFILE_EVERY_ENV, 10) == 0
+
+
+def run(func: Callable[[], T], force: bool = False) -> T:
+    """Run ``func`` (normally ``main``), profiling it if this rerun is sampled.
+
+    A sampled rerun is skipped while another capture runs; a forced one waits for it.
+    """
+    if not should_profile(force) or not _capture_lock.acquire(blocking=force):
+        return func()
+
+    try:
+        return _run_profiled(func)
+    finally:
+        _capture_lock.release()
+
+
+def _run_profiled(func: Callable[[], T]) -> T:
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, f"rerun-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{time.perf_counter_ns() % 1_000_000:06d}")
+
+    trace_allocations = _env_flag(TRACEMALLOC_ENV)
+    started_tracemalloc = trace_allocations and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start(10)
+
+    profiler = cProfile.Profile()
+    try:
+        # Streamlit stops a rerun by raising (st.rerun / st.stop): still write the capture
+        return profiler.runcall(func)
+    finally:
+        try:
+            profiler.dump_stats(f"{stem}.pstats")
+            if trace_allocations and tracemalloc.is_tracing():
+                _write_top_allocations(tracemalloc.take_snapshot(), f"{stem}-alloc.txt")
+            logger.info("Profile written to %s.pstats", stem)
+        except OSError as e:
+            logger.warning("Could not write profile %s: %s", stem, e)
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+        rotate(directory, _env_int(PROFILE_KEEP_ENV, 20))
+
+
+def _write_top_allocations(snapshot: tracemalloc.Snapshot, path: str) -> None:
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    )
+    stats = snapshot.statistics("lineno")
+    total = sum(stat.size for stat in stats)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Total traced: {total / 1024:.1f} KiB\n")
+        for index, stat in enumerate(stats[:TOP_ALLOCATIONS], 1):
+            f.write(f"#{index}: {stat.traceback} size={stat.size / 1024:.1f} KiB count={stat.count}\n")
+
+
+def rotate(directory: str, keep: int) -> None:
+    """Delete the oldest captures so that at most ``keep`` reruns stay on disk."""
+    try:
+        names = [name for name in os.listdir(directory) if name.startswith("rerun-")]
+    except OSError:
+        return
+    stems: dict[str, float] = {}
+    for name in names:
+        stem = name.split(".pstats")[0].split("-alloc.txt")[0]
+        mtime = os.path.getmtime(os.path.join(directory, name))
+        stems[stem] = max(stems.get(stem, 0.0), mtime)
+
+    for stem in sorted(stems, key=stems.__getitem__)[:-keep]:
+        for name in (f"{stem}.pstats", f"{stem}-alloc.txt"):
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning("Could not remove old profile %s: %s", path, e)
+
+
+__all__ = ["run", "should_profile", "rotate", "profile_dir"]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Any
+
+# Support both package and script imports
+try:
+    from ..domain.document import analyze_text
+    from ..syllable_processor import next_level_item
+except Exception:  # pragma: no cover - runtime import mode
+    from domain.document import analyze_text  # type: ignore
+    from syllable_processor import next_level_item  # type: ignore
+
+# Texts longer than this are read through a cursor instead of materialized level lists
+LAZY_READING_MIN_CHARS = 2000
+
+LEVELS = (1, 2, 3)
+
+
+def new_reading_state(text: str, lazy: bool | None = None) -> dict[str, Any]:
+    """Build the reading_state dict for a text.
+
+    Short texts keep a CompactLevels (cleaned text + offset arrays) built from the cached
+    Document that scoring uses; syllables and hyphenated words are sliced out only when displayed.
+    Long texts (or ``lazy=True``) keep only a cursor into ``text`` per level, so a
+    chapter-sized text starts instantly and the session holds a constant amount of data.
+    """
+    if lazy is None:
+        lazy = len(text) >= LAZY_READING_MIN_CHARS
+
+    stats = {"total_words": 0, "good": 0, "medium": 0, "bad": 0}
+
+    if not lazy:
+        compact = analyze_text(text).compact_levels()
+        stats["total_words"] = sum(compact.count(level) for level in LEVELS)
+        return {
+            "current_level": 1,
+            "compact": compact,
+            "levels": {level: {"progress": 0} for level in LEVELS},
+            "stats": stats,
+        }
+
+    levels: dict[int, dict[str, Any]] = {}
+    for level in LEVELS:
+        level_data: dict[str, Any] = {"progress": 0, "cursor": (0, 0), "next": (0, 0), "current": None}
+        _load_lazy_item(text, level, level_data)
+        levels[level] = level_data
+
+    # In lazy mode total_words grows as items are rated: every item is rated exactly once
+    return {"current_level": 1, "lazy": True, "text": text, "levels": levels, "stats": stats}
+
+
+def _load_lazy_item(text: str, level: int, level_data: dict[str, Any]) -> None:
+    level_data["cursor"] = level_data["next"]
+    item = next_level_item(text, level, *level_data["next"])
+    if item is None:
+        level_data["current"] = None
+        return
+    word, offset, sub = item
+    level_data["current"] = word
+    level_data["next"] = (offset, sub)
+
+
+def current_word(state: dict[str, Any]) -> str | None:
+    """Return the item to show on the current level, or None when the level is finished."""
+    current_level = state["current_level"]
+    level_data = state["levels"][current_level]
+    if state.get("lazy"):
+        return level_data["current"]
+    compact = state["compact"]
+    if level_data["progress"] < compact.count(current_level):
+        return compact.item(current_level, level_data["progress"])
+    return None
+
+
+def advance(state: dict[str, Any]) -> bool:
+    """Move to the next item of the current level. Returns True when the level is finished."""
+    current_level = state["current_level"]
+    level_data = state["levels"][current_level]
+    level_data["progress"] += 1
+
+    if state.get("lazy"):
+        state["stats"]["total_words"] += 1
+        _load_lazy_item(state["text"], current_level, level_data)
+        return level_data["current"] is None
+
+    return level_data["progress"] >= state["compact"].count(current_level)
+
+
+def level_progress(state: dict[str, Any]) -> float:
+    """Fraction of the current level already read (0..1)."""
+    current_level = state["current_level"]
+    level_data = state["levels"][current_level]
+    if state.get("lazy"):
+        if level_data["current"] is None:
+            return 1.0
+        text_length = len(state["text"])
+        return level_data["cursor"][0] / text_length if text_length else 0.0
+    total = state["compact"].count(current_level)
+    return level_data["progress"] / total if total else 1.0
+
+
+def level_word_count(state: dict[str, Any], level: int) -> int:
+    """Number of items on a level (for lazy sessions: items read so far)."""
+    if state.get("lazy"):
+        return state["levels"][level]["progress"]
+    return state["compact"].count(level)
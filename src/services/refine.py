@@ -0,0 +1,96 @@
+"""Exact complexity scores computed in the background for texts shown with an estimate.
+
+Long texts added to the collection get a sampled estimate right away (see
+``estimate_text_complexity_universal``); ``refine_in_background`` then scores them exactly
+on a worker thread. Reruns collect finished scores with ``refined_complexity``, so the app
+never blocks on a whole book.
+
+At most ``MAX_JOBS`` jobs are kept: jobs nobody collects (the settings changed, the session
+ended) are dropped once the limit is reached, finished ones first. A poller that still needs
+a dropped score simply calls ``refine_in_background`` again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Support both package and script imports
+try:
+    from ..domain.algorithms import Algorithm, get_algorithm
+    from ..domain.complexity import AlgorithmChoice, calculate_text_complexity_universal
+    from ..domain.document import Document
+except Exception:  # pragma: no cover - runtime import mode
+    from domain.algorithms import Algorithm, get_algorithm  # type: ignore
+    from domain.complexity import AlgorithmChoice, calculate_text_complexity_universal  # type: ignore
+    from domain.document import Document  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# One worker: refinement is CPU-bound and should not compete with reruns for the GIL more than once
+REFINE_WORKERS = 1
+# Jobs (with their texts) kept in memory at most
+MAX_JOBS = 32
+
+_executor = ThreadPoolExecutor(max_workers=REFINE_WORKERS, thread_name_prefix="refine-complexity")
+# Keyed by the text and the algorithm's cache key (id, version, age, include_cognitive_load)
+_jobs: dict[tuple[str, tuple[str, str, int, bool]], Future[int]] = {}
+_jobs_lock = threading.Lock()
+
+
+def _score(text: str, age: int, include_cognitive_load: bool, algorithm: Algorithm) -> int:
+    # An uncached Document: a whole book must not stay in the analyze_text cache after its job
+    return calculate_text_complexity_universal(Document(text), age, include_cognitive_load, algorithm)
+
+
+def refine_in_background(text: str, age: int, include_cognitive_load: bool, algorithm: AlgorithmChoice) -> Future[int]:
+    """Start (or reuse) the exact scoring of ``text`` for these settings."""
+    algorithm = get_algorithm(algorithm)
+    key = (text, algorithm.cache_key(age, include_cognitive_load))
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None:
+            _evict(MAX_JOBS - 1)
+            job = _jobs[key] = _executor.submit(_score, text, age, include_cognitive_load, algorithm)
+        return job
+
+
+def refined_complexity(text: str, age: int, include_cognitive_load: bool, algorithm: AlgorithmChoice) -> int | None:
+    """The exact score once its background job has finished, else None (finished jobs are forgotten)."""
+    key = (text, get_algorithm(algorithm).cache_key(age, include_cognitive_load))
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None or not job.done():
+            return None
+        del _jobs[key]
+    try:
+        return job.result()
+    except Exception:
+        logger.exception("Background scoring failed for '%s...'", text[:50])
+        return None
+
+
+def cancel_refinements(texts: Iterable[str]) -> int:
+    """Drop the jobs of these texts for any settings (those not started are cancelled); returns how many."""
+    texts = set(texts)
+    with _jobs_lock:
+        keys = [key for key in _jobs if key[0] in texts]
+        for key in keys:
+            _jobs.pop(key).cancel()
+    return len(keys)
+
+
+def _evict(limit: int) -> None:
+    """Drop jobs until at most ``limit`` remain: finished first, then queued, then the running one (caller holds the lock)."""
+    while len(_jobs) > limit:
+        key = (
+            next((key for key, job in _jobs.items() if job.done()), None)
+            or next((key for key, job in _jobs.items() if not job.running()), None)
+            or next(iter(_jobs))
+        )
+        _jobs.pop(key).cancel()
+
+
+__all__ = ["MAX_JOBS", "REFINE_WORKERS", "cancel_refinements", "refine_in_background", "refined_complexity"]
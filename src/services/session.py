@@ -1,18 +1,34 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 import streamlit as st
 
 # Support both package and script imports
 try:
-    from .files import load_config, load_phrases
+    from ..domain.algorithms import DEFAULT_ALGORITHM, algorithm_from_config
+    from .files import StorageError, load_config, load_phrases
 except Exception:  # pragma: no cover - runtime import mode
-    from services.files import load_config, load_phrases  # type: ignore
+    from domain.algorithms import DEFAULT_ALGORITHM, algorithm_from_config  # type: ignore
+    from services.files import StorageError, load_config, load_phrases  # type: ignore
 
 logger = logging.getLogger(__name__)
 
 
+def load_session_phrases() -> list[dict[str, Any]]:
+    """phrases.json scored with the session's settings; a storage error is shown and leaves the collection empty."""
+    try:
+        return load_phrases(
+            st.session_state.get("child_age", 8),
+            st.session_state.get("use_cognitive_load", True),
+            st.session_state.get("algorithm", DEFAULT_ALGORITHM),
+        )
+    except StorageError as e:
+        st.error(str(e))
+        return []
+
+
 def init_session_state() -> None:
     logger.info("Initializing session state")
 
@@ -28,37 +44,33 @@ def init_session_state() -> None:
     if "need_rerun" not in st.session_state:
         st.session_state.need_rerun = False
 
-    if (
-        "child_age" not in st.session_state
-        or "use_cognitive_load" not in st.session_state
-        or "use_children_algorithm" not in st.session_state
-    ):
+    if "child_age" not in st.session_state or "use_cognitive_load" not in st.session_state or "algorithm" not in st.session_state:
         config = load_config()
         st.session_state.child_age = config.get("child_age", 8)
         st.session_state.use_cognitive_load = config.get("use_cognitive_load", True)
-        st.session_state.use_children_algorithm = config.get("use_children_algorithm", True)
+        st.session_state.algorithm = algorithm_from_config(config)
         logger.info(
-            "Initialized settings from config: age=%s, cognitive_load=%s, children_algorithm=%s",
+            "Initialized settings from config: age=%s, cognitive_load=%s, algorithm=%s",
             st.session_state.child_age,
             st.session_state.use_cognitive_load,
-            st.session_state.use_children_algorithm,
+            st.session_state.algorithm,
         )
     else:
         logger.debug(
-            "Session settings already exist: age=%s, cognitive_load=%s, children_algorithm=%s",
+            "Session settings already exist: age=%s, cognitive_load=%s, algorithm=%s",
             st.session_state.child_age,
             st.session_state.use_cognitive_load,
-            st.session_state.use_children_algorithm,
+            st.session_state.algorithm,
         )
 
     # Ensure phrases_data is initialized once
     if "phrases_data" not in st.session_state:
         logger.info("Loading phrases_data for the first time")
-        st.session_state.phrases_data = load_phrases()
+        st.session_state.phrases_data = load_session_phrases()
         logger.info("Loaded %d phrases into session state", len(st.session_state.phrases_data))
     elif not st.session_state.phrases_data:
         logger.info("phrases_data is empty, reloading")
-        st.session_state.phrases_data = load_phrases()
+        st.session_state.phrases_data = load_session_phrases()
         logger.info("Reloaded %d phrases into session state", len(st.session_state.phrases_data))
     else:
         logger.debug(
@@ -1,16 +1,62 @@
+import re
 import string
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
 
 RUSSIAN_VOWELS = "аеёиоуыэюя"
 SINGLE_SYLLABLE_WORDS = {"ест", "все", "в", "мяч", "суп"}
 
+# Вся пунктуация, которую срезаем с краёв слов: ASCII, кавычки всех видов, многоточие, тире и дефисы
+PUNCTUATION = string.punctuation + "«»„“”‘’‚‹›…—–‒―‐‑−"
+
+# Токен = [ведущая пунктуация][слово][завершающая пунктуация], разбор всего текста одним проходом
+_P = re.escape(PUNCTUATION)
+_TOKEN_RE = re.compile(rf"(?<!\S)(?=\S)([{_P}]*)(\S*?)([{_P}]*)(?!\S)")
+
+
+# Граница слога внутри слова (совпадение заканчивается ровно на границе):
+#   1) кластер из 2+ согласных, оканчивающийся на ь/ъ, целиком уходит в предыдущий слог: "семь-я"
+#   2) иначе последняя согласная перед гласной уходит в следующий слог: "кош-ка", "ма-ма"
+#   3) две гласные подряд: граница между ними: "на-о-ми"
+_V = RUSSIAN_VOWELS
+_SYLLABLE_BOUNDARY_RE = re.compile(rf"(?<=[{_V}])(?:[^{_V}\s]+[ьъ](?=[{_V}])|[^{_V}\s]*(?=[^{_V}\s][{_V}])|(?=[{_V}]))")
+
 
 def is_vowel(ch: str) -> bool:
     return ch.lower() in RUSSIAN_VOWELS
 
 
 def strip_trailing_punct(word: str) -> str:
-    punct_chars = set(string.punctuation + "«»„“…")
-    return word.rstrip("".join(punct_chars))
+    return word.rstrip(PUNCTUATION)
+
+
+def tokenize(text: str, pos: int = 0) -> Iterator[tuple[int, int, str, str]]:
+    """
+    Разбирает текст на токены за один проход скомпилированным выражением.
+
+    Для каждого токена (последовательности без пробелов) выдаёт
+    ``(начало, конец, слово уровня 3, очищенное слово в нижнем регистре)``:
+      - слово уровня 3 — токен без завершающей пунктуации
+      - очищенное слово — токен без пунктуации с обеих сторон (для слогов и оценки)
+    Для токенов из одной пунктуации (например, «—») оба слова пустые.
+    """
+    for match in _TOKEN_RE.finditer(text, pos):
+        lead, core, _trail = match.groups()
+        if core:
+            yield match.start(), match.end(), lead + core, core.lower()
+        else:
+            yield match.start(), match.end(), "", ""
+
+
+def word_tokens(text: str) -> list[str]:
+    """Слова текста как есть, в том же виде, что и Document.tokens (без токенов из одной пунктуации)."""
+    return [text[start:end] for start, end, _w3, clean in tokenize(text) if clean]
+
+
+def count_words(text: str) -> int:
+    """Количество слов в тексте; токены из одной пунктуации словами не считаются."""
+    return sum(1 for _start, _end, _w3, clean in tokenize(text) if clean)
 
 
 def unify_text_in_one_line(text: str) -> str:
@@ -94,21 +140,169 @@ def split_syllables_hybrid(word: str) -> list[str]:
     return syllables
 
 
+def syllable_offsets(words: Sequence[str]) -> tuple[str, array, array]:
+    """
+    Делит на слоги сразу все слова одним проходом скомпилированного выражения.
+
+    Правила те же, что в ``split_syllables_hybrid``, но вместо списков строк
+    возвращаются смещения в общем тексте.
+
+    Args:
+        words: Слова без пробелов (обычно очищенные слова из ``tokenize``)
+
+    Returns:
+        ``(text, word_starts, syllable_starts)``:
+          - text: слова в нижнем регистре через один пробел
+          - word_starts: начало каждого слова в ``text``
+          - syllable_starts: начало каждого слога в ``text``
+        Оба массива ``array('I')`` заканчиваются ограничителем ``len(text) + 1``,
+        поэтому слово ``i`` — это ``text[word_starts[i] : word_starts[i + 1] - 1]``.
+    """
+    lowered = [word.lower() for word in words]
+    text = " ".join(lowered)
+    boundaries = [match.end() for match in _SYLLABLE_BOUNDARY_RE.finditer(text)]
+
+    word_starts = array("I")
+    syllable_starts = array("I")
+    position = 0
+    b = 0
+    total = len(boundaries)
+    for word in lowered:
+        word_starts.append(position)
+        syllable_starts.append(position)
+        end = position + len(word)
+        if word in SINGLE_SYLLABLE_WORDS:
+            while b < total and boundaries[b] < end:
+                b += 1
+        else:
+            while b < total and boundaries[b] < end:
+                syllable_starts.append(boundaries[b])
+                b += 1
+        position = end + 1
+
+    word_starts.append(position)
+    syllable_starts.append(position)
+    return text, word_starts, syllable_starts
+
+
+def split_syllables_text(words: Sequence[str]) -> list[list[str]]:
+    """Слоги каждого слова (как ``split_syllables_hybrid``), вычисленные одним проходом ``syllable_offsets``."""
+    text, word_starts, syllable_starts = syllable_offsets(words)
+    result: list[list[str]] = []
+    s = 0
+    for i in range(len(word_starts) - 1):
+        word_end = word_starts[i + 1] - 1
+        syllables = []
+        while syllable_starts[s] < word_end:
+            syllables.append(text[syllable_starts[s] : min(syllable_starts[s + 1], word_end)])
+            s += 1
+        if not syllables:
+            # пустое слово: split_syllables_hybrid("") == [""]
+            syllables.append("")
+            s += 1
+        result.append(syllables)
+    return result
+
+
+class CompactLevels:
+    """
+    Компактное представление трёх уровней чтения.
+
+    Вместо списков строк хранит очищенный текст и смещения в ``array('I')``:
+      - text / word_starts / syllable_starts — результат ``syllable_offsets``
+        (уровни 1 и 2)
+      - level3_starts / level3_ends — границы слов уровня 3 в исходном тексте
+    Слоги и слова по слогам собираются только при показе.
+    """
+
+    __slots__ = ("source", "text", "word_starts", "syllable_starts", "level3_starts", "level3_ends")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.level3_starts = array("I")
+        self.level3_ends = array("I")
+        words = []
+        for start, _end, w3, clean in tokenize(source):
+            if clean:
+                words.append(clean)
+                self.level3_starts.append(start)
+                self.level3_ends.append(start + len(w3))
+        self.text, self.word_starts, self.syllable_starts = syllable_offsets(words)
+
+    @classmethod
+    def from_syllables(cls, source: str, level3_spans: Sequence[tuple[int, int]], syllables: Sequence[Sequence[str]]) -> "CompactLevels":
+        """
+        Собирает уровни из уже разделённых на слоги слов, не деля текст заново.
+
+        Args:
+            source: Исходный текст
+            level3_spans: Границы слов уровня 3 в ``source``
+            syllables: Слоги каждого очищенного слова (как ``split_syllables_hybrid``)
+        """
+        self = cls.__new__(cls)
+        self.source = source
+        self.level3_starts = array("I", [start for start, _end in level3_spans])
+        self.level3_ends = array("I", [end for _start, end in level3_spans])
+        self.word_starts = array("I")
+        self.syllable_starts = array("I")
+        position = 0
+        for sylls in syllables:
+            self.word_starts.append(position)
+            for syllable in sylls:
+                self.syllable_starts.append(position)
+                position += len(syllable)
+            position += 1
+        self.word_starts.append(position)
+        self.syllable_starts.append(position)
+        self.text = " ".join("".join(sylls) for sylls in syllables)
+        return self
+
+    def count(self, level: int) -> int:
+        if level == 1:
+            return len(self.syllable_starts) - 1
+        if level == 2:
+            return len(self.word_starts) - 1
+        return len(self.level3_starts) + 1
+
+    def syllable(self, index: int) -> str:
+        start = self.syllable_starts[index]
+        end = self.syllable_starts[index + 1]
+        # следующий слог начинает новое слово: отбрасываем разделяющий пробел
+        if end > len(self.text) or self.text[end - 1] == " ":
+            end -= 1
+        return self.text[start:end]
+
+    def hyphenated(self, index: int) -> str:
+        first = bisect_left(self.syllable_starts, self.word_starts[index])
+        last = bisect_left(self.syllable_starts, self.word_starts[index + 1])
+        return "-".join(self.syllable(i) for i in range(first, last))
+
+    def item(self, level: int, index: int) -> str:
+        """Элемент уровня с номером ``index`` (как ``process_text(text)[level]["words"][index]``)."""
+        if level == 1:
+            return self.syllable(index)
+        if level == 2:
+            return self.hyphenated(index)
+        if index == len(self.level3_starts):
+            return unify_text_in_one_line(self.source)
+        return self.source[self.level3_starts[index] : self.level3_ends[index]]
+
+
+def compact_process_text(text: str) -> CompactLevels:
+    """Компактный вариант ``process_text``: смещения вместо списков строк."""
+    return CompactLevels(text)
+
+
 def get_full_text_data(text: str) -> dict:
     level_name = "Полный текст"
-    raw_tokens = text.split()
-    level3_words = []
-    for token in raw_tokens:
-        w3 = strip_trailing_punct(token)
-        if w3:
-            level3_words.append(w3)
+    level3_words = [w3 for _start, _end, w3, _clean in tokenize(text) if w3]
     full_line = unify_text_in_one_line(text)
     level3_words.append(full_line)
     return {"levelName": level_name, "words": level3_words}
 
 
 def hyphenate_word_with_syllables(word: str) -> str:
-    cleaned_word = word.strip(string.punctuation + "«»„“…").lower()
+    cleaned_word = word.strip(PUNCTUATION).lower()
     if not cleaned_word:
         return ""
     syllables = split_syllables_hybrid(cleaned_word)
@@ -127,21 +321,15 @@ def process_text(text: str) -> dict:
     level_name_2 = "Слова по слогам"
     level_name_3 = "Полный текст"
 
-    raw_tokens = text.split()
     all_syllables = []
     hyphenated_words = []
     level3_words = []
 
-    for token in raw_tokens:
-        # Уровень 3: убираем только завершающую пунктуацию
-        w3 = strip_trailing_punct(token)
-        if w3:
-            level3_words.append(w3)
-
-        # Для слогов: убираем внешнюю пунктуацию, к lower
-        w_clean = token.strip(string.punctuation + "«»„“…").lower()
+    # Уровень 3: без завершающей пунктуации; для слогов: без внешней пунктуации, к lower
+    for _start, _end, w3, w_clean in tokenize(text):
         if not w_clean:
             continue
+        level3_words.append(w3)
 
         # Делим на слоги
         sylls = split_syllables_hybrid(w_clean)
@@ -164,3 +352,54 @@ def process_text(text: str) -> dict:
         2: {"levelName": level_name_2, "words": hyphenated_words},
         3: {"levelName": level_name_3, "words": level3_words},
     }
+
+
+def next_level_item(text: str, level: int, offset: int = 0, sub: int = 0) -> tuple[str, int, int] | None:
+    """
+    Возвращает элемент уровня, на который указывает курсор ``(offset, sub)``.
+
+    Курсор — это позиция в исходном тексте: ``offset`` — смещение начала
+    текущего токена, ``sub`` — номер слога внутри токена (только уровень 1).
+    Для уровня 3 ``sub=1`` означает, что полная строка уже выдана.
+
+    Returns:
+        ``(элемент, следующий offset, следующий sub)`` или ``None``,
+        если уровень закончился. Результаты совпадают с ``process_text``.
+    """
+    for start, end, w3, w_clean in tokenize(text, offset):
+        if not w_clean:
+            continue
+        if level == 3:
+            return w3, end, 0
+
+        sylls = split_syllables_hybrid(w_clean)
+        if level == 1:
+            if sub + 1 < len(sylls):
+                return sylls[sub], start, sub + 1
+            return sylls[sub], end, 0
+        return "-".join(sylls), end, 0
+
+    # Уровень 3 заканчивается полным текстом одной строкой
+    if level == 3 and sub == 0:
+        return unify_text_in_one_line(text), len(text), 1
+    return None
+
+
+def iter_level_items(text: str, level: int, offset: int = 0, sub: int = 0) -> Iterator[str]:
+    """Лениво выдаёт элементы уровня, начиная с курсора ``(offset, sub)``."""
+    while True:
+        item = next_level_item(text, level, offset, sub)
+        if item is None:
+            return
+        word, offset, sub = item
+        yield word
+
+
+def iter_process_text(text: str) -> Iterator[tuple[int, str]]:
+    """
+    Ленивый вариант ``process_text``: выдаёт пары ``(уровень, элемент)``
+    по мере чтения, не строя списков для всего текста.
+    """
+    for level in (1, 2, 3):
+        for word in iter_level_items(text, level):
+            yield level, word
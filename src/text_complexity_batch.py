@@ -0,0 +1,213 @@
+"""
+Пакетная оценка сложности целой библиотеки текстов на NumPy
+
+Тексты разбираются как обычно (analyze_text, с кэшем), после чего все слова всех текстов
+укладываются в плоские массивы: коды символов, границы слов и слогов, индексы биграмм в
+матрице BIGRAM_COMPLEXITY_MATRIX. Слоговая, лексическая, биграммная, структурная и
+морфологическая составляющие считаются векторными операциями над этими массивами; сложные
+окончания и сочетания ищутся автоматами из text_patterns по одному разу на уникальное слово.
+
+Суммы по словам и текстам считает np.bincount: он складывает веса строго по порядку, тем же
+левым свёртком, что и циклы эталонных функций, поэтому оценки совпадают с
+calculate_text_complexity_improved и calculate_children_text_complexity_optimized.
+Итоги, оказавшиеся ближе BOUNDARY_EPSILON к целому (там int() чувствителен к последнему биту,
+а sum() в Python 3.12+ округляет иначе), пересчитываются быстрым движком поштучно.
+
+NumPy — необязательная зависимость (pip install .[numpy]); без неё пакетная функция
+вызывает быстрый движок для каждого текста.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from itertools import chain
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore[assignment]
+
+try:  # context: src
+    from .domain.document import Document, analyze_text
+    from .text_complexity_children_optimized import BIGRAM_COMPLEXITY_MATRIX, LETTER_INDEX, OTHER_LETTER
+    from .text_complexity_fast import (
+        CHILDREN_UNKNOWN_LETTER,
+        IMPROVED_LETTER_COMPLEXITY,
+        IMPROVED_UNKNOWN_LETTER,
+        calculate_children_text_complexity_fast,
+        calculate_text_complexity_improved_fast,
+        get_children_tables,
+    )
+    from .text_complexity_improved import COMPLEX_ENDINGS_TRIE, cognitive_load_for_word_count, get_phonetic_score
+except Exception:  # context: src on sys.path (streamlit run src/app.py)
+    from domain.document import Document, analyze_text  # type: ignore
+    from text_complexity_children_optimized import BIGRAM_COMPLEXITY_MATRIX, LETTER_INDEX, OTHER_LETTER  # type: ignore
+    from text_complexity_fast import (  # type: ignore
+        CHILDREN_UNKNOWN_LETTER,
+        IMPROVED_LETTER_COMPLEXITY,
+        IMPROVED_UNKNOWN_LETTER,
+        calculate_children_text_complexity_fast,
+        calculate_text_complexity_improved_fast,
+        get_children_tables,
+    )
+    from text_complexity_improved import (  # type: ignore
+        COMPLEX_ENDINGS_TRIE,
+        cognitive_load_for_word_count,
+        get_phonetic_score,
+    )
+
+HAS_NUMPY = np is not None
+
+# Насколько близкий к целому итог перепроверяется поштучно
+BOUNDARY_EPSILON = 1e-6
+
+
+class _FlatBatch:
+    """Все слова пакета непустых текстов в плоских массивах."""
+
+    def __init__(self, documents: Sequence[Document]) -> None:
+        self.words = words = list(chain.from_iterable(document.words for document in documents))
+        word_features = list(chain.from_iterable(document.features for document in documents))
+
+        self.text_count = len(documents)
+        self.word_count = len(words)
+        self.words_per_text = np.fromiter(map(len, (document.words for document in documents)), np.int64, self.text_count)
+        self.word_text = np.repeat(np.arange(self.text_count), self.words_per_text)
+        # Длины в нижнем регистре (лексика, биграммы) и исходных токенов (структура, морфология)
+        self.word_lengths = np.fromiter(map(len, words), np.int64, self.word_count)
+        tokens = chain.from_iterable(document.tokens for document in documents)
+        self.token_lengths = np.fromiter(map(len, tokens), np.int64, self.word_count)
+
+        self.codes = np.frombuffer("".join(words).encode("utf-32-le"), dtype="<u4")
+        self.char_word = np.repeat(np.arange(self.word_count), self.word_lengths)
+        # Символы пакета нумеруются по порядку кодов (индексы в таблице сложности букв)
+        self.alphabet = np.flatnonzero(np.bincount(self.codes))
+        code_index = np.zeros(int(self.alphabet[-1]) + 1, dtype=np.int64)
+        code_index[self.alphabet] = np.arange(len(self.alphabet))
+        self.char_index = code_index[self.codes]
+        self.letters = [chr(code) for code in self.alphabet.tolist()]
+
+        syllables_per_word = np.fromiter(map(len, word_features), np.int64, self.word_count)
+        flat_features = chain.from_iterable(chain.from_iterable(word_features))
+        self.features = np.fromiter(flat_features, np.int64, int(syllables_per_word.sum()) * 4).reshape(-1, 4)
+        self.syllable_text = np.repeat(self.word_text, syllables_per_word)
+        self.syllables_per_text = self.text_sums(self.syllable_text)
+
+    def text_sums(self, index: Any, weights: Any = None) -> Any:
+        """Суммы по текстам в порядке элементов (bincount накапливает последовательно)."""
+        return np.bincount(index, weights=weights, minlength=self.text_count)
+
+    def lexical_sums(self, letter_complexity: dict[str, float], unknown: float) -> Any:
+        """Сумма по тексту средних сложностей букв каждого слова."""
+        letter_values = np.array([letter_complexity.get(letter, unknown) for letter in self.letters], dtype=float)
+        per_word = np.bincount(self.char_word, weights=letter_values[self.char_index], minlength=self.word_count)
+        return self.text_sums(self.word_text, per_word / self.word_lengths)
+
+    def bigram_sums(self) -> Any:
+        """Сумма по тексту сложностей биграмм внутри слов (строки и столбцы BIGRAM_COMPLEXITY_MATRIX)."""
+        letter_classes = np.array([LETTER_INDEX.get(letter, OTHER_LETTER) for letter in self.letters])[self.char_index]
+        first = np.flatnonzero(self.char_word[:-1] == self.char_word[1:])
+        values = np.array(BIGRAM_COMPLEXITY_MATRIX)[letter_classes[first], letter_classes[first + 1]]
+        return self.text_sums(self.word_text[self.char_word[first]], values)
+
+    def word_values(self, function: Callable[[str], Any], dtype: Any) -> Any:
+        """function(word_lower) для каждого слова; считается один раз на уникальное слово."""
+        values = {word: function(word) for word in dict.fromkeys(self.words)}
+        return np.fromiter(map(values.__getitem__, self.words), dtype, self.word_count)
+
+    def structural(self, syllable_weight: float, length_weight: float) -> Any:
+        avg_syllables_per_word = self.syllables_per_text / self.words_per_text
+        avg_word_length = self.text_sums(self.word_text, self.token_lengths) / self.words_per_text
+        return np.minimum(20, (avg_syllables_per_word - 1) * syllable_weight + (avg_word_length - 3) * length_weight)
+
+    def syllable_score(self, syllables: Any, scale: float) -> Any:
+        has_syllables = self.syllables_per_text > 0
+        avg_syllable_complexity = self.text_sums(self.syllable_text, syllables) / np.maximum(self.syllables_per_text, 1)
+        return np.where(has_syllables, np.minimum(30, avg_syllable_complexity * scale), 0.0)
+
+    def improved(self) -> Any:
+        """Лингвистическая сложность calculate_text_complexity_improved для каждого текста."""
+        consonants, special_chars, consecutive_vowels, syll_lengths = self.features.T
+        syllables = _cluster_scores(consonants) + special_chars * 2 + consecutive_vowels * 2
+        syllables += np.where(syll_lengths >= 5, 2, np.where(syll_lengths == 4, 1, 0))
+
+        morphological = np.where(self.token_lengths > 7, 2, np.where(self.token_lengths > 5, 1, 0))
+        morphological += self.word_values(COMPLEX_ENDINGS_TRIE.matches, bool) * 2
+        phonetic = self.word_values(get_phonetic_score, np.int64)
+
+        lexical = self.lexical_sums(IMPROVED_LETTER_COMPLEXITY, IMPROVED_UNKNOWN_LETTER) / self.words_per_text
+        return (
+            self.syllable_score(syllables, 4)
+            + self.structural(5, 2)
+            + np.minimum(25, lexical * 2)
+            + np.minimum(15, self.text_sums(self.word_text, morphological) * 0.5)
+            + np.minimum(10, self.text_sums(self.word_text, phonetic) * 0.3)
+        )
+
+    def children(self, age: int) -> Any:
+        """Лингвистическая сложность calculate_children_text_complexity_optimized для каждого текста."""
+        tables = get_children_tables(age)
+        consonants, special_chars = self.features[:, 0], self.features[:, 1]
+        syllables = (_cluster_scores(consonants) + special_chars * 2) * tables.syllable_factor
+
+        # Слагаемые морфологии в порядке эталона: сначала длина слова, затем окончание (0.0 сумму не меняет)
+        length_terms = np.where(self.token_lengths > 7, tables.long_word, np.where(self.token_lengths > 5, tables.medium_word, 0.0))
+        ending_terms = np.where(self.word_values(COMPLEX_ENDINGS_TRIE.matches, bool), tables.complex_ending, 0.0)
+        morphological = self.text_sums(np.repeat(self.word_text, 2), np.column_stack((length_terms, ending_terms)).ravel())
+
+        lexical = self.lexical_sums(tables.letter_complexity, CHILDREN_UNKNOWN_LETTER) / self.words_per_text
+        bigrams = self.bigram_sums() / self.words_per_text
+        return (
+            self.syllable_score(syllables, 3.5)
+            + self.structural(4, 1.5)
+            + np.minimum(25, lexical * 1.8)
+            + np.minimum(15, bigrams * 0.8)
+            + np.minimum(10, morphological * 0.4)
+        )
+
+
+def _cluster_scores(consonants: Any) -> Any:
+    return np.where(consonants >= 3, 3, np.where(consonants == 2, 1, 0))
+
+
+def calculate_text_complexity_batch(
+    texts: Iterable[str | Document],
+    age: int = 8,
+    include_cognitive_load: bool = True,
+    use_children_algorithm: bool = True,
+) -> list[int]:
+    """
+    Сложность каждого текста списка: те же числа, что и у поштучных функций.
+
+    Args:
+        texts: Тексты (или готовые Document)
+        age: Возраст ребенка (6-11 лет)
+        include_cognitive_load: Учитывать ли когнитивную нагрузку
+        use_children_algorithm: Детский алгоритм или улучшенный
+
+    Returns:
+        Список оценок в порядке текстов
+    """
+    scorer = calculate_children_text_complexity_fast if use_children_algorithm else calculate_text_complexity_improved_fast
+    documents = [analyze_text(text) for text in texts]
+    if np is None:
+        return [scorer(document, age, include_cognitive_load) for document in documents]
+
+    scores = [0] * len(documents)
+    positions = [i for i, document in enumerate(documents) if document.tokens]
+    if not positions:
+        return scores
+
+    scored = [documents[i] for i in positions]
+    batch = _FlatBatch(scored)
+    totals = batch.children(age) if use_children_algorithm else batch.improved()
+    if include_cognitive_load:
+        # Нагрузка зависит только от числа слов
+        totals = totals + np.array([cognitive_load_for_word_count(document.word_count, age) for document in scored])
+
+    near_integer = np.abs(totals - np.rint(totals)) < BOUNDARY_EPSILON
+    for position, document, total, recheck in zip(positions, scored, totals.tolist(), near_integer.tolist(), strict=True):
+        scores[position] = scorer(document, age, include_cognitive_load) if recheck else int(total)
+    return scores
+
+
+__all__ = ["HAS_NUMPY", "calculate_text_complexity_batch"]
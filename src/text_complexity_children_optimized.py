@@ -10,8 +10,14 @@
 """
 
 import math
+from itertools import pairwise
 
-from syllable_processor import is_vowel, split_syllables_hybrid
+try:  # context: src
+    from .domain.document import Document, analyze_text
+    from .text_complexity_improved import calculate_cognitive_load, calculate_text_complexity_improved
+except Exception:  # context: src on sys.path (streamlit run src/app.py)
+    from domain.document import Document, analyze_text  # type: ignore
+    from text_complexity_improved import calculate_cognitive_load, calculate_text_complexity_improved  # type: ignore
 
 
 def get_children_letter_frequency() -> dict[str, float]:
@@ -114,6 +120,42 @@ def get_children_bigram_frequency() -> dict[str, float]:
     }
 
 
+# Алфавит таблицы биграмм: 33 буквы и класс «прочее» (цифры, латиница, пунктуация)
+RUSSIAN_ALPHABET = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+LETTER_INDEX = {letter: i for i, letter in enumerate(RUSSIAN_ALPHABET)}
+OTHER_LETTER = len(RUSSIAN_ALPHABET)
+# Частота биграммы, которой нет в словаре
+UNKNOWN_BIGRAM_FREQUENCY = 0.01
+
+
+def get_bigram_complexity_matrix() -> list[list[float]]:
+    """
+    Сложность каждой биграммы max(1, -log(f) * 0.5), посчитанная заранее
+
+    Returns:
+        Матрица 34x34: строка — индекс первой буквы, столбец — второй (LETTER_INDEX,
+        OTHER_LETTER для любого другого символа)
+    """
+    unknown = max(1, -math.log(UNKNOWN_BIGRAM_FREQUENCY) * 0.5)
+    matrix = [[unknown] * (OTHER_LETTER + 1) for _ in range(OTHER_LETTER + 1)]
+    for (first, second), frequency in get_children_bigram_frequency().items():
+        matrix[LETTER_INDEX[first]][LETTER_INDEX[second]] = max(1, -math.log(frequency) * 0.5)
+    return matrix
+
+
+BIGRAM_COMPLEXITY_MATRIX = get_bigram_complexity_matrix()
+
+
+def word_bigram_complexities(word_lower: str) -> list[float]:
+    """Сложности всех пар соседних символов слова (поиск в BIGRAM_COMPLEXITY_MATRIX)
+
+    Для быстрого и пакетного движков; эталонный расчёт считает каждую пару заново,
+    чтобы дифференциальный тест проверял матрицу независимо.
+    """
+    indices = [LETTER_INDEX.get(char, OTHER_LETTER) for char in word_lower]
+    return [BIGRAM_COMPLEXITY_MATRIX[first][second] for first, second in pairwise(indices)]
+
+
 def get_age_letter_complexity_adjustment(age: int) -> dict[str, float]:
     """
     Возрастные коэффициенты корректировки сложности букв
@@ -164,7 +206,7 @@ def get_age_letter_complexity_adjustment(age: int) -> dict[str, float]:
         }
 
 
-def calculate_children_text_complexity_optimized(text: str, age: int = 8, include_cognitive_load: bool = True) -> int:
+def calculate_children_text_complexity_optimized(text: str | Document, age: int = 8, include_cognitive_load: bool = True) -> int:
     """
     Оптимизированный алгоритм расчета сложности текста для детской литературы
 
@@ -172,14 +214,15 @@ def calculate_children_text_complexity_optimized(text: str, age: int = 8, includ
     an eye-tracking study of young Russian readers"
 
     Args:
-        text: Текст для анализа
+        text: Текст для анализа (или готовый Document)
         age: Возраст ребенка (6-11 лет)
         include_cognitive_load: Учитывать ли когнитивную нагрузку
 
     Returns:
         Сложность текста (0-150)
     """
-    if not text.strip():
+    document = analyze_text(text)
+    if not document.tokens:
         return 0
 
     # Получаем данные частотности адаптированные для детей
@@ -198,12 +241,9 @@ def calculate_children_text_complexity_optimized(text: str, age: int = 8, includ
         letter_complexity[letter] = base_complexity * age_factor
 
     # Анализ текста
-    words = [word.strip() for word in text.split() if word.strip()]
-    if not words:
-        return 0
-
+    words = document.words
     total_words = len(words)
-    total_chars = sum(len(word) for word in words)
+    total_chars = sum(len(word) for word in document.tokens)
 
     # Компоненты сложности
     syllable_complexity_score = 0
@@ -215,16 +255,11 @@ def calculate_children_text_complexity_optimized(text: str, age: int = 8, includ
     syllable_complexities = []
     word_lengths = []
 
-    for word in words:
-        word_lower = word.lower()
-        syllables = split_syllables_hybrid(word_lower)
-        word_lengths.append(len(syllables))
+    for word, word_lower, features in zip(document.tokens, words, document.features, strict=True):
+        word_lengths.append(len(features))
 
         # 1. Анализ сложности слогов (как в оригинале)
-        for syll in syllables:
-            consonants = sum(1 for c in syll if not is_vowel(c) and c not in ("ь", "ъ"))
-            special_chars = sum(1 for c in syll if c in ("ь", "ъ"))
-
+        for consonants, special_chars, _consecutive_vowels, _syll_length in features:
             syll_complexity = 0
             if consonants >= 3:
                 syll_complexity += 3
@@ -307,9 +342,7 @@ def calculate_children_text_complexity_optimized(text: str, age: int = 8, includ
     # Когнитивная нагрузка (если включена)
     if include_cognitive_load:
         # Используем функцию из оригинального алгоритма
-        from text_complexity_improved import calculate_cognitive_load
-
-        cognitive_load = calculate_cognitive_load(text, age)
+        cognitive_load = calculate_cognitive_load(document, age)
         total_complexity = linguistic_complexity + cognitive_load
     else:
         total_complexity = linguistic_complexity
@@ -317,25 +350,21 @@ def calculate_children_text_complexity_optimized(text: str, age: int = 8, includ
     return int(total_complexity)
 
 
-def get_children_complexity_breakdown(text: str, age: int = 8, include_cognitive_load: bool = True) -> dict[str, float]:
+def get_children_complexity_breakdown(text: str | Document, age: int = 8, include_cognitive_load: bool = True) -> dict[str, float]:
     """
     Детальная разбивка компонентов сложности для детской адаптации
     """
-    linguistic_complexity = calculate_children_text_complexity_optimized(text, age=age, include_cognitive_load=False)
+    document = analyze_text(text)
+    linguistic_complexity = calculate_children_text_complexity_optimized(document, age=age, include_cognitive_load=False)
 
-    if include_cognitive_load:
-        from text_complexity_improved import calculate_cognitive_load
-
-        cognitive_load = calculate_cognitive_load(text, age)
-    else:
-        cognitive_load = 0
+    cognitive_load = calculate_cognitive_load(document, age) if include_cognitive_load else 0
 
     total_complexity = linguistic_complexity + cognitive_load
 
     return {
-        "text": text,
+        "text": document.text,
         "age": age,
-        "words": len(text.split()),
+        "words": document.word_count,
         "linguistic_complexity": linguistic_complexity,
         "cognitive_load": cognitive_load,
         "total_complexity": total_complexity,
@@ -348,20 +377,20 @@ def get_children_complexity_breakdown(text: str, age: int = 8, include_cognitive
     }
 
 
-def compare_algorithms_children_vs_original(text: str, age: int = 8, include_cognitive_load: bool = True) -> dict[str, float]:
+def compare_algorithms_children_vs_original(text: str | Document, age: int = 8, include_cognitive_load: bool = True) -> dict[str, float]:
     """
     Сравнивает детский оптимизированный алгоритм с оригинальным
     """
-    # Оригинальный алгоритм
-    from text_complexity_improved import calculate_text_complexity_improved
+    document = analyze_text(text)
 
-    original_score = calculate_text_complexity_improved(text, age=age, include_cognitive_load=include_cognitive_load)
+    # Оригинальный алгоритм
+    original_score = calculate_text_complexity_improved(document, age=age, include_cognitive_load=include_cognitive_load)
 
     # Новый детский алгоритм
-    children_score = calculate_children_text_complexity_optimized(text, age=age, include_cognitive_load=include_cognitive_load)
+    children_score = calculate_children_text_complexity_optimized(document, age=age, include_cognitive_load=include_cognitive_load)
 
     return {
-        "text": text,
+        "text": document.text,
         "age": age,
         "include_cognitive_load": include_cognitive_load,
         "original_algorithm": original_score,
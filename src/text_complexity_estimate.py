@@ -0,0 +1,132 @@
+"""
+Приближённая оценка сложности очень длинного текста по выборке слов
+
+Почти все составляющие оценки — средние по словам (слоги, длина, лексика, биграммы) или
+суммы, быстро упирающиеся в потолок (морфология, фонетика), а когнитивная нагрузка зависит
+только от числа слов. Поэтому для длинного текста достаточно разбить его на слова (это
+дёшево), проанализировать случайную выборку слов и пересчитать суммы на весь текст.
+
+Выборка берётся без возвращения порциями по SAMPLE_CHUNK слов, пока не исчерпан бюджет
+слов или времени. Доверительный интервал — складной нож (jackknife) по JACKKNIFE_GROUPS
+группам выборки с поправкой на конечность текста. Тексты не длиннее бюджета считаются
+точно быстрым движком.
+"""
+
+import random
+from time import perf_counter
+from typing import Any
+
+try:  # context: src
+    from .domain.document import Document
+    from .syllable_processor import word_tokens
+    from .text_complexity_fast import (
+        calculate_children_text_complexity_fast,
+        calculate_text_complexity_improved_fast,
+        linguistic_complexity_from_sums,
+        word_contributions,
+    )
+    from .text_complexity_improved import cognitive_load_for_word_count
+except Exception:  # context: src on sys.path (streamlit run src/app.py)
+    from domain.document import Document  # type: ignore
+    from syllable_processor import word_tokens  # type: ignore
+    from text_complexity_fast import (  # type: ignore
+        calculate_children_text_complexity_fast,
+        calculate_text_complexity_improved_fast,
+        linguistic_complexity_from_sums,
+        word_contributions,
+    )
+    from text_complexity_improved import cognitive_load_for_word_count  # type: ignore
+
+# Сколько слов анализируется, прежде чем оценка считается приближённой
+ESTIMATE_WORD_BUDGET = 2000
+# Слов в одной порции выборки (бюджет времени проверяется между порциями)
+SAMPLE_CHUNK = 250
+JACKKNIFE_GROUPS = 10
+# Квантиль нормального распределения для 95% интервала
+CONFIDENCE_Z = 1.96
+
+
+def _exact(text: str, age: int, include_cognitive_load: bool, use_children_algorithm: bool, total_words: int) -> dict[str, Any]:
+    scorer = calculate_children_text_complexity_fast if use_children_algorithm else calculate_text_complexity_improved_fast
+    # Без кэша analyze_text: при большом word_budget текст может быть целой книгой
+    complexity = scorer(Document(text), age, include_cognitive_load)
+    return {
+        "complexity": complexity,
+        "low": complexity,
+        "high": complexity,
+        "exact": True,
+        "sampled_words": total_words,
+        "total_words": total_words,
+    }
+
+
+def estimate_text_complexity(
+    text: str,
+    age: int = 8,
+    include_cognitive_load: bool = True,
+    use_children_algorithm: bool = True,
+    word_budget: int = ESTIMATE_WORD_BUDGET,
+    time_budget: float | None = None,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    Оценка сложности по случайной выборке слов.
+
+    Args:
+        text: Текст для анализа
+        age: Возраст ребенка (6-11 лет)
+        include_cognitive_load: Учитывать ли когнитивную нагрузку
+        use_children_algorithm: Детский алгоритм или улучшенный
+        word_budget: Сколько слов анализировать не больше
+        time_budget: Сколько секунд тратить не больше (выборка прекращается после очередной порции)
+        seed: Зерно выборки (одинаковый текст и зерно дают одинаковую оценку)
+
+    Returns:
+        complexity (оценка), low и high (95% интервал), exact (True, если посчитано точно),
+        sampled_words и total_words
+    """
+    started = perf_counter()
+    tokens = word_tokens(text)
+    total_words = len(tokens)
+    if total_words <= word_budget:
+        return _exact(text, age, include_cognitive_load, use_children_algorithm, total_words)
+
+    positions = random.Random(seed).sample(range(total_words), max(word_budget, SAMPLE_CHUNK))
+    contributions: list[tuple[float, ...]] = []
+    for chunk_start in range(0, len(positions), SAMPLE_CHUNK):
+        chunk = [tokens[i] for i in positions[chunk_start : chunk_start + SAMPLE_CHUNK]]
+        contributions += word_contributions(Document(" ".join(chunk)), age, use_children_algorithm)
+        if time_budget is not None and perf_counter() - started >= time_budget:
+            break
+
+    cognitive_load = cognitive_load_for_word_count(total_words, age) if include_cognitive_load else 0
+
+    def score(sums: list[float], sampled: int) -> float:
+        scale = total_words / sampled
+        return linguistic_complexity_from_sums(total_words, tuple(s * scale for s in sums), use_children_algorithm) + cognitive_load
+
+    sampled = len(contributions)
+    groups = [contributions[g::JACKKNIFE_GROUPS] for g in range(JACKKNIFE_GROUPS)]
+    group_sums = [[sum(column) for column in zip(*group, strict=True)] for group in groups]
+    sums = [sum(column) for column in zip(*group_sums, strict=True)]
+    estimate = score(sums, sampled)
+
+    leave_one_out = [
+        score([s - g for s, g in zip(sums, group_sum, strict=True)], sampled - len(group))
+        for group, group_sum in zip(groups, group_sums, strict=True)
+    ]
+    mean = sum(leave_one_out) / JACKKNIFE_GROUPS
+    variance = (JACKKNIFE_GROUPS - 1) / JACKKNIFE_GROUPS * sum((value - mean) ** 2 for value in leave_one_out)
+    margin = CONFIDENCE_Z * (variance * (1 - sampled / total_words)) ** 0.5
+
+    return {
+        "complexity": int(estimate),
+        "low": max(0, int(estimate - margin)),
+        "high": int(estimate + margin),
+        "exact": False,
+        "sampled_words": sampled,
+        "total_words": total_words,
+    }
+
+
+__all__ = ["ESTIMATE_WORD_BUDGET", "estimate_text_complexity"]
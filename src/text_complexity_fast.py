@@ -0,0 +1,438 @@
+"""
+Быстрая реализация алгоритмов сложности текста
+
+Считает то же, что и calculate_text_complexity_improved и
+calculate_children_text_complexity_optimized, с побитово одинаковым результатом:
+- таблицы сложности букв и биграмм строятся один раз (для детского алгоритма — по одной на возрастную группу);
+- вклад слова в оценку (профиль) считается один раз и хранится в LRU-кэше, общем для всех
+  текстов (ключ — слово в нижнем регистре и версия модели, см. WordProfileCache);
+- все суммы с плавающей точкой накапливаются в том же порядке, что и в эталонных функциях
+  (reduce(add, ...) — это тот же левый свёрток, что и цикл с +=; sum() для float так не
+  делает: начиная с Python 3.12 он компенсирует ошибки округления).
+
+Эталонные функции остаются оракулом: tests/test_text_complexity_fast.py сравнивает оценки
+обоих движков для всех возрастов и обоих режимов когнитивной нагрузки.
+"""
+
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import partial, reduce
+from itertools import chain
+from operator import add
+from typing import Any
+
+try:  # context: src
+    from .domain import observe
+    from .domain.document import Document, analyze_text
+    from .text_complexity_children_optimized import (
+        get_age_letter_complexity_adjustment,
+        get_children_letter_frequency,
+        word_bigram_complexities,
+    )
+    from .text_complexity_improved import (
+        COMPLEX_ENDINGS_TRIE,
+        LETTER_FREQUENCY,
+        calculate_cognitive_load,
+        get_phonetic_score,
+    )
+except Exception:  # context: src on sys.path (streamlit run src/app.py)
+    from domain import observe  # type: ignore
+    from domain.document import Document, analyze_text  # type: ignore
+    from text_complexity_children_optimized import (  # type: ignore
+        get_age_letter_complexity_adjustment,
+        get_children_letter_frequency,
+        word_bigram_complexities,
+    )
+    from text_complexity_improved import (  # type: ignore
+        COMPLEX_ENDINGS_TRIE,
+        LETTER_FREQUENCY,
+        calculate_cognitive_load,
+        get_phonetic_score,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Версии моделей в ключе кэша слов: увеличьте при любом изменении вклада слова в оценку
+IMPROVED_MODEL_VERSION = "improved-1"
+CHILDREN_MODEL_VERSION = "children-1"
+
+WORD_CACHE_SIZE_ENV = "LEARN_TO_READ_WORD_CACHE_SIZE"
+# Сколько профилей слов хранится (профиль детского алгоритма занимает около 0,5 КБ); 0 — без кэша
+WORD_CACHE_SIZE = 50_000
+
+
+def _rank_scale(frequency: dict[str, float], scale: float) -> dict[str, float]:
+    """Сложность буквы по её рангу частотности: log(ранг + 2) * scale (как в эталоне)."""
+    sorted_letters = sorted(frequency.items(), key=lambda x: x[1], reverse=True)
+    return {letter: math.log(i + 2) * scale for i, (letter, _freq) in enumerate(sorted_letters)}
+
+
+# Улучшенный алгоритм: таблица не зависит от возраста
+IMPROVED_LETTER_COMPLEXITY = _rank_scale(LETTER_FREQUENCY, 2)
+IMPROVED_UNKNOWN_LETTER = 5
+
+# Детский алгоритм (биграммы — BIGRAM_COMPLEXITY_MATRIX эталонного модуля)
+CHILDREN_UNKNOWN_LETTER = 6
+
+
+def _cluster_score(consonants: int) -> int:
+    if consonants >= 3:
+        return 3
+    if consonants == 2:
+        return 1
+    return 0
+
+
+class _SyllableScores(dict[tuple[int, int, int, int], float]):
+    """Сложность слога по его признакам; заполняется при первом обращении (признаков немного)."""
+
+    def __init__(self, score: Callable[[tuple[int, int, int, int]], float]) -> None:
+        super().__init__()
+        self.score = score
+
+    def __missing__(self, features: tuple[int, int, int, int]) -> float:
+        value = self[features] = self.score(features)
+        return value
+
+
+def _improved_syllable_score(features: tuple[int, int, int, int]) -> int:
+    consonants, special_chars, consecutive_vowels, syll_length = features
+    syll_complexity = _cluster_score(consonants) + special_chars * 2 + consecutive_vowels * 2
+    if syll_length >= 5:
+        syll_complexity += 2
+    elif syll_length == 4:
+        syll_complexity += 1
+    return syll_complexity
+
+
+IMPROVED_SYLLABLE_SCORES = _SyllableScores(_improved_syllable_score)
+
+
+def _children_age_group(age: int) -> int:
+    """Все ветки детского алгоритма различают только возрасты ≤6, 7, 8, 9 и ≥10."""
+    return min(max(age, 6), 10)
+
+
+class ChildrenTables:
+    """Всё, что детский алгоритм пересчитывал при каждом вызове, для одной возрастной группы."""
+
+    __slots__ = ("model", "letter_complexity", "syllable_factor", "syllable_scores", "long_word", "medium_word", "complex_ending")
+
+    def __init__(self, age: int) -> None:
+        self.model = f"{CHILDREN_MODEL_VERSION}/{age}"
+        age_adjustment = get_age_letter_complexity_adjustment(age)
+        base_complexity = _rank_scale(get_children_letter_frequency(), 1.8)
+        self.letter_complexity = {letter: complexity * age_adjustment.get(letter, 1.0) for letter, complexity in base_complexity.items()}
+
+        self.syllable_factor = 1.0
+        if age <= 6:
+            self.syllable_factor = 1.3
+        elif age <= 8:
+            self.syllable_factor = 1.1
+        self.syllable_scores = _SyllableScores(lambda f: (_cluster_score(f[0]) + f[1] * 2) * self.syllable_factor)
+
+        self.long_word = 2 * (1.2 if age <= 7 else 1.0)
+        self.medium_word = 1 * (1.1 if age <= 7 else 1.0)
+        self.complex_ending = 2 * (1.5 if age <= 7 else 1.2 if age <= 9 else 1.0)
+
+
+_children_tables: dict[int, ChildrenTables] = {}
+
+
+def get_children_tables(age: int) -> ChildrenTables:
+    group = _children_age_group(age)
+    tables = _children_tables.get(group)
+    if tables is None:
+        tables = _children_tables[group] = ChildrenTables(group)
+    return tables
+
+
+class WordProfileCache:
+    """
+    Ограниченный LRU-кэш профилей слов, общий для всех текстов.
+
+    Ключ — (слово в нижнем регистре, версия модели). Размер задаётся maxsize (0 — кэш
+    выключен), попадания и промахи видны в info() и в метриках с cache="word".
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._profiles: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def profiles(
+        self, document: Document, model: str, compute: Callable[[str, str, list[tuple[int, int, int, int]]], Any]
+    ) -> dict[str, Any]:
+        """Профиль каждого уникального токена документа: из кэша или compute(токен, слово, признаки слогов)."""
+        tokens, words, features = document.tokens, document.words, document.features
+        first_index = dict(zip(tokens, range(len(tokens)), strict=True))
+        if self.maxsize <= 0:
+            return {token: compute(token, words[i], features[i]) for token, i in first_index.items()}
+
+        result: dict[str, Any] = {}
+        missing: list[tuple[str, int]] = []
+        with self._lock:
+            cached = self._profiles
+            for token, i in first_index.items():
+                key = (words[i], model)
+                # Длина токена входит в профиль; lower() меняет её лишь у редких символов (İ) — такие слова не кэшируем
+                profile = cached.get(key) if len(token) == len(words[i]) else None
+                if profile is None:
+                    missing.append((token, i))
+                else:
+                    cached.move_to_end(key)
+                    result[token] = profile
+            hits = len(result)
+            self.hits += hits
+            self.misses += len(missing)
+
+        computed = [(token, i, compute(token, words[i], features[i])) for token, i in missing]
+        with self._lock:
+            for token, i, profile in computed:
+                result[token] = profile
+                if len(token) == len(words[i]):
+                    self._profiles[words[i], model] = profile
+            while len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+
+        observe.cache_lookups("word", hits, len(missing))
+        return result
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._profiles) > max(maxsize, 0):
+                self._profiles.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._profiles),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _word_cache_size() -> int:
+    try:
+        return max(0, int(os.environ.get(WORD_CACHE_SIZE_ENV, WORD_CACHE_SIZE)))
+    except ValueError:
+        logger.warning("Invalid %s=%r, using %s", WORD_CACHE_SIZE_ENV, os.environ.get(WORD_CACHE_SIZE_ENV), WORD_CACHE_SIZE)
+        return WORD_CACHE_SIZE
+
+
+WORD_CACHE = WordProfileCache(_word_cache_size())
+
+
+def word_cache_info() -> dict[str, float]:
+    """Попадания, промахи, доля попаданий и заполненность кэша профилей слов."""
+    return WORD_CACHE.info()
+
+
+def set_word_cache_size(maxsize: int) -> None:
+    """Новый предел числа профилей в кэше (0 выключает кэш); лишние вытесняются сразу."""
+    WORD_CACHE.resize(maxsize)
+
+
+def clear_word_cache() -> None:
+    WORD_CACHE.clear()
+
+
+def _improved_word_profile(word: str, word_lower: str, features: list[tuple[int, int, int, int]]) -> tuple[int, int, float, int, int]:
+    """(число слогов, сумма сложностей слогов, лексика слова, морфология, фонетика)"""
+    syllable_sum = sum(map(IMPROVED_SYLLABLE_SCORES.__getitem__, features))
+
+    word_lexical_score = 0
+    for char in word_lower:
+        word_lexical_score += IMPROVED_LETTER_COMPLEXITY.get(char, IMPROVED_UNKNOWN_LETTER)
+    lexical = word_lexical_score / len(word_lower) if word_lower else 0.0
+
+    morphological = 2 if len(word) > 7 else 1 if len(word) > 5 else 0
+    if COMPLEX_ENDINGS_TRIE.matches(word_lower):
+        morphological += 2
+
+    phonetic = get_phonetic_score(word_lower)
+
+    return len(features), syllable_sum, lexical, morphological, phonetic
+
+
+def calculate_text_complexity_improved_fast(text: str | Document, age: int = 8, include_cognitive_load: bool = False) -> int:
+    """Быстрый calculate_text_complexity_improved (тот же результат)."""
+    document = analyze_text(text)
+    if not document.tokens:
+        return 0
+
+    tokens = document.tokens
+    # Один профиль на уникальное слово; признаки берём у любого его вхождения (они одинаковые)
+    profiles = WORD_CACHE.profiles(document, IMPROVED_MODEL_VERSION, _improved_word_profile)
+    syllable_counts, syllable_scores, lexical_values, morphological_values, phonetic_values = zip(
+        *map(profiles.__getitem__, tokens), strict=True
+    )
+
+    linguistic_complexity = improved_linguistic_complexity(
+        len(tokens),
+        sum(map(len, tokens)),
+        sum(syllable_counts),
+        sum(syllable_scores),
+        reduce(add, lexical_values, 0),
+        sum(morphological_values),
+        sum(phonetic_values),
+    )
+    if include_cognitive_load:
+        return int(linguistic_complexity + calculate_cognitive_load(document, age))
+    return int(linguistic_complexity)
+
+
+def improved_linguistic_complexity(
+    total_words: int,
+    total_chars: int,
+    syllable_count: int,
+    syllable_sum: int,
+    lexical_score: float,
+    morphological_score: int,
+    phonetic_score: int,
+) -> float:
+    """Лингвистическая сложность улучшенного алгоритма по суммам вкладов слов текста."""
+    syllable_complexity_score = 0.0
+    if syllable_count:
+        avg_syllable_complexity = syllable_sum / syllable_count
+        syllable_complexity_score = min(30, avg_syllable_complexity * 4)
+
+    avg_syllables_per_word = syllable_count / total_words
+    avg_word_length = total_chars / total_words
+    structural_score = min(20, (avg_syllables_per_word - 1) * 5 + (avg_word_length - 3) * 2)
+
+    avg_lexical_complexity = lexical_score / total_words
+    lexical_complexity_score = min(25, avg_lexical_complexity * 2)
+
+    morphological_complexity_score = min(15, morphological_score * 0.5)
+    phonetic_complexity_score = min(10, phonetic_score * 0.3)
+
+    return (
+        syllable_complexity_score + structural_score + lexical_complexity_score + morphological_complexity_score + phonetic_complexity_score
+    )
+
+
+def _children_word_profile(
+    tables: ChildrenTables, word: str, word_lower: str, features: list[tuple[int, int, int, int]]
+) -> tuple[tuple[float, ...], float, tuple[float, ...], tuple[float, ...]]:
+    """(сложности слогов, лексика слова, сложности биграмм, слагаемые морфологии)"""
+    syllables = tuple(map(tables.syllable_scores.__getitem__, features))
+
+    letter_complexity = tables.letter_complexity
+    word_lexical_score = 0
+    for char in word_lower:
+        word_lexical_score += letter_complexity.get(char, CHILDREN_UNKNOWN_LETTER)
+    lexical = word_lexical_score / len(word_lower) if word_lower else 0.0
+
+    bigrams = tuple(word_bigram_complexities(word_lower))
+
+    morphological: tuple[float, ...] = ()
+    if len(word) > 7:
+        morphological = (tables.long_word,)
+    elif len(word) > 5:
+        morphological = (tables.medium_word,)
+    if COMPLEX_ENDINGS_TRIE.matches(word_lower):
+        morphological += (tables.complex_ending,)
+
+    return syllables, lexical, bigrams, morphological
+
+
+def calculate_children_text_complexity_fast(text: str | Document, age: int = 8, include_cognitive_load: bool = True) -> int:
+    """Быстрый calculate_children_text_complexity_optimized (тот же результат)."""
+    document = analyze_text(text)
+    if not document.tokens:
+        return 0
+
+    tables = get_children_tables(age)
+    tokens = document.tokens
+    profiles = WORD_CACHE.profiles(document, tables.model, partial(_children_word_profile, tables))
+    syllable_values, lexical_values, bigram_values, morphological_values = zip(*map(profiles.__getitem__, tokens), strict=True)
+    syllable_complexities = list(chain.from_iterable(syllable_values))
+    linguistic_complexity = children_linguistic_complexity(
+        len(tokens),
+        sum(map(len, tokens)),
+        len(syllable_complexities),
+        # sum(), а не накопление: так же, как в эталоне (в Python 3.12+ sum() компенсирует ошибки округления)
+        sum(syllable_complexities),
+        reduce(add, lexical_values, 0),
+        # Поэлементно, в порядке эталона: сумма с плавающей точкой неассоциативна
+        reduce(add, chain.from_iterable(bigram_values), 0),
+        reduce(add, chain.from_iterable(morphological_values), 0),
+    )
+    if include_cognitive_load:
+        return int(linguistic_complexity + calculate_cognitive_load(document, age))
+    return int(linguistic_complexity)
+
+
+def children_linguistic_complexity(
+    total_words: int,
+    total_chars: int,
+    syllable_count: int,
+    syllable_sum: float,
+    lexical_score: float,
+    bigram_score: float,
+    morphological_score: float,
+) -> float:
+    """Лингвистическая сложность детского алгоритма по суммам вкладов слов текста."""
+    syllable_complexity_score = 0.0
+    if syllable_count:
+        avg_syllable_complexity = syllable_sum / syllable_count
+        syllable_complexity_score = min(30, avg_syllable_complexity * 3.5)
+
+    avg_syllables_per_word = syllable_count / total_words
+    avg_word_length = total_chars / total_words
+    structural_score = min(20, (avg_syllables_per_word - 1) * 4 + (avg_word_length - 3) * 1.5)
+
+    avg_lexical_complexity = lexical_score / total_words
+    lexical_complexity_score = min(25, avg_lexical_complexity * 1.8)
+
+    avg_bigram_complexity = bigram_score / total_words
+    bigram_complexity_score = min(15, avg_bigram_complexity * 0.8)
+
+    morphological_complexity_score = min(10, morphological_score * 0.4)
+
+    return (
+        syllable_complexity_score + structural_score + lexical_complexity_score + bigram_complexity_score + morphological_complexity_score
+    )
+
+
+def word_contributions(document: Document, age: int = 8, use_children_algorithm: bool = True) -> list[tuple[float, ...]]:
+    """
+    Вклад каждого слова документа в суммы, из которых складывается оценка.
+
+    Сумма вкладов по всем словам текста — аргументы linguistic_complexity_from_sums (после
+    числа слов). Нужна, чтобы пересчитывать оценку черновика только по изменённым словам;
+    суммы с плавающей точкой при этом складываются в другом порядке, чем в эталоне.
+    """
+    tokens = document.tokens
+    if use_children_algorithm:
+        tables = get_children_tables(age)
+        profiles = WORD_CACHE.profiles(document, tables.model, partial(_children_word_profile, tables))
+        return [
+            (len(token), len(syllables), sum(syllables), lexical, sum(bigrams), sum(morphological))
+            for token, (syllables, lexical, bigrams, morphological) in zip(tokens, map(profiles.__getitem__, tokens), strict=True)
+        ]
+    profiles = WORD_CACHE.profiles(document, IMPROVED_MODEL_VERSION, _improved_word_profile)
+    return [(len(token), *profile) for token, profile in zip(tokens, map(profiles.__getitem__, tokens), strict=True)]
+
+
+def linguistic_complexity_from_sums(total_words: int, sums: tuple[float, ...], use_children_algorithm: bool = True) -> float:
+    """Лингвистическая сложность текста из total_words слов по суммам их word_contributions."""
+    if use_children_algorithm:
+        return children_linguistic_complexity(total_words, *sums)
+    return improved_linguistic_complexity(total_words, *sums)
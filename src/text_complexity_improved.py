@@ -4,60 +4,172 @@
 
 import math
 
-from syllable_processor import is_vowel, split_syllables_hybrid
+try:  # context: src
+    from .domain.document import Document, analyze_text
+    from .syllable_processor import count_words
+    from .text_patterns import PatternMatcher, SuffixTrie
+except Exception:  # context: src on sys.path (streamlit run src/app.py)
+    from domain.document import Document, analyze_text  # type: ignore
+    from syllable_processor import count_words  # type: ignore
+    from text_patterns import PatternMatcher, SuffixTrie  # type: ignore
+
+
+# Обновленная частотная модель букв (на основе современных корпусов)
+LETTER_FREQUENCY: dict[str, float] = {
+    "о": 10.97,
+    "е": 8.45,
+    "а": 8.01,
+    "и": 7.35,
+    "н": 6.70,
+    "т": 6.26,
+    "с": 5.47,
+    "р": 4.73,
+    "в": 4.54,
+    "л": 4.40,
+    "к": 3.49,
+    "м": 3.21,
+    "д": 2.98,
+    "п": 2.81,
+    "у": 2.62,
+    "я": 2.01,
+    "ы": 1.90,
+    "ь": 1.74,
+    "г": 1.70,
+    "з": 1.65,
+    "б": 1.59,
+    "ч": 1.44,
+    "й": 1.21,
+    "х": 0.97,
+    "ж": 0.94,
+    "ю": 0.64,
+    "ш": 0.73,
+    "ц": 0.48,
+    "щ": 0.36,
+    "э": 0.32,
+    "ф": 0.26,
+    "ъ": 0.04,
+    "ё": 0.04,
+}
+
+# Сложные сочетания букв
+DIFFICULT_COMBINATIONS: dict[str, int] = {
+    "жы": 8,
+    "шы": 8,
+    "чя": 6,
+    "щя": 6,
+    "чю": 6,
+    "щю": 6,
+    "тся": 4,
+    "ться": 4,
+    "ство": 3,
+    "ння": 5,
+    "льн": 4,
+}
+
+# Окончания, указывающие на сложную морфологию
+COMPLEX_ENDINGS = ("ость", "ение", "ание", "ция", "сия")
+
+# Один проход по слову, сколько бы сочетаний и окончаний ни было в списках (для быстрого и
+# пакетного движков; эталонный расчёт ниже проверяет подстроки и окончания напрямую)
+DIFFICULT_COMBINATIONS_MATCHER = PatternMatcher(DIFFICULT_COMBINATIONS)
+COMPLEX_ENDINGS_TRIE = SuffixTrie(COMPLEX_ENDINGS)
+# Слово может содержать сложное сочетание, только если в нём есть самая редкая буква этого сочетания
+PHONETIC_TRIGGERS = frozenset(min(combination, key=lambda c: LETTER_FREQUENCY.get(c, 0)) for combination in DIFFICULT_COMBINATIONS)
+
+
+def get_phonetic_score(word_lower: str) -> int:
+    """Сумма баллов сложных сочетаний, встречающихся в слове (каждое считается один раз)"""
+    if PHONETIC_TRIGGERS.isdisjoint(word_lower):
+        return 0
+    matched = DIFFICULT_COMBINATIONS_MATCHER.matched(word_lower)
+    return sum(map(DIFFICULT_COMBINATIONS.__getitem__, matched)) if matched else 0
+
+
+# Возрастные коэффициенты влияния длины: возраст -> (множитель, делитель)
+COGNITIVE_LOAD_FACTORS: dict[int, tuple[float, int]] = {
+    6: (1.8, 5),  # Максимальное влияние длины
+    7: (1.5, 7),  # Высокое влияние
+    8: (1.0, 10),  # Базовое влияние
+    9: (0.8, 12),  # Умеренное влияние
+    10: (0.7, 15),  # Низкое влияние
+    11: (0.6, 18),  # Минимальное влияние
+}
+
+# Нагрузка текстов до стольких слов берётся из таблицы (длиннее - по формуле);
+# столько же слов оценивается точно в text_complexity_estimate
+COGNITIVE_LOAD_TABLE_WORDS = 2000
+
+# Таблицы нагрузки по коэффициентам (factor, divisor): индекс - число слов; строятся при первом обращении.
+# Ключ - коэффициенты, а не возраст: любые возрасты (и произвольные int) делят одну из шести таблиц
+_cognitive_load_tables: dict[tuple[float, int], tuple[float, ...]] = {}
+
+
+def _cognitive_load_factors(age: int) -> tuple[float, int]:
+    """Коэффициенты ближайшего возраста, если точного нет"""
+    if age in COGNITIVE_LOAD_FACTORS:
+        return COGNITIVE_LOAD_FACTORS[age]
+    if age < 6:
+        return COGNITIVE_LOAD_FACTORS[6]
+    if age > 11:
+        return COGNITIVE_LOAD_FACTORS[11]
+    # Между соседними возрастами берется младший
+    return COGNITIVE_LOAD_FACTORS[max(a for a in COGNITIVE_LOAD_FACTORS if a <= age)]
+
+
+def _cognitive_load_formula(words: int, factor: float, divisor: int) -> float:
+    if words == 0:
+        return 0
+    # Логарифмическая формула: больше влияние для коротких текстов
+    return min(50, math.log(1 + words / divisor) * factor * 10)
+
+
+def _cognitive_load_table(factors: tuple[float, int]) -> tuple[float, ...]:
+    table = tuple(_cognitive_load_formula(words, *factors) for words in range(COGNITIVE_LOAD_TABLE_WORDS + 1))
+    _cognitive_load_tables[factors] = table
+    return table
 
 
-def calculate_cognitive_load(text: str, age: int) -> float:
+def set_cognitive_load_table_words(words: int) -> None:
+    """Размер таблиц нагрузки (в словах); таблицы перестраиваются при следующем обращении"""
+    global COGNITIVE_LOAD_TABLE_WORDS
+    if words < 0:
+        raise ValueError(f"Table size must be non-negative, got {words}")
+    COGNITIVE_LOAD_TABLE_WORDS = words
+    _cognitive_load_tables.clear()
+
+
+def calculate_cognitive_load(text: int | str | Document, age: int) -> float:
     """
     Расчет когнитивной нагрузки от длины текста с учетом возраста ребенка.
 
     Args:
-        text: Анализируемый текст
+        text: Число слов, готовый Document или текст (его слова придется посчитать)
         age: Возраст ребенка (6-11 лет)
 
     Returns:
         Когнитивная нагрузка (0-50 баллов)
     """
-    words = len([word for word in text.split() if word.strip()])
-
-    if words == 0:
-        return 0
-
-    # Возрастные коэффициенты влияния длины
-    age_factors = {
-        6: {"factor": 1.8, "divisor": 5},  # Максимальное влияние длины
-        7: {"factor": 1.5, "divisor": 7},  # Высокое влияние
-        8: {"factor": 1.0, "divisor": 10},  # Базовое влияние
-        9: {"factor": 0.8, "divisor": 12},  # Умеренное влияние
-        10: {"factor": 0.7, "divisor": 15},  # Низкое влияние
-        11: {"factor": 0.6, "divisor": 18},  # Минимальное влияние
-    }
-
-    # Используем ближайший возраст если точного нет
-    if age not in age_factors:
-        if age < 6:
-            age = 6
-        elif age > 11:
-            age = 11
-        else:
-            # Интерполяция между соседними возрастами
-            lower_age = max([a for a in age_factors if a <= age])
-            age = lower_age
-
-    params = age_factors[age]
+    if isinstance(text, int):
+        return cognitive_load_for_word_count(text, age)
+    words = text.word_count if isinstance(text, Document) else count_words(text)
+    return cognitive_load_for_word_count(words, age)
 
-    # Логарифмическая формула: больше влияние для коротких текстов
-    cognitive_load = min(50, math.log(1 + words / params["divisor"]) * params["factor"] * 10)
 
-    return cognitive_load
+def cognitive_load_for_word_count(words: int, age: int) -> float:
+    """Когнитивная нагрузка текста из words слов (она зависит только от числа слов)"""
+    factors = _cognitive_load_factors(age)
+    table = _cognitive_load_tables.get(factors) or _cognitive_load_table(factors)
+    if words < len(table):
+        return table[words]
+    return _cognitive_load_formula(words, *factors)
 
 
-def calculate_text_complexity_improved(text: str, age: int = 8, include_cognitive_load: bool = False) -> int:
+def calculate_text_complexity_improved(text: str | Document, age: int = 8, include_cognitive_load: bool = False) -> int:
     """
     Улучшенный алгоритм расчета сложности текста.
 
     Args:
-        text: Текст для анализа
+        text: Текст для анализа (или готовый Document)
         age: Возраст ребенка (6-11 лет)
         include_cognitive_load: Учитывать ли когнитивную нагрузку от длины
 
@@ -73,75 +185,21 @@ def calculate_text_complexity_improved(text: str, age: int = 8, include_cognitiv
     4. Улучшенная частотная модель
     5. Опциональный учет когнитивной нагрузки от длины
     """
-    if not text.strip():
+    document = analyze_text(text)
+    if not document.tokens:
         return 0
 
-    # Обновленная частотная модель букв (на основе современных корпусов)
-    letter_frequency = {
-        "о": 10.97,
-        "е": 8.45,
-        "а": 8.01,
-        "и": 7.35,
-        "н": 6.70,
-        "т": 6.26,
-        "с": 5.47,
-        "р": 4.73,
-        "в": 4.54,
-        "л": 4.40,
-        "к": 3.49,
-        "м": 3.21,
-        "д": 2.98,
-        "п": 2.81,
-        "у": 2.62,
-        "я": 2.01,
-        "ы": 1.90,
-        "ь": 1.74,
-        "г": 1.70,
-        "з": 1.65,
-        "б": 1.59,
-        "ч": 1.44,
-        "й": 1.21,
-        "х": 0.97,
-        "ж": 0.94,
-        "ю": 0.64,
-        "ш": 0.73,
-        "ц": 0.48,
-        "щ": 0.36,
-        "э": 0.32,
-        "ф": 0.26,
-        "ъ": 0.04,
-        "ё": 0.04,
-    }
-
     # Более мягкая шкала сложности букв
     letter_complexity = {}
-    sorted_letters = sorted(letter_frequency.items(), key=lambda x: x[1], reverse=True)
+    sorted_letters = sorted(LETTER_FREQUENCY.items(), key=lambda x: x[1], reverse=True)
     for i, (letter, _freq) in enumerate(sorted_letters):
         # Логарифмическая шкала вместо линейной
         complexity = math.log(i + 2) * 2
         letter_complexity[letter] = complexity
 
-    # Сложные сочетания букв
-    difficult_combinations = {
-        "жы": 8,
-        "шы": 8,
-        "чя": 6,
-        "щя": 6,
-        "чю": 6,
-        "щю": 6,
-        "тся": 4,
-        "ться": 4,
-        "ство": 3,
-        "ння": 5,
-        "льн": 4,
-    }
-
-    words = [word.strip() for word in text.split() if word.strip()]
-    if not words:
-        return 0
-
+    words = document.words
     total_words = len(words)
-    total_chars = sum(len(word) for word in words)
+    total_chars = sum(len(word) for word in document.tokens)
 
     # Компоненты сложности
     syllable_complexity_score = 0
@@ -152,17 +210,11 @@ def calculate_text_complexity_improved(text: str, age: int = 8, include_cognitiv
     syllable_complexities = []
     word_lengths = []
 
-    for word in words:
-        word_lower = word.lower()
-        syllables = split_syllables_hybrid(word_lower)
-        word_lengths.append(len(syllables))
+    for word, word_lower, features in zip(document.tokens, words, document.features, strict=True):
+        word_lengths.append(len(features))
 
         # 1. Анализ сложности слогов (улучшенный)
-        for syll in syllables:
-            consonants = sum(1 for c in syll if not is_vowel(c) and c not in ("ь", "ъ"))
-            # Removed unused variable to satisfy linter
-            special_chars = sum(1 for c in syll if c in ("ь", "ъ"))
-
+        for consonants, special_chars, consecutive_vowels, syll_length in features:
             # Более точная оценка сложности слога
             syll_complexity = 0
 
@@ -176,13 +228,12 @@ def calculate_text_complexity_improved(text: str, age: int = 8, include_cognitiv
             syll_complexity += special_chars * 2
 
             # Несколько гласных подряд
-            consecutive_vowels = sum(1 for i in range(len(syll) - 1) if is_vowel(syll[i]) and is_vowel(syll[i + 1]))
             syll_complexity += consecutive_vowels * 2
 
             # Длина слога (более мягкий подход)
-            if len(syll) >= 5:
+            if syll_length >= 5:
                 syll_complexity += 2
-            elif len(syll) == 4:
+            elif syll_length == 4:
                 syll_complexity += 1
 
             syllable_complexities.append(syll_complexity)
@@ -204,11 +255,11 @@ def calculate_text_complexity_improved(text: str, age: int = 8, include_cognitiv
             morphological_score += 1
 
         # Окончания, указывающие на сложность
-        if word_lower.endswith(("ость", "ение", "ание", "ция", "сия")):
+        if word_lower.endswith(COMPLEX_ENDINGS):
             morphological_score += 2
 
         # 4. Фонетическая сложность
-        for combination, score in difficult_combinations.items():
+        for combination, score in DIFFICULT_COMBINATIONS.items():
             if combination in word_lower:
                 phonetic_score += score
 
@@ -245,7 +296,7 @@ def calculate_text_complexity_improved(text: str, age: int = 8, include_cognitiv
 
     # Добавляем когнитивную нагрузку если требуется
     if include_cognitive_load:
-        cognitive_load = calculate_cognitive_load(text, age)
+        cognitive_load = calculate_cognitive_load(document, age)
         total_complexity = linguistic_complexity + cognitive_load
     else:
         total_complexity = linguistic_complexity
@@ -253,18 +304,19 @@ def calculate_text_complexity_improved(text: str, age: int = 8, include_cognitiv
     return int(total_complexity)
 
 
-def get_complexity_breakdown(text: str, age: int = 8, include_cognitive_load: bool = False) -> dict[str, float]:
+def get_complexity_breakdown(text: str | Document, age: int = 8, include_cognitive_load: bool = False) -> dict[str, float]:
     """
     Возвращает детальную разбивку компонентов сложности для анализа
     """
-    linguistic_complexity = calculate_text_complexity_improved(text, age=age, include_cognitive_load=False)
-    cognitive_load = calculate_cognitive_load(text, age) if include_cognitive_load else 0
+    document = analyze_text(text)
+    linguistic_complexity = calculate_text_complexity_improved(document, age=age, include_cognitive_load=False)
+    cognitive_load = calculate_cognitive_load(document, age) if include_cognitive_load else 0
     total_complexity = linguistic_complexity + cognitive_load
 
     return {
-        "text": text,
+        "text": document.text,
         "age": age,
-        "words": len(text.split()),
+        "words": document.word_count,
         "linguistic_complexity": linguistic_complexity,
         "cognitive_load": cognitive_load,
         "total_complexity": total_complexity,
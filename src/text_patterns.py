@@ -0,0 +1,109 @@
+"""
+Поиск многих образцов в слове за один проход
+
+- PatternMatcher — автомат Ахо — Корасик для сложных буквосочетаний: все вхождения всех
+  образцов за один проход по строке;
+- SuffixTrie — префиксное дерево перевёрнутых окончаний: str.endswith(окончания) за длину
+  самого длинного окончания.
+
+В обоих случаях стоимость проверки не зависит от числа образцов, поэтому списки сочетаний
+и окончаний можно расширять до сотен элементов.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+
+# Ключ-признак конца окончания в узле SuffixTrie (символы слова — строки длины 1)
+_END = ""
+
+
+class PatternMatcher:
+    """
+    Автомат Ахо — Корасик над набором образцов.
+
+    Переходы достроены заранее по ссылкам неудач, так что на каждый символ строки
+    приходится один поиск в словаре.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = tuple(dict.fromkeys(pattern for pattern in patterns if pattern))
+
+        goto: list[dict[str, int]] = [{}]
+        output: list[tuple[str, ...]] = [()]
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = goto[state][char] = len(goto)
+                    goto.append({})
+                    output.append(())
+                state = next_state
+            output[state] += (pattern,)
+
+        # Обход в ширину: ссылка неудачи ведёт в более мелкое состояние, его переходы уже готовы
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            output[state] += output[fail[state]]
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(char, 0) if state else 0
+                queue.append(next_state)
+
+        self._delta = tuple(delta)
+        self._output = tuple(output)
+
+    def find_all(self, text: str) -> list[tuple[int, str]]:
+        """Все вхождения образцов: (позиция начала, образец) в порядке окончания вхождения."""
+        delta, output = self._delta, self._output
+        found = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            for pattern in output[state]:
+                found.append((end - len(pattern), pattern))
+        return found
+
+    def matched(self, text: str) -> set[str]:
+        """Образцы, которые встречаются в строке (каждый один раз)."""
+        delta, output = self._delta, self._output
+        found: set[str] = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class SuffixTrie:
+    """Префиксное дерево перевёрнутых окончаний."""
+
+    def __init__(self, suffixes: Iterable[str]) -> None:
+        self.suffixes = tuple(dict.fromkeys(suffixes))
+        self._matches_all = "" in self.suffixes
+        self._root: dict[str, dict] = {}
+        for suffix in self.suffixes:
+            node = self._root
+            for char in reversed(suffix):
+                node = node.setdefault(char, {})
+            node[_END] = {}
+
+    def matches(self, word: str) -> bool:
+        """То же, что word.endswith(suffixes)."""
+        if self._matches_all:
+            return True
+        node = self._root
+        for char in reversed(word):
+            node = node.get(char)  # type: ignore[assignment]
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
+
+
+__all__ = ["PatternMatcher", "SuffixTrie"]
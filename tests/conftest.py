@@ -0,0 +1,53 @@
+import json
+import os
+import random
+
+import pytest
+
+PHRASES_PATH = os.path.join(os.path.dirname(__file__), "..", "phrases.json")
+
+ALPHABET = "абвгдеёжзийклмнопрстуфхцчшщъыьэюяАБВЕЁЖЩЪ" + "  ,.!?—–«»-:;…'\"\n\t" + "aZ19"
+# Pieces that trigger every branch: difficult combinations, complex endings, rare letters, known bigrams
+FRAGMENTS = [
+    "жы",
+    "шы",
+    "чя",
+    "щю",
+    "ться",
+    "тся",
+    "ство",
+    "ння",
+    "льн",
+    "ость",
+    "ение",
+    "ание",
+    "ция",
+    "сия",
+    "нн",
+    "щн",
+    "зч",
+    "ъё",
+    "аоу",
+]
+
+
+def _random_texts(seed, count):
+    rng = random.Random(seed)
+    with open(PHRASES_PATH, encoding="utf-8") as f:
+        words = " ".join(phrase["text"] for phrase in json.load(f)).split()
+    texts = ["", " ", "—", "...", "а", "ъ"]
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.4:
+            texts.append("".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 150))))
+        elif kind < 0.7:
+            texts.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 80))))
+        else:
+            texts.append(" ".join(rng.choice(words) + rng.choice(FRAGMENTS) * rng.randint(0, 2) for _ in range(rng.randint(1, 30))))
+    return texts
+
+
+@pytest.fixture
+def random_texts():
+    """``random_texts(seed, count)``: edge cases plus ``count`` random texts that exercise every scoring branch."""
+    return _random_texts
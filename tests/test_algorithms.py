@@ -0,0 +1,101 @@
+import subprocess
+import sys
+
+import pytest
+
+from src.domain import algorithms
+from src.domain.algorithms import Algorithm, algorithm_from_config, get_algorithm, list_algorithms, register_algorithm
+from src.domain.complexity import (
+    calculate_text_complexity_universal,
+    calculate_text_complexity_universal_batch,
+    estimate_text_complexity_universal,
+    get_complexity_breakdown_universal,
+)
+from src.services.preview import DraftPreview
+from src.text_complexity_fast import CHILDREN_MODEL_VERSION, IMPROVED_MODEL_VERSION
+
+TEXTS = ["Мама мыла раму.", "Кошка спала на тёплом окне, а пёс лаял во дворе.", ""]
+
+
+def test_listing_algorithms_loads_no_scorer():
+    code = (
+        "import sys; from src.domain.complexity import calculate_text_complexity_universal; "
+        "from src.domain.algorithms import list_algorithms; [a.label for a in list_algorithms()]; "
+        "print(sorted(m for m in sys.modules if 'text_complexity' in m))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_builtin_versions_match_the_fast_models():
+    assert get_algorithm("children").version == CHILDREN_MODEL_VERSION
+    assert get_algorithm("improved").version == IMPROVED_MODEL_VERSION
+    assert [algorithm.id for algorithm in list_algorithms()][:2] == ["children", "improved"]
+
+
+def test_old_flag_and_config_map_to_ids():
+    assert get_algorithm(True).id == "children"
+    assert get_algorithm(False).id == "improved"
+    assert algorithm_from_config({}) == "children"
+    assert algorithm_from_config({"use_children_algorithm": False}) == "improved"
+    assert algorithm_from_config({"algorithm": "improved", "use_children_algorithm": True}) == "improved"
+    assert algorithm_from_config({"algorithm": "removed", "use_children_algorithm": False}) == "improved"
+    for text in TEXTS:
+        assert calculate_text_complexity_universal(text, 8, True, "improved") == calculate_text_complexity_universal(text, 8, True, False)
+        with pytest.warns(DeprecationWarning, match="use_children_algorithm"):
+            old = calculate_text_complexity_universal(text, 8, True, use_children_algorithm=False)
+        assert old == calculate_text_complexity_universal(text, 8, True, algorithm="improved")
+
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError, match="Unknown complexity algorithm"):
+        get_algorithm("nope")
+    with pytest.raises(ValueError, match="already registered"):
+        register_algorithm(Algorithm("children", "", "", "", "", ""))
+
+
+def test_registered_algorithm_without_batch_or_estimate(monkeypatch):
+    improved = get_algorithm("improved")
+    custom = Algorithm(
+        "custom",
+        label="Custom",
+        version="custom-1",
+        score=improved.entry_points["score"],
+        reference=improved.entry_points["reference"],
+        breakdown=improved.entry_points["breakdown"],
+    )
+    assert custom.preview_model is None
+    with pytest.raises(ValueError, match="preview model"):
+        Algorithm("broken", "", "", "", "", "", preview_model="custom")
+    monkeypatch.setitem(algorithms._registry, "custom", custom)
+
+    expected = [calculate_text_complexity_universal(text, 7, True, "improved") for text in TEXTS]
+    assert [calculate_text_complexity_universal(text, 7, True, "custom") for text in TEXTS] == expected
+    assert calculate_text_complexity_universal_batch(TEXTS, 7, True, "custom") == expected
+    assert estimate_text_complexity_universal(TEXTS[1], 7, True, "custom")["complexity"] == expected[1]
+    assert get_complexity_breakdown_universal(TEXTS[1], 7, True, custom) == get_complexity_breakdown_universal(TEXTS[1], 7, True, False)
+    assert custom.cache_key(7, True) == ("custom", "custom-1", 7, True)
+
+    preview = DraftPreview(7, True, "custom")
+    assert preview.update(TEXTS[1]) == expected[1]
+    assert preview.word_count == 10
+
+
+def test_preview_model_is_declared_not_taken_from_batch_options():
+    children = get_algorithm("children")
+    custom = Algorithm(
+        "children-custom",
+        label="Custom",
+        version="children-custom-1",
+        score=children.entry_points["score"],
+        reference=children.entry_points["reference"],
+        breakdown=children.entry_points["breakdown"],
+        batch=children.entry_points["batch"],
+        options=children.options,
+    )
+    preview = DraftPreview(8, True, custom)
+    preview.update(TEXTS[1])
+    assert preview.update(TEXTS[1] + " Ура!") == calculate_text_complexity_universal(TEXTS[1] + " Ура!", 8, True, "children")
+    # Without a preview model the whole draft is rescored
+    assert preview.changed_words == preview.word_count == 11
+    assert DraftPreview(8, True, "children").update(TEXTS[1]) == calculate_text_complexity_universal(TEXTS[1])
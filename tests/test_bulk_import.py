@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from src.domain.complexity import calculate_text_complexity_universal
+from src.services import metrics
+from src.services.bulk_import import import_texts, parse_import
+
+
+def test_parse_import_reads_txt_csv_and_json():
+    assert parse_import("Мама мыла раму\n\n  Кот спит \n".encode(), "list.TXT") == ["Мама мыла раму", "  Кот спит "]
+    assert parse_import("Мама мыла раму\n".encode("cp1251"), "list.txt") == ["Мама мыла раму"]
+
+    assert parse_import('id,text\n1,"Мама, папа"\n2,Кот спит\n,\n', "list.csv") == ["Мама, папа", "Кот спит"]
+    assert parse_import("Мама мыла раму;x\nКот спит\n", "list.csv") == ["Мама мыла раму;x", "Кот спит"]
+
+    data = ["Мама мыла раму", {"text": "Кот спит"}, {"phrase": "Пёс лает"}, {"other": 1}, 5]
+    assert parse_import(json.dumps(data, ensure_ascii=False), "list.json") == ["Мама мыла раму", "Кот спит", "Пёс лает", None, 5]
+
+    for content, filename in (("{", "list.json"), ('{"text": "a"}', "list.json"), ("a", "list.docx")):
+        with pytest.raises(ValueError):
+            parse_import(content, filename)
+
+
+def test_import_texts_dedupes_scores_in_batch_and_saves_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    phrases = [{"text": "Мама мыла раму", "is_read": True, "read_date": "2025-01-01T00:00:00", "complexity": 10}]
+    entries = ["Мама мыла раму ", "Кот спит", "Кот спит", "Пёс лает на луну", "", " — ", None, 5]
+
+    saves = metrics.SAVES.value()
+    report = import_texts(phrases, entries, age=6, include_cognitive_load=False, algorithm="improved")
+
+    assert report == {"added": 2, "duplicates": 2, "rejected": 4}
+    assert metrics.SAVES.value() == saves + 1
+    assert [phrase["text"] for phrase in phrases] == ["Мама мыла раму", "Кот спит", "Пёс лает на луну"]
+    for phrase in phrases[1:]:
+        assert phrase["complexity"] == calculate_text_complexity_universal(phrase["text"], 6, False, False)
+        assert phrase["is_read"] is False
+
+    with open("phrases.json", encoding="utf-8") as f:
+        assert [phrase["text"] for phrase in json.load(f)] == [phrase["text"] for phrase in phrases]
+
+    assert import_texts(phrases, ["Кот спит"]) == {"added": 0, "duplicates": 1, "rejected": 0}
+    assert metrics.SAVES.value() == saves + 1
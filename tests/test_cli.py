@@ -0,0 +1,79 @@
+import io
+import json
+
+import pytest
+
+from src.cli import main
+from src.domain.complexity import calculate_text_complexity_universal
+from src.syllable_processor import process_text
+
+TEXTS = ["Мама мыла раму.", "Кот спит на окне.", "Пёс лает на луну.", "Дети идут в школу."]
+
+
+def _run(argv):
+    out = io.StringIO()
+    status = main(argv, stdout=out)
+    return status, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_plain_text_scores_for_all_ages_with_levels(tmp_path):
+    path = tmp_path / "texts.txt"
+    path.write_text("\n".join(TEXTS[:2]) + "\n\n", encoding="utf-8")
+
+    status, records = _run([str(path), "--all-ages", "--algorithm", "improved", "--levels", "--hyphenation", "--workers", "1"])
+    assert status == 0
+    assert [record["text"] for record in records] == TEXTS[:2]
+    for record in records:
+        assert record["complexity"] == {
+            str(age): calculate_text_complexity_universal(record["text"], age, True, False) for age in range(6, 12)
+        }
+        levels = process_text(record["text"])
+        assert record["levels"] == {str(level): value for level, value in levels.items()}
+        assert record["hyphenation"] == levels[2]["words"]
+
+
+def test_jsonl_passes_fields_through_and_reports_broken_lines(tmp_path):
+    path = tmp_path / "lib.jsonl"
+    path.write_text('{"id": 1, "text": "Кот спит"}\nnot json\n{"id": 2}\n', encoding="utf-8")
+
+    status, records = _run([str(path), "--age", "6", "--no-cognitive-load", "--workers", "1"])
+    assert status == 1
+    assert records == [{"id": 1, "text": "Кот спит", "complexity": calculate_text_complexity_universal("Кот спит", 6, False, True)}]
+
+
+def test_process_pool_keeps_input_order(tmp_path):
+    path = tmp_path / "lib.jsonl"
+    texts = [f"{TEXTS[i % 4]} Номер {i}." for i in range(30)]
+    path.write_text(
+        "".join(json.dumps({"i": i, "text": text}, ensure_ascii=False) + "\n" for i, text in enumerate(texts)), encoding="utf-8"
+    )
+
+    status, records = _run([str(path), "--workers", "2", "--chunk-size", "4"])
+    assert status == 0
+    assert [record["i"] for record in records] == list(range(30))
+    assert [record["complexity"] for record in records] == [calculate_text_complexity_universal(text) for text in texts]
+
+
+@pytest.mark.parametrize("option", ["--workers", "--chunk-size"])
+@pytest.mark.parametrize("value", ["0", "-1", "x"])
+def test_workers_and_chunk_size_must_be_positive(option, value, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main(["-", option, value], stdout=io.StringIO())
+    assert exc_info.value.code == 2
+    assert option in capsys.readouterr().err
+
+
+def test_ingest_adds_book_passages_to_the_collection(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "phrases.json").write_text(
+        json.dumps([{"text": "Кот спит на окне.", "is_read": False}], ensure_ascii=False), encoding="utf-8"
+    )
+    (tmp_path / "book.txt").write_text("Кот спит на окне. Мама мыла раму.\n\nПёс лает на луну. Дети идут в школу.\n", encoding="utf-8")
+
+    out = io.StringIO()
+    assert main(["ingest", "book.txt", "--max-words", "4", "--age", "7"], stdout=out) == 0
+    assert json.loads(out.getvalue()) == {"passages": 4, "added": 3, "duplicates": 1, "rejected": 0}
+    saved = json.loads((tmp_path / "phrases.json").read_text(encoding="utf-8"))
+    assert [phrase["text"] for phrase in saved] == ["Кот спит на окне.", "Мама мыла раму.", "Пёс лает на луну.", "Дети идут в школу."]
+
+    assert main(["ingest", "book.epub"], stdout=io.StringIO()) == 1
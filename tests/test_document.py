@@ -0,0 +1,71 @@
+from src.domain import document as document_module
+from src.domain.complexity import calculate_text_complexity_universal, get_complexity_breakdown_universal
+from src.domain.document import Document, analyze_text, clear_document_cache
+from src.syllable_processor import compact_process_text, process_text
+from src.text_complexity_improved import calculate_cognitive_load
+
+TEXT = """Сегодня хорошая погода.
+Я люблю кушать «мороженое»!
+Мы дружная семья..."""
+
+
+def test_document_levels_match_process_text():
+    assert analyze_text(TEXT).levels() == process_text(TEXT)
+
+
+def test_analyze_text_is_cached_by_content():
+    document = analyze_text(TEXT)
+    assert analyze_text(TEXT) is document
+    assert analyze_text(document) is document
+    assert analyze_text(TEXT + " ") is not document
+
+
+def test_scorers_accept_document():
+    document = Document(TEXT)
+    assert calculate_cognitive_load(document, 6) == calculate_cognitive_load(TEXT, 6)
+    for algorithm in ("children", "improved"):
+        for age in (6, 8, 11):
+            assert calculate_text_complexity_universal(document, age=age, algorithm=algorithm) == (
+                calculate_text_complexity_universal(TEXT, age=age, algorithm=algorithm)
+            )
+        breakdown = get_complexity_breakdown_universal(document, age=7, algorithm=algorithm)
+        assert breakdown["words"] == len(TEXT.split())
+        assert breakdown["text"] == TEXT
+
+
+def test_punctuation_only_tokens_are_not_words():
+    with_dash = "Кошка — это зверь."
+    without_dash = "Кошка это зверь."
+    assert analyze_text(with_dash).word_count == 3
+    assert calculate_cognitive_load(with_dash, 6) == calculate_cognitive_load(without_dash, 6)
+    for algorithm in ("children", "improved"):
+        assert calculate_text_complexity_universal(with_dash, age=6, algorithm=algorithm) == (
+            calculate_text_complexity_universal(without_dash, age=6, algorithm=algorithm)
+        )
+
+
+def test_compact_levels_match_compact_process_text():
+    for text in (TEXT, "«Ура!» — крикнул он… “Ёлка” – это", "Жил-был кот. Семья, вьюга, мяч!", "", "..."):
+        expected = compact_process_text(text)
+        compact = analyze_text(text).compact_levels()
+        for level in (1, 2, 3):
+            assert compact.count(level) == expected.count(level)
+            assert [compact.item(level, i) for i in range(compact.count(level))] == [
+                expected.item(level, i) for i in range(expected.count(level))
+            ]
+
+
+def test_document_cache_is_bounded_by_characters(monkeypatch):
+    monkeypatch.setattr(document_module, "DOCUMENT_CACHE_CHARS", 40)
+    clear_document_cache()
+    try:
+        first = analyze_text("Кошка спит на тёплом окне.")  # 26 characters
+        assert analyze_text("Кошка спит на тёплом окне.") is first
+        analyze_text("Пёс лает на луну.")  # 17 more: the oldest document is evicted
+        assert analyze_text("Кошка спит на тёплом окне.") is not first
+
+        book = "Мама мыла раму. " * 10
+        assert analyze_text(book) is not analyze_text(book)
+        assert document_module._cache_chars <= 40
+    finally:
+        clear_document_cache()
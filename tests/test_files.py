@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.domain.complexity import calculate_text_complexity_universal
+from src.services.files import StorageError, load_phrases, save_phrases
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_core_imports_without_streamlit_or_numpy():
+    modules = ["src.services.files", "src.services.bulk_import", "src.services.ingest", "src.cli", "src.server"]
+    probe = f"import sys; import {', '.join(modules)}; print(sorted({{'streamlit', 'numpy'}} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_load_and_save_take_settings_and_raise_storage_errors(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(StorageError, match="не найден"):
+        load_phrases()
+
+    with open("phrases.json", "w", encoding="utf-8") as f:
+        json.dump([{"phrase": "Мама мыла раму", "is_read": "true"}, {"text": "Кот спит"}], f, ensure_ascii=False)
+    phrases = load_phrases(age=6, include_cognitive_load=False, algorithm="improved")
+    assert [phrase["is_read"] for phrase in phrases] == [True, False]
+    assert [phrase["complexity"] for phrase in phrases] == [
+        calculate_text_complexity_universal(phrase["text"], 6, False, False) for phrase in phrases
+    ]
+
+    save_phrases(phrases)
+    with open("phrases.json", encoding="utf-8") as f:
+        assert "complexity" not in json.load(f)[0]
+
+    with open("phrases.json", "w", encoding="utf-8") as f:
+        f.write("[{")
+    with pytest.raises(StorageError, match="Ошибка чтения"):
+        load_phrases()
+    os.remove("phrases.json")
+    os.mkdir("phrases.json")
+    with pytest.raises(StorageError, match="Ошибка сохранения"):
+        save_phrases(phrases)
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from src.domain.complexity import calculate_text_complexity_universal
+from src.services import ingest
+from src.services.ingest import ingest_book, iter_paragraphs, paragraph_passages, split_sentences
+
+FB2 = """<?xml version="1.0" encoding="windows-1251"?>
+<FictionBook xmlns="http://www.gribuser.ru/xml/fictionbook/2.0">
+  <description><title-info><annotation><p>Аннотация не нужна.</p></annotation></title-info></description>
+  <body>
+    <title><p>Глава первая</p></title>
+    <section>
+      <p>Жил-был <emphasis>кот</emphasis>. Кот любил молоко!</p>
+      <poem><stanza><v>Мышка бежала,</v><v>хвостиком махнула.</v></stanza></poem>
+    </section>
+  </body>
+  <body name="notes"><section><p>Сноска к тексту.</p></section></body>
+  <binary id="cover.jpg" content-type="image/jpeg">AAAA</binary>
+</FictionBook>
+"""
+
+
+def test_sentences_and_passages():
+    assert split_sentences("«Привет!» Сказал он. — Пойдём?! Да… Конец") == ["«Привет!»", "Сказал он.", "— Пойдём?!", "Да…", "Конец"]
+    passages, dropped = paragraph_passages("Раз. Два три четыре. Пять шесть семь восемь девять десять. Один.", 3, 6)
+    assert passages == ["Раз. Два три четыре.", "Пять шесть семь восемь девять десять."]
+    assert dropped == 1
+
+
+def test_iter_paragraphs_streams_fb2_and_text(tmp_path):
+    fb2 = tmp_path / "book.fb2"
+    fb2.write_bytes(FB2.encode("cp1251"))
+    assert list(iter_paragraphs(str(fb2))) == ["Глава первая", "Жил-был кот. Кот любил молоко!", "Мышка бежала, хвостиком махнула."]
+
+    txt = tmp_path / "book.txt"
+    txt.write_bytes("Первая строка\nпродолжение абзаца.\n\n\nВторой абзац.\n".encode("cp1251"))
+    assert list(iter_paragraphs(str(txt))) == ["Первая строка продолжение абзаца.", "Второй абзац."]
+
+    with pytest.raises(ValueError):
+        iter_paragraphs(str(tmp_path / "book.epub"))
+
+
+def _book(path, paragraphs):
+    sentences = ["Кот спит на окне.", "Мама мыла раму.", "Пёс лает на луну.", "Дети идут в школу.", "Солнце светит ярко."]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(paragraphs):
+            f.write(f"{sentences[i % 5]} Это абзац номер {i}.\n\n")
+
+
+def test_ingest_resumes_from_checkpoint_after_interruption(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _book("book.txt", 300)
+    expected: list[dict] = []
+    assert ingest_book("book.txt", expected, min_words=3, max_words=6, chunk_size=50) == {
+        "passages": 600,
+        "added": 305,
+        "duplicates": 295,
+        "rejected": 0,
+    }
+    assert not os.path.exists("book.txt.ingest.json")
+
+    append_texts = ingest.append_texts
+    calls = []
+
+    def failing_append(phrases_data, texts, scores):
+        calls.append(len(texts))
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        append_texts(phrases_data, texts, scores)
+
+    phrases: list[dict] = []
+    monkeypatch.setattr(ingest, "append_texts", failing_append)
+    with pytest.raises(KeyboardInterrupt):
+        ingest_book("book.txt", phrases, min_words=3, max_words=6, chunk_size=50)
+    assert os.path.exists("book.txt.ingest.json")
+
+    monkeypatch.setattr(ingest, "append_texts", append_texts)
+    report = ingest_book("book.txt", phrases, min_words=3, max_words=6, chunk_size=50)
+    assert report["passages"] == 600
+    assert [phrase["text"] for phrase in phrases] == [phrase["text"] for phrase in expected]
+    assert not os.path.exists("book.txt.ingest.json")
+
+
+def test_ingest_scores_in_parallel_and_applies_the_complexity_window(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _book("book.txt", 40)
+    phrases = [{"text": "Кот спит на окне.", "is_read": False, "read_date": None, "complexity": 0}]
+
+    report = ingest_book("book.txt", phrases, age=7, min_words=1, max_words=20, max_complexity=40, workers=2, chunk_size=16)
+    assert report["passages"] == 40
+    assert report["duplicates"] == 0
+    assert report["added"] + report["rejected"] == 40
+    for phrase in phrases[1:]:
+        assert phrase["complexity"] == calculate_text_complexity_universal(phrase["text"], age=7)
+        assert phrase["complexity"] <= 40
+
+
+def test_repeats_of_passages_outside_the_complexity_window_are_rejected(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _book("book.txt", 20)
+    phrases: list[dict] = []
+
+    # The first sentence of every paragraph repeats every 5 paragraphs, within one chunk and across chunks
+    report = ingest_book("book.txt", phrases, min_words=1, max_words=4, max_complexity=-1, chunk_size=12)
+    assert report == {"passages": 40, "added": 0, "duplicates": 0, "rejected": 40}
+    assert phrases == []
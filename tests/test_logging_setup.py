@@ -0,0 +1,64 @@
+import json
+import logging
+import logging.handlers
+
+from src.services import logging_setup
+
+
+def _record(msg, level=logging.INFO, name="src.services.files"):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def test_rate_limit_filter_samples_repeated_templates():
+    rate_filter = logging_setup.RateLimitFilter(burst=2, window=60)
+
+    passed = [rate_filter.filter(_record("Loaded %d phrases", level=logging.DEBUG)) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    passed = [rate_filter.filter(_record("Displaying %d phrases", name="__main__")) for _ in range(3)]
+    assert passed == [True, True, False]
+
+    # Other templates, warnings and INFO records outside RERUN_MESSAGES are not affected
+    assert rate_filter.filter(_record("Saved %d phrases", level=logging.DEBUG))
+    assert rate_filter.filter(_record("Loaded %d phrases", level=logging.WARNING))
+    assert all(rate_filter.filter(_record("Successfully saved %d phrases to %s")) for _ in range(5))
+
+
+def test_rate_limit_filter_reports_suppressed_after_window():
+    rate_filter = logging_setup.RateLimitFilter(burst=1, window=0)
+    rate_filter.filter(_record("tick", level=logging.DEBUG))
+    rate_filter._windows[("src.services.files", "tick")][2] = 3
+
+    record = _record("tick", level=logging.DEBUG)
+    assert rate_filter.filter(record)
+    assert record.getMessage() == "tick [3 similar messages suppressed]"
+
+
+def test_level_from_environment_then_config(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"log_level": "warning"}), encoding="utf-8")
+
+    monkeypatch.delenv(logging_setup.LOG_LEVEL_ENV, raising=False)
+    assert logging_setup.resolve_level(str(config_path)) == logging.WARNING
+    assert logging_setup.resolve_level(str(tmp_path / "missing.json")) == logging.INFO
+
+    monkeypatch.setenv(logging_setup.LOG_LEVEL_ENV, "DEBUG")
+    assert logging_setup.resolve_level(str(config_path)) == logging.DEBUG
+
+
+def test_configure_logging_is_idempotent(tmp_path):
+    root = logging.getLogger()
+    old_level = root.level
+    log_file = tmp_path / "app.log"
+    try:
+        logging_setup.configure_logging(logging.INFO, log_file=str(log_file))
+        logging_setup.configure_logging(logging.INFO, log_file=str(log_file))
+        queue_handlers = [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]
+        assert len(queue_handlers) == 1
+
+        logging.getLogger("tests.logging").warning("written by the listener thread")
+    finally:
+        logging_setup.shutdown_logging()
+        root.setLevel(old_level)
+
+    assert "written by the listener thread" in log_file.read_text(encoding="utf-8")
+    assert not any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers)
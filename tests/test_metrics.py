@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+from src.domain.document import analyze_text, clear_document_cache
+from src.services import metrics
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def test_render_prometheus_text():
+    registry = metrics.Registry()
+    requests = registry.counter("demo_requests", "Demo requests", labelnames=("cache",))
+    latency = registry.histogram("demo_seconds", "Demo latency", buckets=(0.1, 1.0))
+
+    requests.inc(cache="document")
+    requests.inc(2, cache="document")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = registry.render()
+    assert "# TYPE demo_requests_total counter" in text
+    assert 'demo_requests_total{cache="document"} 3' in text
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in text
+    assert "demo_seconds_count 3" in text
+
+
+def test_textfile_is_replaced_atomically(tmp_path):
+    registry = metrics.Registry()
+    registry.counter("demo_saves", "Demo saves").inc()
+    path = tmp_path / "app.prom"
+
+    registry.write_textfile(str(path))
+
+    assert "demo_saves_total 1" in path.read_text(encoding="utf-8")
+    assert [p.name for p in tmp_path.iterdir()] == ["app.prom"]
+
+
+def test_document_cache_hits_and_misses_are_counted():
+    clear_document_cache()
+    hits = metrics.CACHE_HITS.value(cache="document")
+    misses = metrics.CACHE_MISSES.value(cache="document")
+    analyses = metrics.SYLLABIFICATION_SECONDS.count
+
+    analyze_text("мама мыла раму")
+    analyze_text("мама мыла раму")
+
+    assert metrics.CACHE_MISSES.value(cache="document") == misses + 1
+    assert metrics.CACHE_HITS.value(cache="document") == hits + 1
+    assert metrics.SYLLABIFICATION_SECONDS.count == analyses + 1
+
+
+def test_domain_layer_does_not_import_services():
+    code = "import sys, src.domain.complexity, src.text_complexity_fast; print(sorted(m for m in sys.modules if 'services' in m))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,51 @@
+import json
+
+from src.services import perf
+
+
+def test_spans_are_collected_per_rerun():
+    perf.reset()
+    perf.set_enabled(True)
+    try:
+        for _ in range(3):
+            perf.begin_rerun()
+            with perf.span("save_phrases"):
+                pass
+            with perf.span("save_phrases"):
+                pass
+            perf.end_rerun()
+    finally:
+        perf.set_enabled(False)
+
+    summary = perf.summary()
+    assert summary["reruns"] == 3
+    assert summary["spans"]["save_phrases"]["calls"] == 6
+    assert summary["spans"]["rerun"]["calls"] == 3
+    assert json.loads(perf.export_json())["summary"]["reruns"] == 3
+
+
+def test_disabled_spans_record_nothing():
+    perf.reset()
+    perf.begin_rerun()
+    with perf.span("load_phrases"):
+        pass
+    perf.end_rerun()
+    assert perf.summary() == {"reruns": 0, "spans": {}}
+
+
+def test_forced_rerun_is_timed_without_enabling_the_process():
+    perf.reset()
+    perf.begin_rerun(force=True)
+    assert perf.is_enabled()
+    with perf.span("load_phrases"):
+        pass
+    perf.end_rerun()
+    assert not perf.is_enabled()
+
+    perf.begin_rerun()
+    with perf.span("load_phrases"):
+        pass
+    perf.end_rerun()
+    summary = perf.summary()
+    assert summary["reruns"] == 1
+    assert summary["spans"]["load_phrases"]["calls"] == 1
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from src.domain.complexity import calculate_text_complexity_universal
+from src.domain.document import Document
+from src.services.preview import RESEED_EVERY, DraftPreview
+
+CHARACTERS = "аоуыэяёюиебвгджзклмнпрстфхцчшщьъ МК—,.!?\n-«»"
+
+
+@pytest.mark.parametrize("use_children_algorithm", [True, False])
+@pytest.mark.parametrize("include_cognitive_load", [True, False])
+@pytest.mark.parametrize("age", [6, 8, 10])
+def test_preview_matches_full_rescoring_after_every_edit(age, include_cognitive_load, use_children_algorithm):
+    rng = random.Random(age)
+    preview = DraftPreview(age, include_cognitive_load, use_children_algorithm)
+    text = ""
+    # Enough edits to pass a reseed of the float totals
+    for _ in range(RESEED_EVERY + 50):
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.choice([0, 0, 1, 2, 6]))
+        text = text[:start] + "".join(rng.choice(CHARACTERS) for _ in range(rng.choice([0, 1, 1, 3, 8]))) + text[end:]
+
+        score = preview.update(text)
+        assert score == calculate_text_complexity_universal(text, age, include_cognitive_load, use_children_algorithm)
+        assert preview.word_count == Document(text).word_count
+
+
+def test_preview_rescores_only_the_changed_words():
+    text = " ".join(["Мама мыла раму, а кошка спала на окне."] * 200)
+    preview = DraftPreview()
+    preview.update(text)
+    assert preview.changed_words == preview.word_count == 1600
+
+    position = text.index(" на ", 500) + len(" на ")
+    edited = text[:position] + "тёплом " + text[position:]
+    assert preview.update(edited) == calculate_text_complexity_universal(edited)
+    assert preview.word_count == 1601
+    assert preview.changed_words <= 2
+
+    assert preview.update("") == 0
+    assert preview.word_count == 0
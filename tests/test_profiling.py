@@ -0,0 +1,36 @@
+import os
+import pstats
+
+from src.services import profiling
+
+
+def test_forced_rerun_writes_pstats_and_allocations(tmp_path, monkeypatch):
+    monkeypatch.setenv(profiling.PROFILE_ENV, "1")
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(profiling.TRACEMALLOC_ENV, "1")
+
+    assert profiling.run(lambda: sum(range(1000)), force=True) == 499500
+
+    names = os.listdir(tmp_path)
+    pstats_files = [name for name in names if name.endswith(".pstats")]
+    assert len(pstats_files) == 1
+    assert any(name.endswith("-alloc.txt") for name in names)
+    pstats.Stats(str(tmp_path / pstats_files[0]))
+
+
+def test_sampling_and_rotation(tmp_path, monkeypatch):
+    monkeypatch.delenv(profiling.PROFILE_ENV, raising=False)
+    assert not profiling.is_enabled()
+    assert not profiling.should_profile()
+    assert not profiling.should_profile(force=True)
+
+    monkeypatch.setenv(profiling.PROFILE_ENV, "1")
+    monkeypatch.setenv(profiling.PROFILE_EVERY_ENV, "3")
+    assert sum(profiling.should_profile() for _ in range(9)) == 3
+
+    for i in range(5):
+        path = tmp_path / f"rerun-{i}.pstats"
+        path.write_text("")
+        os.utime(path, (i, i))
+    profiling.rotate(str(tmp_path), keep=2)
+    assert sorted(os.listdir(tmp_path)) == ["rerun-3.pstats", "rerun-4.pstats"]
@@ -0,0 +1,45 @@
+from src.domain.document import analyze_text
+from src.services.reading import advance, current_word, level_progress, level_word_count, new_reading_state
+from src.syllable_processor import process_text
+
+
+def _read_all(state):
+    seen = {1: [], 2: [], 3: []}
+    while True:
+        level = state["current_level"]
+        word = current_word(state)
+        if word is None:
+            break
+        seen[level].append(word)
+        if advance(state):
+            if level == 3:
+                break
+            state["current_level"] += 1
+    return seen
+
+
+def test_lazy_and_compact_states_read_the_same_items():
+    text = "Мама мыла раму. Папа читает книгу, а кошка пьёт молоко — «ура»!"
+    expected = process_text(text)
+
+    compact = new_reading_state(text, lazy=False)
+    lazy = new_reading_state(text, lazy=True)
+    assert "words" not in compact["levels"][1]
+    assert "words" not in lazy["levels"][1]
+
+    for state in (compact, lazy):
+        seen = _read_all(state)
+        for level in (1, 2, 3):
+            assert seen[level] == expected[level]["words"]
+            assert level_word_count(state, level) == len(expected[level]["words"])
+        assert level_progress(state) == 1.0
+
+    assert lazy["stats"]["total_words"] == compact["stats"]["total_words"]
+
+
+def test_compact_state_reuses_the_scored_document():
+    text = "Кошка пьёт молоко, а пёс спит."
+    document = analyze_text(text)
+    state = new_reading_state(text, lazy=False)
+    assert analyze_text(text) is document
+    assert state["compact"].text == " ".join("".join(sylls) for sylls in document.clean_syllables)
@@ -0,0 +1,42 @@
+import threading
+
+from src.domain import document
+from src.domain.complexity import calculate_text_complexity_universal
+from src.domain.document import Document, document_hash
+from src.services import refine
+from src.services.refine import cancel_refinements, refine_in_background, refined_complexity
+
+TEXT = "Мама мыла раму, а кошка спала на окне."
+
+
+def test_finished_job_is_collected_once():
+    refine_in_background(TEXT, 8, True, "children").result(timeout=10)
+    assert refined_complexity(TEXT, 8, True, "children") == calculate_text_complexity_universal(TEXT, 8, True, "children")
+    assert refined_complexity(TEXT, 8, True, "children") is None
+
+
+def test_jobs_are_bounded_and_cancelled(monkeypatch):
+    monkeypatch.setattr(refine, "MAX_JOBS", 3)
+    release = threading.Event()
+    # Keep the single worker busy so that the jobs below stay queued
+    refine._executor.submit(release.wait)
+    try:
+        texts = [f"{TEXT} {i}" for i in range(5)]
+        jobs = [refine_in_background(text, 8, True, "improved") for text in texts]
+        assert len(refine._jobs) == 3
+        assert all(job.cancelled() for job in jobs[:2])
+
+        assert cancel_refinements(texts[2:4]) == 2
+        assert jobs[2].cancelled() and jobs[3].cancelled()
+        assert [key[0] for key in refine._jobs] == [texts[4]]
+    finally:
+        release.set()
+    jobs[4].result(timeout=10)
+    assert refined_complexity(texts[4], 8, True, "improved") == calculate_text_complexity_universal(texts[4], 8, True, "improved")
+
+
+def test_refined_texts_are_not_kept_in_the_document_cache():
+    text = f"{TEXT} Книга целиком."
+    refine_in_background(text, 8, True, "children").result(timeout=10)
+    assert document_hash(text) not in document._cache
+    assert refined_complexity(text, 8, True, "children") == calculate_text_complexity_universal(Document(text), 8, True, "children")
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+from src.domain.complexity import calculate_text_complexity_universal, get_complexity_breakdown_universal
+from src.server import MAX_TEXTS, ScoringServer
+from src.services.metrics import HTTP_REQUESTS
+from src.syllable_processor import process_text
+
+TEXTS = ["Мама мыла раму.", "Кот спит на окне.", "Пёс лает на луну.", "Дети идут в школу."]
+
+
+async def _request(port, method, path, payload=None, raw=None, length=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = raw if raw is not None else json.dumps(payload).encode() if payload is not None else b""
+    length = len(body) if length is None else length
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\nContent-Length: {length}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, json.loads(content) if head.find(b"application/json") >= 0 else content.decode()
+
+
+def _serve(scenario, **options):
+    async def run():
+        server = ScoringServer(port=0, **options)
+        port = await server.start()
+        try:
+            return await scenario(server, port)
+        finally:
+            await server.stop()
+
+    return asyncio.run(run())
+
+
+def test_endpoints_match_the_domain_layer():
+    async def scenario(server, port):
+        text = "Жил-был кот. Кот любил молоко!"
+        status, body = await _request(port, "POST", "/syllabify", {"text": text})
+        assert status == 200
+        assert [word["word"] for word in body["words"]] == ["Жил-был", "кот", "Кот", "любил", "молоко"]
+        assert body["words"][4]["syllables"] == ["мо", "ло", "ко"]
+
+        assert await _request(port, "POST", "/process", {"text": text}) == (
+            200,
+            {str(level): value for level, value in process_text(text).items()},
+        )
+        status, body = await _request(port, "POST", "/breakdown", {"text": text, "age": 6, "algorithm": "improved"})
+        assert body["total_complexity"] == get_complexity_breakdown_universal(text, 6, True, False)["total_complexity"]
+
+        status, body = await _request(port, "POST", "/score", {"texts": TEXTS, "age": 7, "include_cognitive_load": False})
+        assert body == {"complexities": [calculate_text_complexity_universal(t, 7, False, True) for t in TEXTS]}
+        assert (await _request(port, "GET", "/health"))[0] == 200
+        status, metrics = await _request(port, "GET", "/metrics")
+        assert "learn_to_read_http_batch_texts" in metrics
+
+    _serve(scenario)
+
+
+def test_concurrent_requests_are_scored_in_micro_batches():
+    async def scenario(server, port):
+        texts = [f"{TEXTS[i % 4]} Номер {i}." for i in range(40)]
+        results = await asyncio.gather(*(_request(port, "POST", "/score", {"text": text}) for text in texts))
+        assert [body["complexity"] for _status, body in results] == [calculate_text_complexity_universal(t) for t in texts]
+        return server.batcher.batches
+
+    assert _serve(scenario, max_delay=0.05) < 40
+
+
+def test_limits_and_errors():
+    async def scenario(server, port):
+        assert (await _request(port, "POST", "/score", raw=b'{"text": "' + b"a" * 20000 + b'"}'))[0] == 413
+        assert (await _request(port, "POST", "/score", {"texts": ["a"] * (MAX_TEXTS + 1)}))[0] == 413
+        assert (await _request(port, "POST", "/score", raw=b"{"))[0] == 400
+        assert await _request(port, "POST", "/score", raw=b"", length=-5) == (400, {"error": "invalid Content-Length"})
+        assert (await _request(port, "POST", "/score", raw=b"", length="abc"))[0] == 400
+        assert (await _request(port, "POST", "/score", {"text": "Кот", "age": 3}))[0] == 400
+        assert (await _request(port, "POST", "/process", {"texts": ["Кот"]}))[0] == 400
+        assert (await _request(port, "GET", "/score"))[0] == 405
+        other = HTTP_REQUESTS.value(endpoint="other", status="404")
+        assert (await _request(port, "POST", "/unknown", {}))[0] == 404
+        assert (await _request(port, "GET", "/unknown/2"))[0] == 404
+        assert HTTP_REQUESTS.value(endpoint="other", status="404") == other + 2
+        assert HTTP_REQUESTS.value(endpoint="/unknown", status="404") == 0
+
+    _serve(scenario, max_body_bytes=1024 * 16)
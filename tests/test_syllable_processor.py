@@ -1,4 +1,19 @@
-from src.syllable_processor import get_full_text_data, hyphenate_word_with_syllables, process_text, split_hyphenated_word_into_list
+import random
+
+from src.syllable_processor import (
+    SINGLE_SYLLABLE_WORDS,
+    compact_process_text,
+    get_full_text_data,
+    hyphenate_word_with_syllables,
+    iter_level_items,
+    iter_process_text,
+    process_text,
+    split_hyphenated_word_into_list,
+    split_syllables_hybrid,
+    split_syllables_text,
+    syllable_offsets,
+    tokenize,
+)
 
 
 def test_text1():
@@ -375,3 +390,66 @@ def test_split_hyphenated_word_into_list():
     hyphenated_word = ""
     expected_output = [""]
     assert split_hyphenated_word_into_list(hyphenated_word) == expected_output
+
+
+def test_iter_level_items_matches_process_text():
+    text = """Сегодня «хорошая» погода...
+    Я люблю кушать мороженое!
+    Мы дружная семья."""
+    expected = process_text(text)
+    for level in (1, 2, 3):
+        assert list(iter_level_items(text, level)) == expected[level]["words"]
+
+    assert [level for level, _ in iter_process_text(text)].count(1) == len(expected[1]["words"])
+
+
+def test_tokenize_handles_dashes_and_quotes():
+    text = "«Ура!» — крикнул он… “Ёлка” – это"
+    tokens = [(text[start:end], w3, clean) for start, end, w3, clean in tokenize(text)]
+    assert tokens == [
+        ("«Ура!»", "«Ура", "ура"),
+        ("—", "", ""),
+        ("крикнул", "крикнул", "крикнул"),
+        ("он…", "он", "он"),
+        ("“Ёлка”", "“Ёлка", "ёлка"),
+        ("–", "", ""),
+        ("это", "это", "это"),
+    ]
+
+    result = process_text(text)
+    assert result[2]["words"] == ["у-ра", "крик-нул", "он", "ёл-ка", "э-то"]
+    assert result[3]["words"][:-1] == ["«Ура", "крикнул", "он", "“Ёлка", "это"]
+
+
+def test_split_syllables_text_matches_hybrid_on_known_words():
+    texts = (
+        "Мама мыла раму. Саша ест кашу. На реке рыбаки.",
+        "Сегодня хорошая погода. Я люблю кушать мороженое. Мы дружная семья.",
+        "На улице дети играют. Даниил играет в мяч. Наоми едет на велосипеде. Все веселятся и смеются.",
+        "Подъезд, судьи, вьюга, объявление, кто-то, ШКОЛЬНИК",
+    )
+    words = [clean for text in texts for _start, _end, _w3, clean in tokenize(text) if clean]
+    words += sorted(SINGLE_SYLLABLE_WORDS) + ["", "ь", "аа", "брр"]
+    assert split_syllables_text(words) == [split_syllables_hybrid(word) for word in words]
+
+
+def test_split_syllables_text_matches_hybrid_on_random_corpus():
+    rng = random.Random(2024)
+    alphabet = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя" + "АОЬЪЁ" + "-'.1z"
+    words = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14))) for _ in range(20000)]
+    assert split_syllables_text(words) == [split_syllables_hybrid(word) for word in words]
+
+
+def test_syllable_offsets_layout():
+    text, word_starts, syllable_starts = syllable_offsets(["Мама", "семья"])
+    assert text == "мама семья"
+    assert list(word_starts) == [0, 5, 11]
+    assert list(syllable_starts) == [0, 2, 5, 9, 11]
+
+
+def test_compact_process_text_matches_process_text():
+    for text in ("Мама мыла раму.", "«Ура!» — крикнул он… “Ёлка” – это", "Мы дружная семья.\n  Папа любит маму.", "", "..."):
+        expected = process_text(text)
+        compact = compact_process_text(text)
+        for level in (1, 2, 3):
+            assert [compact.item(level, i) for i in range(compact.count(level))] == expected[level]["words"]
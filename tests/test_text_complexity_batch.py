@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from src import text_complexity_batch
+from src.domain import complexity
+from src.text_complexity_batch import calculate_text_complexity_batch
+from src.text_complexity_children_optimized import calculate_children_text_complexity_optimized
+from src.text_complexity_improved import calculate_text_complexity_improved
+
+PHRASES_PATH = os.path.join(os.path.dirname(__file__), "..", "phrases.json")
+
+
+def _library(random_texts):
+    with open(PHRASES_PATH, encoding="utf-8") as f:
+        return [phrase["text"] for phrase in json.load(f)] + random_texts(11, 150)
+
+
+def _assert_batch_matches_reference(texts):
+    for age in range(4, 14):
+        for include_cognitive_load in (False, True):
+            for children, reference in ((True, calculate_children_text_complexity_optimized), (False, calculate_text_complexity_improved)):
+                expected = [reference(text, age, include_cognitive_load) for text in texts]
+                assert calculate_text_complexity_batch(texts, age, include_cognitive_load, children) == expected, (children, age)
+
+
+def test_vectorized_batch_matches_reference(random_texts):
+    pytest.importorskip("numpy")
+    _assert_batch_matches_reference(_library(random_texts))
+
+
+def test_pure_python_fallback_matches_reference(monkeypatch, random_texts):
+    monkeypatch.setattr(text_complexity_batch, "np", None)
+    _assert_batch_matches_reference(_library(random_texts)[:60])
+
+
+def test_batch_handles_empty_input_and_empty_texts():
+    assert calculate_text_complexity_batch([]) == []
+    assert calculate_text_complexity_batch(["", "—", " "]) == [0, 0, 0]
+
+
+def test_universal_batch_follows_scoring_engine():
+    texts = ["Мама мыла раму.", "", "Щенок жыл в маленькой будке."]
+    original = complexity.get_scoring_engine()
+    try:
+        scores = {}
+        for engine in ("reference", "fast"):
+            complexity.set_scoring_engine(engine)
+            scores[engine] = complexity.calculate_text_complexity_universal_batch(texts, age=7)
+        assert scores["fast"] == scores["reference"] == [complexity.calculate_text_complexity_universal(text, age=7) for text in texts]
+    finally:
+        complexity.set_scoring_engine(original)
@@ -0,0 +1,57 @@
+import json
+import os
+import random
+
+import pytest
+
+from src.domain.complexity import calculate_text_complexity_universal, estimate_text_complexity_universal
+from src.domain.document import Document
+from src.services.refine import refine_in_background, refined_complexity
+from src.text_complexity_estimate import SAMPLE_CHUNK
+
+PHRASES_PATH = os.path.join(os.path.dirname(__file__), "..", "phrases.json")
+
+
+def _book(words_count, seed=0):
+    with open(PHRASES_PATH, encoding="utf-8") as f:
+        words = " ".join(phrase["text"] for phrase in json.load(f)).split()
+    rng = random.Random(seed)
+    return " ".join(rng.choice(words) for _ in range(words_count))
+
+
+def test_short_texts_are_scored_exactly():
+    text = _book(300)
+    estimate = estimate_text_complexity_universal(text, age=7)
+    exact = calculate_text_complexity_universal(text, age=7)
+    words = Document(text).word_count
+    assert estimate == {"complexity": exact, "low": exact, "high": exact, "exact": True, "sampled_words": words, "total_words": words}
+
+
+@pytest.mark.parametrize("use_children_algorithm", [True, False])
+@pytest.mark.parametrize("include_cognitive_load", [True, False])
+def test_long_texts_are_estimated_within_the_interval(include_cognitive_load, use_children_algorithm):
+    text = _book(12000, seed=1)
+    estimate = estimate_text_complexity_universal(text, 8, include_cognitive_load, use_children_algorithm, word_budget=1500)
+    exact = calculate_text_complexity_universal(text, 8, include_cognitive_load, use_children_algorithm)
+
+    assert not estimate["exact"]
+    assert estimate["sampled_words"] == 1500
+    assert estimate["total_words"] == Document(text).word_count
+    assert estimate["low"] <= exact <= estimate["high"]
+    assert abs(estimate["complexity"] - exact) <= 1
+
+
+def test_time_budget_stops_after_the_first_chunk():
+    estimate = estimate_text_complexity_universal(_book(5000), word_budget=4000, time_budget=0)
+    assert estimate["sampled_words"] == SAMPLE_CHUNK
+    assert estimate["low"] <= estimate["complexity"] <= estimate["high"]
+
+
+def test_background_refinement_delivers_the_exact_score_once():
+    text = _book(3000, seed=2)
+    job = refine_in_background(text, 9, True, False)
+    assert refine_in_background(text, 9, True, False) is job
+
+    assert job.result(timeout=60) == calculate_text_complexity_universal(text, 9, True, False)
+    assert refined_complexity(text, 9, True, False) == job.result()
+    assert refined_complexity(text, 9, True, False) is None
@@ -0,0 +1,126 @@
+import json
+import math
+import os
+
+import pytest
+
+from src import text_complexity_improved
+from src.domain import complexity
+from src.services import metrics
+from src.text_complexity_children_optimized import (
+    BIGRAM_COMPLEXITY_MATRIX,
+    RUSSIAN_ALPHABET,
+    calculate_children_text_complexity_optimized,
+    get_children_bigram_frequency,
+    word_bigram_complexities,
+)
+from src.text_complexity_fast import (
+    calculate_children_text_complexity_fast,
+    calculate_text_complexity_improved_fast,
+    clear_word_cache,
+    set_word_cache_size,
+    word_cache_info,
+)
+from src.text_complexity_improved import (
+    COGNITIVE_LOAD_TABLE_WORDS,
+    calculate_cognitive_load,
+    calculate_text_complexity_improved,
+    set_cognitive_load_table_words,
+)
+
+PHRASES_PATH = os.path.join(os.path.dirname(__file__), "..", "phrases.json")
+
+AGES = range(4, 14)
+
+ENGINES = (
+    (calculate_text_complexity_improved_fast, calculate_text_complexity_improved),
+    (calculate_children_text_complexity_fast, calculate_children_text_complexity_optimized),
+)
+
+
+def _assert_same_scores(text):
+    for age in AGES:
+        for include_cognitive_load in (False, True):
+            for fast, reference in ENGINES:
+                expected = reference(text, age, include_cognitive_load)
+                assert fast(text, age, include_cognitive_load) == expected, (fast.__name__, text, age, include_cognitive_load)
+
+
+def test_fast_engine_matches_reference_on_phrases():
+    with open(PHRASES_PATH, encoding="utf-8") as f:
+        for phrase in json.load(f):
+            _assert_same_scores(phrase["text"])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fast_engine_matches_reference_on_random_texts(seed, random_texts):
+    for text in random_texts(seed, 100):
+        _assert_same_scores(text)
+
+
+def test_universal_scoring_engine_is_switchable():
+    text = "Щенок жыл в маленькой будке, и это была радость."
+    original = complexity.get_scoring_engine()
+    try:
+        scores = {}
+        for engine in ("reference", "fast"):
+            complexity.set_scoring_engine(engine)
+            scores[engine] = [complexity.calculate_text_complexity_universal(text, 7, algorithm=a) for a in ("children", "improved")]
+        assert scores["fast"] == scores["reference"]
+        with pytest.raises(ValueError):
+            complexity.set_scoring_engine("turbo")
+    finally:
+        complexity.set_scoring_engine(original)
+
+
+def test_bigram_matrix_matches_frequency_formula():
+    frequency = get_children_bigram_frequency()
+    symbols = [*RUSSIAN_ALPHABET, "a", "1", "-", "'"]
+    word = "".join(first + second for first in symbols for second in symbols)
+    expected = [max(1, -math.log(frequency.get(word[i : i + 2], 0.01)) * 0.5) for i in range(len(word) - 1)]
+    assert word_bigram_complexities(word) == expected
+    assert len(BIGRAM_COMPLEXITY_MATRIX) == len(RUSSIAN_ALPHABET) + 1
+
+
+def test_word_cache_is_shared_bounded_and_observable():
+    texts = ["Мама мыла раму.", "мама и папа", "Папа мыла раму, а кот спал.", "İstanbul — город."]
+    hits_before = metrics.CACHE_HITS.value(cache="word")
+    original_size = word_cache_info()["maxsize"]
+    try:
+        for maxsize in (0, 3, 1000):
+            clear_word_cache()
+            set_word_cache_size(maxsize)
+            for _ in range(2):
+                for text in texts:
+                    _assert_same_scores(text)
+            info = word_cache_info()
+            assert info["size"] <= maxsize
+            if maxsize == 1000:
+                assert info["hits"] > info["misses"] > 0
+                assert 0.5 < info["hit_rate"] < 1
+        assert metrics.CACHE_HITS.value(cache="word") > hits_before
+    finally:
+        set_word_cache_size(original_size)
+
+
+def test_cognitive_load_table_matches_the_formula():
+    factors = {6: (1.8, 5), 7: (1.5, 7), 8: (1.0, 10), 9: (0.8, 12), 10: (0.7, 15), 11: (0.6, 18)}
+    try:
+        for table_words in (0, 50, COGNITIVE_LOAD_TABLE_WORDS):
+            set_cognitive_load_table_words(table_words)
+            for age in (4, 6, 7, 8, 9, 10, 11, 14):
+                factor, divisor = factors[min(max(age, 6), 11)]
+                for words in (*range(120), 1999, 2000, 2001, 10_000, 10**7):
+                    expected = min(50, math.log(1 + words / divisor) * factor * 10) if words else 0
+                    load = calculate_cognitive_load(words, age)
+                    assert load == expected and type(load) is type(expected), (table_words, age, words)
+    finally:
+        set_cognitive_load_table_words(COGNITIVE_LOAD_TABLE_WORDS)
+    assert calculate_cognitive_load("Мама мыла раму.", 6) == calculate_cognitive_load(3, 6)
+
+
+def test_cognitive_load_tables_are_shared_between_ages():
+    set_cognitive_load_table_words(COGNITIVE_LOAD_TABLE_WORDS)
+    for age in (-(10**6), 0, 3, 6, 8, 11, 12, 10**6):
+        calculate_cognitive_load(10, age)
+    assert len(text_complexity_improved._cognitive_load_tables) == 3
@@ -0,0 +1,38 @@
+import random
+
+from src.text_patterns import PatternMatcher, SuffixTrie
+
+
+def _naive_find_all(patterns, text):
+    return sorted((i, p) for p in set(patterns) for i in range(len(text)) if text.startswith(p, i))
+
+
+def test_pattern_matcher_finds_overlapping_patterns():
+    matcher = PatternMatcher(["he", "she", "his", "hers"])
+    assert sorted(matcher.find_all("ushers")) == [(1, "she"), (2, "he"), (2, "hers")]
+    assert matcher.matched("ushers") == {"she", "he", "hers"}
+    assert matcher.matched("xyz") == set()
+
+
+def test_pattern_matcher_matches_naive_search_on_random_inputs():
+    rng = random.Random(0)
+    alphabet = "абвжшыя"
+    for _ in range(200):
+        patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 30))]
+        text = "".join(rng.choice(alphabet + " ") for _ in range(rng.randint(0, 40)))
+        matcher = PatternMatcher(patterns)
+        assert sorted(matcher.find_all(text)) == _naive_find_all(patterns, text)
+        assert matcher.matched(text) == {p for p in patterns if p in text}
+
+
+def test_suffix_trie_matches_endswith():
+    rng = random.Random(1)
+    alphabet = "аеинцяь"
+    for _ in range(200):
+        suffixes = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 20))]
+        trie = SuffixTrie(suffixes)
+        for _ in range(20):
+            word = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+            assert trie.matches(word) == word.endswith(tuple(suffixes)), (suffixes, word)
+    assert SuffixTrie(["", "ость"]).matches("кот")
+    assert not SuffixTrie([]).matches("кот")